@@ -3,25 +3,110 @@
 Each "complete solution" = one full placement of all 10 blocks on the board,
 leaving exactly the month/day/weekday markers uncovered. The current puzzle
 generator only uses the FIRST solution; this script measures the full set.
+
+Pass several --engine values to compare exact cover engines side by side;
+the summary then reports speedup and matrix memory relative to the first one.
+
+    python bench_all_solutions.py --engine dlx --engine array --engine sparse
+
+--count uses the engine's count() (memoized for the DLX engines) instead of
+walking every solution; the first(ms) column is then not measured.
+
+--prune island runs the Dlx engines with that search pruner ('none' for
+none, comma separate several); repeat to compare node counts and time:
+
+    python bench_all_solutions.py --prune none --prune island
+
+--profile also counts each date with the broken-profile DP of
+calendar_puzzle.bitboard.profile and checks it against the engines:
+
+    python bench_all_solutions.py --count --profile
+
+--parallel N splits each date's DLX tree --split-depth levels deep and runs
+the subtrees on N processes (dlx engine), to check scaling with cores.
 """
+import argparse
 import datetime
+import multiprocessing as mp
 import time
-from calendar_puzzle.dancing_link.calendar import FasterGame
+import tracemalloc
+from typing import NamedTuple
+
+from calendar_puzzle.bitboard import profile
+from calendar_puzzle.board import Game
+from calendar_puzzle.dancing_link import parallel
+from calendar_puzzle.dancing_link.calendar import ALL_ENGINES, HEURISTICS, PRUNERS, FasterGame
 
 
-def count_all_for_date(dt: datetime.date) -> tuple[int, float, float]:
-    """Return (n_solutions, build_seconds, search_seconds)."""
+class DateRun(NamedTuple):
+    n: int              # solutions
+    build: float        # seconds to build the game and its engine
+    first: float        # seconds to the first solution (0 when not measured)
+    search: float       # seconds to enumerate or count every solution
+    mem: int            # bytes held by the engine structures
+    nodes: int          # search nodes visited (0 when the engine does not count)
+
+
+def count_all_for_date(dt: datetime.date, engine: str = 'dlx', count_only: bool = False,
+                       pool=None, split_depth: int = 2, heuristic: str = 'mrv',
+                       pruners: tuple = ()) -> DateRun:
     t0 = time.perf_counter()
-    g = FasterGame(dt)
+    g = FasterGame(dt, engine=engine, heuristic=heuristic, pruners=pruners)
     t1 = time.perf_counter()
-    n = 0
-    for _ in g.dlx.search():
-        n += 1
+    t_first = 0.0
+    if pool is not None:
+        if count_only:
+            n = parallel.count(dt, pool, split_depth)
+        else:
+            n = sum(1 for _ in parallel.search(dt, pool, split_depth))
+    elif count_only:
+        n = g.count()
+    else:
+        n = 0
+        for _ in g.search():
+            if n == 0:
+                t_first = time.perf_counter() - t1
+            n += 1
     t2 = time.perf_counter()
-    return n, t1 - t0, t2 - t1
+    nodes = g.dlx.nodes_visited if g.dlx is not None else 0
+    return DateRun(n, t1 - t0, t_first, t2 - t1, matrix_bytes(g), nodes)
+
+
+def matrix_bytes(g: FasterGame) -> int:
+    """Bytes held by the engine structures of a fresh build (untimed)."""
+    g.dlx = g.bitboard = None
+    tracemalloc.start()
+    g.build_shape()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
 
 
 def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--engine', action='append', choices=ALL_ENGINES,
+                   help='Engine to benchmark; repeat to compare (default dlx).')
+    p.add_argument('--limit', type=int, default=None, help='Only run the first N dates.')
+    p.add_argument('--heuristic', action='append', choices=sorted(HEURISTICS),
+                   help='Branching heuristic of the Dlx engines; repeat to compare (default mrv).')
+    p.add_argument('--prune', action='append',
+                   help=f'Comma separated pruners of {sorted(PRUNERS)} or none; repeat to compare (default none).')
+    p.add_argument('--count', action='store_true', help='Count with count() instead of enumerating.')
+    p.add_argument('--profile', action='store_true', help='Check the counts against the broken-profile DP.')
+    p.add_argument('--parallel', type=int, default=1, help='Processes for tree-split search (dlx engine).')
+    p.add_argument('--split-depth', type=int, default=2, help='Tree levels to split with --parallel.')
+    args = p.parse_args()
+    engines = args.engine or ['dlx']
+    prunes = [() if arg == 'none' else tuple(arg.split(',')) for arg in args.prune or ['none']]
+    for pruners in prunes:
+        for name in pruners:
+            if name not in PRUNERS:
+                p.error(f'unknown pruner {name!r}, choose from {sorted(PRUNERS)}')
+    configs = [(e, h, pr) for e in engines for h in args.heuristic or ['mrv'] for pr in prunes]
+    if args.parallel > 1 and engines != ['dlx']:
+        p.error('--parallel only supports the dlx engine')
+    pool = mp.Pool(args.parallel) if args.parallel > 1 else None
+
     # Sample a spread of dates across the year so weekday/month variation is covered.
     dates = [
         datetime.date(2026, 1, 1),
@@ -32,22 +117,59 @@ def main():
         datetime.date(2026, 10, 31),
         datetime.date(2026, 12, 25),
     ]
+    if args.limit:
+        dates = dates[:args.limit]
+
+    summary = {}
+    # date -> solutions found by the first config
+    found = {}
+    for engine, heuristic, pruners in configs:
+        label = f"{engine}/{heuristic}" + ''.join(f"/{name}" for name in pruners)
+        print(f"\nengine={engine} heuristic={heuristic} prune={','.join(pruners) or 'none'}")
+        print(f"{'date':12} {'weekday':4} {'#solutions':>11} {'build(s)':>10} {'first(ms)':>10} "
+              f"{'search(s)':>10} {'total(s)':>10} {'mem(KB)':>9} {'nodes':>9}")
+        print("-" * 96)
+        runs = []
+        for dt in dates:
+            r = count_all_for_date(dt, engine, args.count, pool, args.split_depth, heuristic, pruners)
+            runs.append(r)
+            found.setdefault(dt, r.n)
+            print(f"{dt!s:12} {dt.strftime('%a'):4} {r.n:>11d} {r.build:>10.3f} {r.first*1000:>10.2f} "
+                  f"{r.search:>10.3f} {r.build+r.search:>10.3f} {r.mem/1024:>9.0f} {r.nodes:>9d}")
+
+        print("-" * 96)
+        ns = [r.n for r in runs]
+        k = len(runs)
+        print(f"min={min(ns)} max={max(ns)} avg={sum(ns)/k:.0f} solutions/day")
+        print(f"build avg={sum(r.build for r in runs)/k:.3f}s  first avg={sum(r.first for r in runs)/k*1000:.2f}ms  "
+              f"search avg={sum(r.search for r in runs)/k:.3f}s  mem avg={sum(r.mem for r in runs)/k/1024:.0f}KB  "
+              f"nodes avg={sum(r.nodes for r in runs)/k:.0f}")
+        summary[label] = (sum(r.build for r in runs), sum(r.search for r in runs),
+                          sum(r.mem for r in runs), sum(r.nodes for r in runs))
+
+    if pool is not None:
+        pool.close()
 
-    print(f"{'date':12} {'weekday':4} {'#solutions':>11} {'build(s)':>10} {'search(s)':>10} {'total(s)':>10}")
-    print("-" * 65)
-    totals = []
-    for dt in dates:
-        n, tb, ts = count_all_for_date(dt)
-        totals.append((dt, n, tb, ts))
-        print(f"{dt!s:12} {dt.strftime('%a'):4} {n:>11d} {tb:>10.3f} {ts:>10.3f} {tb+ts:>10.3f}")
-
-    print("-" * 65)
-    ns = [t[1] for t in totals]
-    bs = [t[2] for t in totals]
-    ss = [t[3] for t in totals]
-    print(f"min={min(ns)} max={max(ns)} avg={sum(ns)/len(ns):.0f} solutions/day")
-    print(f"build avg={sum(bs)/len(bs):.3f}s  search avg={sum(ss)/len(ss):.3f}s")
+    if args.profile:
+        print(f"\nbroken-profile DP\n{'date':12} {'#solutions':>11} {'count(s)':>10}  check")
+        total = 0.0
+        for dt in dates:
+            t0 = time.perf_counter()
+            board = Game(dt).board
+            n = profile.count_board(board.b, board.remaining_shapes)
+            elapsed = time.perf_counter() - t0
+            total += elapsed
+            print(f"{dt!s:12} {n:>11d} {elapsed:>10.3f}  {'ok' if n == found[dt] else f'MISMATCH ({found[dt]})'}")
+        print(f"count avg={total/len(dates):.3f}s")
 
+    if len(summary) > 1:
+        labels = list(summary)
+        bb, bs, bm, bn = summary[labels[0]]
+        print(f"\nrelative to {labels[0]}:")
+        for label in labels[1:]:
+            eb, es, em, en = summary[label]
+            nodes = f"  nodes x{en/bn:.2f}" if bn and en else ""
+            print(f"  {label:18} build x{bb/eb:.2f}  search x{bs/es:.2f}  memory x{bm/em:.2f} smaller{nodes}")
 
 if __name__ == "__main__":
     main()
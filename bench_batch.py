@@ -0,0 +1,94 @@
+"""Benchmark: solution counts of many dug puzzles, batched or one at a time.
+
+Takes the first --per-date solutions of every --step-th date of a leap year,
+digs --dig random pieces out of each (cells become '@', as dig_block.py
+does) and counts the solutions of every puzzle with the numpy frontier of
+calendar_puzzle.bitboard.batch, with one BitboardSolver per puzzle, and with
+one FasterGame (dlx) per puzzle (only the first --game-puzzles of them, it
+is slow). --limit 2 only tells unique puzzles apart.
+
+    python bench_batch.py --dig 4
+    python bench_batch.py --dig 6 --limit 2 --per-date 50
+"""
+import argparse
+import datetime
+import random
+import time
+from itertools import islice
+
+from calendar_puzzle.bitboard import batch
+from calendar_puzzle.bitboard.solver import BitboardSolver, render
+from calendar_puzzle.board import Game
+from calendar_puzzle.constants import DIGGED_CELL
+from calendar_puzzle.dancing_link.calendar import FasterGame
+from calendar_puzzle.shape import AllShapes
+
+
+def dug_puzzles(step: int, per_date: int, dig: int, rng: random.Random) -> list[tuple[datetime.date, str]]:
+    puzzles = []
+    day, end = datetime.date(2024, 1, 1), datetime.date(2025, 1, 1)
+    while day < end:
+        b = Game(day).board.b
+        solver = BitboardSolver.from_board(b, AllShapes)
+        for solution in islice(solver.search(), per_date):
+            board = ''.join(render(b, solution))
+            for name in rng.sample([s.name for s in AllShapes], dig):
+                board = board.replace(name, DIGGED_CELL)
+            puzzles.append((day, board))
+        day += datetime.timedelta(days=step)
+    return puzzles
+
+
+def game_count(day: datetime.date, board: str, limit) -> int:
+    g = FasterGame(day)
+    g.board.b = [list(row.replace(DIGGED_CELL, ' ')) for row in board.split('\n')]
+    g.board.remaining_shapes = [s for s in g.board.remaining_shapes if s.name not in board]
+    g.build_shape()
+    if limit is None:
+        return g.dlx.count()
+    return sum(1 for _ in islice(g.dlx.search(), limit))
+
+
+def solver_count(state, limit) -> int:
+    blocked, pieces = state
+    solver = BitboardSolver(blocked, [s.name for s in AllShapes if batch.PIECE_BITS[s.name] & pieces])
+    if limit is None:
+        return solver.count()
+    return sum(1 for _ in islice(solver.search(), limit))
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--dig', type=int, default=4, help='Pieces dug out of each solution.')
+    p.add_argument('--step', type=int, default=7, help='Every Nth date of the year.')
+    p.add_argument('--per-date', type=int, default=20, help='Solutions dug per date.')
+    p.add_argument('--limit', type=int, default=None, help='Stop counting a puzzle at N solutions.')
+    p.add_argument('--game-puzzles', type=int, default=50, help='Puzzles run through FasterGame.')
+    p.add_argument('--seed', type=int, default=0)
+    args = p.parse_args()
+
+    puzzles = dug_puzzles(args.step, args.per_date, args.dig, random.Random(args.seed))
+    states = [batch.parse(board) for _, board in puzzles]
+    print(f"{len(puzzles)} puzzles, {args.dig} pieces dug, limit={args.limit}")
+
+    t0 = time.perf_counter()
+    counts = batch.count(states, args.limit)
+    runs = {'batch': (counts.tolist(), time.perf_counter() - t0)}
+    t0 = time.perf_counter()
+    runs['bitboard'] = ([solver_count(s, args.limit) for s in states], time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    runs['fastergame'] = ([game_count(day, board, args.limit) for day, board in puzzles[:args.game_puzzles]],
+                          time.perf_counter() - t0)
+
+    for label, (got, _) in runs.items():
+        if got != runs['batch'][0][:len(got)]:
+            raise SystemExit(f'{label} counts differ from batch')
+    unique = sum(1 for n in counts if n == 1)
+    print(f"unique puzzles: {unique}/{len(puzzles)}, max count {counts.max()}")
+    print(f"{'solver':12} {'puzzles':>8} {'seconds':>8} {'puzzles/s':>10}")
+    for label, (got, seconds) in runs.items():
+        print(f"{label:12} {len(got):>8d} {seconds:>8.2f} {len(got) / seconds:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark: search nodes to the first solution with a mined row ordering.
+
+For every (month, day, weekday) key, builds the date's game in the usual row
+order, with the ordering's counts over all keys only, and with its per-key
+counts too, and counts the nodes the dlx engine visits before its first
+solution. Write the ordering with mine_ordering.py.
+
+    python bench_ordering.py --ordering pack_data/ordering.json
+    python bench_ordering.py --ordering pack_data/ordering.json --step 10
+"""
+import argparse
+import time
+
+from calendar_puzzle.dancing_link.calendar import FasterGame
+from calendar_puzzle.dancing_link.ordering import Ordering
+from gen_pack import enumerate_keys_with_dates
+
+
+def first_nodes(dt, ordering) -> tuple[int, float]:
+    """Nodes and seconds to the first solution."""
+    g = FasterGame(dt, ordering=ordering)
+    t0 = time.perf_counter()
+    next(g.dlx.iter_search(), None)
+    return g.dlx.nodes_visited, time.perf_counter() - t0
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--ordering', required=True, help='Ordering JSON from mine_ordering.py.')
+    p.add_argument('--step', type=int, default=1, help='Only run every Nth key (default all).')
+    p.add_argument('--limit', type=int, default=None, help='Stop after N keys.')
+    args = p.parse_args()
+    ordering = Ordering.load(args.ordering)
+    configs = {'usual': None, 'global': ordering.without_keys(), 'per-key': ordering}
+
+    keys_dates = enumerate_keys_with_dates()[::args.step]
+    if args.limit:
+        keys_dates = keys_dates[:args.limit]
+    runs = {label: [] for label in configs}
+    for i, (key, dt) in enumerate(keys_dates, 1):
+        for label, o in configs.items():
+            runs[label].append(first_nodes(dt, o))
+        if i % 100 == 0:
+            print(f"  [{i}/{len(keys_dates)}]")
+
+    print(f"\n{len(keys_dates)} keys, nodes to the first solution")
+    print(f"{'order':10} {'total':>9} {'median':>7} {'p90':>7} {'p99':>7} {'max':>7} {'search(s)':>10}")
+    base = sum(n for n, _ in runs['usual'])
+    for label, rs in runs.items():
+        nodes = sorted(n for n, _ in rs)
+        k = len(nodes)
+        print(f"{label:10} {sum(nodes):>9d} {nodes[k // 2]:>7d} {nodes[int(k * 0.9)]:>7d} "
+              f"{nodes[min(k - 1, int(k * 0.99))]:>7d} {nodes[-1]:>7d} {sum(t for _, t in rs):>10.2f}"
+              f"  x{base / max(1, sum(nodes)):.2f} fewer")
+
+
+if __name__ == '__main__':
+    main()
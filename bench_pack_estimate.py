@@ -18,6 +18,7 @@ from calendar_puzzle.dancing_link.calendar import FasterGame
 
 TOP_K = 50          # how many solutions to keep per key in the pack
 SAMPLE_N = 25       # how many keys to time in this benchmark
+ENGINE = 'dlx'      # exact cover engine, see calendar.ENGINES
 
 random.seed(42)
 
@@ -46,23 +47,14 @@ def example_date_for(m: int, d: int, wd: int) -> datetime.date | None:
 def time_top_k(dt: datetime.date, k: int) -> tuple[int, float, list[str]]:
     """Build DLX, take first k solutions, return (got, search_seconds, solutions).
     Each solution is encoded as a flat 56-char string (8 rows × 7 cols)."""
-    g = FasterGame(dt)
+    g = FasterGame(dt, engine=ENGINE)
     t0 = time.perf_counter()
     got = 0
     sols: list[str] = []
-    for sol_steps in g.dlx.search():
-        # Reconstruct the 8×7 board from the DLX solution rows.
-        b_str: list[str] = []
-        for step in sol_steps:
-            row_str = g.dlx.row_names[step.coordinate[0]]
-            if not b_str:
-                b_str = list(row_str)
-            else:
-                for i, c in enumerate(row_str):
-                    if b_str[i] == ' ' and c != ' ':
-                        b_str[i] = c
-        # Strip the embedded newlines (row separators) so we get a 56-char string.
-        sols.append(''.join(b_str).replace('\n', ''))
+    for solution in g.search():
+        # Reconstruct the 8×7 board from the engine's solution and strip the
+        # embedded newlines (row separators) so we get a 56-char string.
+        sols.append(''.join(g.render(solution)).replace('\n', ''))
         got += 1
         if got >= k:
             break
@@ -82,7 +74,7 @@ def main():
     json_bytes = []
     sol_counts = []
 
-    print(f"\nTiming TOP_K={TOP_K} solutions for {SAMPLE_N} sampled keys ...\n")
+    print(f"\nTiming TOP_K={TOP_K} solutions for {SAMPLE_N} sampled keys (engine={ENGINE}) ...\n")
     print(f"{'(m,d,wd)':12} {'date':12} {'got':>4} {'time(s)':>9} {'json(B)':>9}")
     print("-" * 50)
     for (m, d, wd) in sample:
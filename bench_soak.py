@@ -0,0 +1,121 @@
+"""Soak benchmark: memory of the serving process over many requests.
+
+Drives server.py's Flask app in-process with a day's mix of requests:
+/api/solution (which runs solve_for_web) for random dates (passed as
+day/month) with 0..--max-dropped pieces of one of their solutions already
+dropped, /api/solutions pages for random dates, and /api/solutions
+offset pages for a few fixed dates (--offset-dates: the first offset page
+of a date counts its solutions, about 15s, and keeps the count memo).
+Every --every requests it prints the resident set size and the Python
+heap (after a gc), so growth shows as a rising column.
+
+    python bench_soak.py --requests 2000
+    python bench_soak.py --requests 500 --every 50 --page-share 0.5
+
+The /api/solution files it makes under temp/ are removed again.
+"""
+import argparse
+import datetime
+import gc
+import os
+import random
+import resource
+import sys
+import time
+
+from calendar_puzzle.bitboard.solver import BitboardSolver
+from calendar_puzzle.board import SHAPE_MAP, Game
+from calendar_puzzle.constants import INITIAL_BLOCK_TYPES
+from server import app
+
+# shape name -> frontend block id
+BLOCK_IDS = {SHAPE_MAP[block['id']]().name: block['id'] for block in INITIAL_BLOCK_TYPES}
+
+
+def rss_kb() -> int:
+    """Resident set size now (Linux), else the peak so far."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def heap_kb() -> int:
+    """Python objects alive, by their reported sizes."""
+    return sum(sys.getsizeof(o) for o in gc.get_objects()) // 1024
+
+
+def random_date(rng: random.Random) -> datetime.date:
+    """A date of this year, the year server.get_date puts day/month in."""
+    first = datetime.date(datetime.date.today().year, 1, 1)
+    return first + datetime.timedelta(days=rng.randrange((first.replace(year=first.year + 1) - first).days))
+
+
+def dropped_blocks(dt: datetime.date, k: int, rng: random.Random) -> list[dict]:
+    """k pieces of a solution of dt, as the frontend drops them."""
+    game = Game(dt)
+    solution = next(BitboardSolver.from_board(game.board.b, game.board.remaining_shapes).search())
+    blocks = []
+    for p in rng.sample(solution, k):
+        blocks.append({
+            'id': BLOCK_IDS[p.name],
+            'x': p.y,
+            'y': p.x,
+            'shape': [[0 if c == ' ' else 1 for c in row] for row in p.shape.grid],
+        })
+    return blocks
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--requests', type=int, default=2000)
+    p.add_argument('--every', type=int, default=100, help='Print memory every N requests.')
+    p.add_argument('--page-share', type=float, default=0.3, help='Share of /api/solutions cursor requests.')
+    p.add_argument('--offset-share', type=float, default=0.1, help='Share of /api/solutions offset requests.')
+    p.add_argument('--offset-dates', type=int, default=2, help='Dates the offset requests are spread over.')
+    p.add_argument('--max-dropped', type=int, default=6)
+    p.add_argument('--seed', type=int, default=0)
+    args = p.parse_args()
+
+    rng = random.Random(args.seed)
+    offset_dates = [random_date(rng) for _ in range(args.offset_dates)]
+    client = app.test_client()
+    temp_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'temp')
+    kept = set(os.listdir(temp_dir)) if os.path.isdir(temp_dir) else set()
+    gc.collect()
+    start_rss, start_heap = rss_kb(), heap_kb()
+    print(f"{'requests':>8} {'rss(KB)':>9} {'heap(KB)':>9} {'req/s':>7}")
+    print(f"{0:>8d} {start_rss:>9d} {start_heap:>9d}")
+    statuses = {}
+    t0 = time.perf_counter()
+    for i in range(1, args.requests + 1):
+        dt = random_date(rng)
+        pick = rng.random()
+        if pick < args.offset_share:
+            dt = rng.choice(offset_dates)
+            r = client.post('/api/solutions', json={'day': dt.day, 'month': dt.month,
+                                                    'offset': rng.randrange(2000), 'limit': rng.choice([10, 100])})
+        elif pick < args.offset_share + args.page_share:
+            r = client.post('/api/solutions', json={'day': dt.day, 'month': dt.month, 'limit': rng.choice([10, 100])})
+        else:
+            blocks = dropped_blocks(dt, rng.randint(0, args.max_dropped), rng)
+            r = client.post('/api/solution', json={'day': dt.day, 'month': dt.month, 'droppedBlocks': blocks})
+            # also the files of requests without a solution (404, no gameId in the reply)
+            for name in set(os.listdir(temp_dir)) - kept:
+                os.remove(os.path.join(temp_dir, name))
+        statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+        if r.status_code >= 500:
+            raise SystemExit(f'request {i} failed: {r.get_json()}')
+        if i % args.every == 0:
+            gc.collect()
+            print(f"{i:>8d} {rss_kb():>9d} {heap_kb():>9d} {i / (time.perf_counter() - t0):>7.1f}")
+    gc.collect()
+    end_rss, end_heap = rss_kb(), heap_kb()
+    print(f"growth: rss {end_rss - start_rss:+d} KB, heap {end_heap - start_heap:+d} KB "
+          f"over {args.requests} requests, statuses {dict(sorted(statuses.items()))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# many partial boards solved together: a frontier of states (occupancy mask,
+# pieces left, owner board, multiplicity) held in numpy arrays. every state
+# puts a piece at its lowest empty cell (ANCHORED) in the same step, so one
+# step is a handful of vectorised mask tests against the placement table
+# instead of a Python call per node. equal states of one board are merged,
+# and the frontier is worked through in chunks, deepest first, so it stays
+# small
+from typing import Iterable, Optional
+
+import numpy as np
+
+from calendar_puzzle.bitboard.placements import ANCHORED, FULL_MASK, PIECE_BITS, cell_bit
+from calendar_puzzle.constants import BOARD_COLS
+
+FULL = np.uint64(FULL_MASK)
+
+# cell -> (masks, piece bits) of the placements whose lowest cell it is
+CELL_MASKS = [np.array([p.mask for p in placements], dtype=np.uint64) for placements in ANCHORED]
+CELL_BITS = [np.array([PIECE_BITS[p.name] for p in placements], dtype=np.int64) for placements in ANCHORED]
+
+
+def state(b: list[list], names: Iterable[str], empty=' ') -> tuple[int, int]:
+    """(blocked mask, piece mask) of a board whose `empty` cells are to be
+    covered with the named shapes, see BitboardSolver."""
+    blocked = 0
+    for x, row in enumerate(b):
+        for y, c in enumerate(row):
+            if c not in empty:
+                blocked |= cell_bit(x, y)
+    pieces = 0
+    for name in names:
+        pieces |= PIECE_BITS[name]
+    return blocked, pieces
+
+
+def parse(board: str, empty=' @') -> tuple[int, int]:
+    """
+    State of a flattened board (56 chars, or rows joined by '\\n') such as a
+    dug solution: its `empty` cells are free and the shapes missing from it
+    are left to place.
+    """
+    board = board.replace('\n', '')
+    b = [list(board[i:i + BOARD_COLS]) for i in range(0, len(board), BOARD_COLS)]
+    names = [name for name in PIECE_BITS if name not in board]
+    return state(b, names, empty)
+
+
+def expand(occ, left, owner, weight):
+    """Every state after putting one piece at its lowest empty cell."""
+    free = ~occ & FULL
+    low = free & (~free + np.uint64(1))
+    # powers of two are exact in float64
+    cell = np.log2(low.astype(np.float64)).astype(np.int64)
+    order = np.argsort(cell, kind='stable')
+    parts = []
+    # the states of one anchor cell against all its placements at once
+    for idx in np.split(order, np.flatnonzero(np.diff(cell[order])) + 1):
+        masks, bits = CELL_MASKS[cell[idx[0]]], CELL_BITS[cell[idx[0]]]
+        o = occ[idx]
+        ok = ((o[:, None] & masks) == 0) & ((left[idx][:, None] & bits) != 0)
+        r, k = np.nonzero(ok)
+        src = idx[r]
+        parts.append((o[r] | masks[k], left[src] ^ bits[k], owner[src], weight[src]))
+    return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+
+def merge(occ, left, owner, weight):
+    """Equal states of the same board as one, their multiplicities added."""
+    order = np.lexsort((occ, left, owner))
+    occ, left, owner, weight = occ[order], left[order], owner[order], weight[order]
+    new = np.ones(len(occ), dtype=bool)
+    new[1:] = (occ[1:] != occ[:-1]) | (left[1:] != left[:-1]) | (owner[1:] != owner[:-1])
+    starts = np.flatnonzero(new)
+    return occ[starts], left[starts], owner[starts], np.add.reduceat(weight, starts)
+
+
+def count(states: Iterable[tuple[int, int]], limit: Optional[int] = None, chunk: int = 1 << 15) -> np.ndarray:
+    """
+    Solution count of each (blocked mask, piece mask) state. With a limit a
+    board stops being searched once it has that many, and its count is
+    capped there: limit=1 tells solvable boards, limit=2 unique ones.
+    """
+    states = list(states)
+    counts = np.zeros(len(states), dtype=np.int64)
+    if not states:
+        return counts
+    occ = np.array([blocked for blocked, _ in states], dtype=np.uint64)
+    left = np.array([pieces for _, pieces in states], dtype=np.int64)
+    owner = np.arange(len(states), dtype=np.int64)
+    weight = np.ones(len(states), dtype=np.int64)
+    stack = [(occ, left, owner, weight)]
+    while stack:
+        occ, left, owner, weight = stack.pop()
+        done = occ == FULL
+        solved = done & (left == 0)
+        np.add.at(counts, owner[solved], weight[solved])
+        keep = ~done
+        if limit is not None:
+            keep &= counts[owner] < limit
+        if not keep.all():
+            occ, left, owner, weight = occ[keep], left[keep], owner[keep], weight[keep]
+        if not len(occ):
+            continue
+        occ, left, owner, weight = merge(*expand(occ, left, owner, weight))
+        for i in range(0, len(occ), chunk):
+            stack.append((occ[i:i + chunk], left[i:i + chunk], owner[i:i + chunk], weight[i:i + chunk]))
+    return counts if limit is None else np.minimum(counts, limit)
+
+
+def solvable(states: Iterable[tuple[int, int]]) -> np.ndarray:
+    """Whether each state has a solution."""
+    return count(states, limit=1) > 0
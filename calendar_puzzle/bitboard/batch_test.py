@@ -0,0 +1,70 @@
+import datetime
+import unittest
+import sys
+import os
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.bitboard import batch
+from calendar_puzzle.bitboard.placements import FULL_MASK, PIECE_BITS, board_mask
+from calendar_puzzle.bitboard.solver import BitboardSolver, render
+from calendar_puzzle.board import Game
+from calendar_puzzle.constants import DIGGED_CELL
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(datetime.date(2026, 5, 14))
+        self.solution = next(BitboardSolver.from_board(self.game.board.b, self.game.board.remaining_shapes).search())
+
+    def partial(self, placed):
+        """(blocked, names left) with the first pieces of the solution placed."""
+        blocked = board_mask(self.game.board.b)
+        for p in self.solution[:placed]:
+            blocked |= p.mask
+        return blocked, [p.name for p in self.solution[placed:]]
+
+    def test_same_counts_as_bitboard(self):
+        states, expected = [], []
+        for placed in (2, 4, 6, 8):
+            blocked, names = self.partial(placed)
+            states.append((blocked, sum(PIECE_BITS[name] for name in names)))
+            expected.append(BitboardSolver(blocked, names).count())
+            # one piece short: the cells cannot be covered
+            states.append((blocked, sum(PIECE_BITS[name] for name in names[1:])))
+            expected.append(0)
+        # and the whole solution placed
+        states.append((self.partial(10)[0], 0))
+        expected.append(1)
+        self.assertEqual(batch.count(states).tolist(), expected)
+        self.assertGreater(expected[0], 1)
+
+    def test_limit(self):
+        states = []
+        for placed in (2, 8):
+            blocked, names = self.partial(placed)
+            states.append((blocked, sum(PIECE_BITS[name] for name in names)))
+        full = batch.count(states).tolist()
+        self.assertEqual(batch.count(states, limit=2).tolist(), [min(n, 2) for n in full])
+        self.assertEqual(batch.solvable(states + [(0, 0)]).tolist(), [True, True, False])
+
+    def test_parse_dug_board(self):
+        board = ''.join(render(self.game.board.b, self.solution))
+        self.assertEqual(batch.parse(board), (FULL_MASK, 0))
+        dug = board
+        for p in self.solution[:3]:
+            dug = dug.replace(p.name, DIGGED_CELL)
+        # the dug pieces are left, the others block their cells
+        blocked = board_mask(self.game.board.b)
+        for p in self.solution[3:]:
+            blocked |= p.mask
+        self.assertEqual(batch.parse(dug), (blocked, sum(PIECE_BITS[p.name] for p in self.solution[:3])))
+        self.assertEqual(batch.parse(dug.replace(DIGGED_CELL, ' ').replace('\n', '')), batch.parse(dug))
+        self.assertGreaterEqual(batch.count([batch.parse(dug)])[0], 1)
+
+    def test_empty(self):
+        self.assertEqual(batch.count([]).tolist(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# table of small enclosed regions of empty cells and whether some of the
+# remaining pieces can tile them, filled lazily and kept on disk so every
+# search (and every run) decides a given hole only once
+import atexit
+import json
+import os
+from typing import Optional
+
+from calendar_puzzle.bitboard.placements import ANCHORED, FULL_MASK, PIECE_BITS, cell_bit
+from calendar_puzzle.constants import BOARD_ROWS, BOARD_COLS
+
+# regions above this many cells are not looked up, the island size check
+# already covers them and tiling them is as hard as the search itself
+MAX_HOLE = 10
+DEFAULT_PATH = os.environ.get('CALENDAR_HOLES', os.path.expanduser('~/.cache/calendar_puzzle/holes.json'))
+
+COLS = [sum(cell_bit(x, y) for x in range(BOARD_ROWS)) for y in range(BOARD_COLS)]
+FIRST_COL, LAST_COL = COLS[0], COLS[-1]
+
+
+def neighbours(mask: int) -> int:
+    """Board cells next to any cell of mask (may include mask itself)."""
+    return ((mask << 1) & ~FIRST_COL | (mask >> 1) & ~LAST_COL
+            | mask << BOARD_COLS | mask >> BOARD_COLS) & FULL_MASK
+
+
+def normalize(region: int) -> int:
+    """The region moved to the top-left corner of the board."""
+    region >>= ((region & -region).bit_length() - 1) // BOARD_COLS * BOARD_COLS
+    for y, col in enumerate(COLS):
+        if region & col:
+            return region >> y
+    return region
+
+
+class HoleTable:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        # (normalized region, piece bits) -> whether a subset of the pieces tiles it
+        self.fillable: dict[tuple[int, int], bool] = {}
+        self.dirty = False
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for region, pieces, ok in json.load(f):
+                    self.fillable[(region, pieces)] = bool(ok)
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump([[region, pieces, int(ok)] for (region, pieces), ok in self.fillable.items()], f)
+        self.dirty = False
+
+    def can_fill(self, region: int, pieces: int) -> bool:
+        """Whether a subset of `pieces` (PIECE_BITS) tiles the region exactly."""
+        key = (normalize(region), pieces)
+        ok = self.fillable.get(key)
+        if ok is None:
+            ok = self.fillable[key] = _tile(key[0], pieces)
+            self.dirty = True
+        return ok
+
+    def dead_end(self, free: int, pieces: int, near: int = FULL_MASK) -> bool:
+        """
+        Whether a region of the free cells touching `near` has at most
+        MAX_HOLE cells and can not be filled by any subset of the pieces.
+        """
+        seeds = free & (near if near == FULL_MASK else neighbours(near))
+        while seeds:
+            region = seeds & -seeds
+            while region.bit_count() <= MAX_HOLE:
+                grown = region | neighbours(region) & free
+                if grown == region:
+                    if not self.can_fill(region, pieces):
+                        return True
+                    break
+                region = grown
+            seeds &= ~region
+        return False
+
+
+def _tile(region: int, pieces: int) -> bool:
+    if not region:
+        return True
+    for p in ANCHORED[(region & -region).bit_length() - 1]:
+        bit = PIECE_BITS[p.name]
+        if bit & pieces and p.mask & region == p.mask and _tile(region ^ p.mask, pieces ^ bit):
+            return True
+    return False
+
+
+_shared: Optional[HoleTable] = None
+
+
+def shared() -> HoleTable:
+    """The process wide table at DEFAULT_PATH, saved back at exit."""
+    global _shared
+    if _shared is None:
+        _shared = HoleTable(DEFAULT_PATH)
+        atexit.register(_shared.save)
+    return _shared
@@ -0,0 +1,78 @@
+import datetime
+import os
+import tempfile
+import unittest
+import sys
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.bitboard.holes import HoleTable, normalize
+from calendar_puzzle.bitboard.placements import FULL_MASK, PIECE_BITS, cell_bit
+from calendar_puzzle.bitboard.solver import BitboardSolver, render
+from calendar_puzzle.board import Game
+
+ALL_PIECES = sum(PIECE_BITS.values())
+
+
+def mask(*cells):
+    return sum(cell_bit(x, y) for x, y in cells)
+
+
+class TestHoleTable(unittest.TestCase):
+    def test_normalize(self):
+        self.assertEqual(normalize(mask((3, 2), (4, 2), (4, 3))), mask((0, 0), (1, 0), (1, 1)))
+        self.assertEqual(normalize(mask((0, 6), (1, 5))), mask((0, 1), (1, 0)))
+
+    def test_can_fill(self):
+        table = HoleTable()
+        line = mask((5, 1), (5, 2), (5, 3), (5, 4))
+        self.assertFalse(table.can_fill(mask((2, 2)), ALL_PIECES))
+        self.assertTrue(table.can_fill(line, ALL_PIECES))
+        self.assertFalse(table.can_fill(line, ALL_PIECES ^ PIECE_BITS['I']))
+        # moved elsewhere it is the same entry
+        self.assertEqual(len(table.fillable), 3)
+        table.can_fill(line >> 1, ALL_PIECES)
+        self.assertEqual(len(table.fillable), 3)
+        # two pieces: an I next to a J
+        eight = line | mask((6, 1), (6, 2), (6, 3), (7, 3))
+        self.assertTrue(table.can_fill(eight, PIECE_BITS['I'] | PIECE_BITS['J']))
+        self.assertFalse(table.can_fill(eight, PIECE_BITS['I'] | PIECE_BITS['S']))
+
+    def test_dead_end(self):
+        table = HoleTable()
+        free = mask((0, 0), (0, 1), (0, 2), (0, 3)) | mask((5, 5), (5, 6))
+        self.assertTrue(table.dead_end(free, ALL_PIECES))
+        # only the pockets next to `near` are looked at
+        self.assertFalse(table.dead_end(free, ALL_PIECES, near=mask((1, 0))))
+        self.assertFalse(table.dead_end(FULL_MASK, ALL_PIECES))
+
+    def test_persisted(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'holes.json')
+            table = HoleTable(path)
+            table.can_fill(mask((2, 2), (2, 3)), ALL_PIECES)
+            table.save()
+            self.assertEqual(HoleTable(path).fillable, table.fillable)
+
+
+class TestTryPut(unittest.TestCase):
+    def partial_game(self, holes) -> Game:
+        g = Game(datetime.date(2026, 5, 14))
+        g.save = lambda: None
+        g.holes = holes
+        solution = next(BitboardSolver.from_board(g.board.b, g.board.remaining_shapes).search())
+        g.board.b = [list(row) for row in ''.join(render(g.board.b, solution[:5])).split('\n')]
+        placed = {p.name for p in solution[:5]}
+        g.board.remaining_shapes = [s for s in g.board.remaining_shapes if s.name not in placed]
+        return g
+
+    def test_skips_dead_ends(self):
+        plain, pruned = self.partial_game(None), self.partial_game(HoleTable())
+        plain.try_put(True)
+        pruned.try_put(True)
+        self.assertTrue(plain.should_exit and pruned.should_exit)
+        self.assertLess(pruned.cnt, plain.cnt)
+
+
+if __name__ == "__main__":
+    unittest.main()
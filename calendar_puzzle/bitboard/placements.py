@@ -0,0 +1,102 @@
+# every placement of every orientation of the ten shapes on the 8x7 frame,
+# computed once at import. cell (x, y) is bit x*BOARD_COLS+y of a mask
+from typing import NamedTuple
+
+from calendar_puzzle.constants import BOARD_ROWS, BOARD_COLS
+from calendar_puzzle.shape import AllShapes, Shape
+
+FULL_MASK = (1 << (BOARD_ROWS * BOARD_COLS)) - 1
+
+# shape name -> bit used in remaining-piece masks, in AllShapes order
+PIECE_BITS = {shape.name: 1 << i for i, shape in enumerate(AllShapes)}
+PIECE_SIZES = {shape.name: sum(c != ' ' for row in shape.grid for c in row) for shape in AllShapes}
+
+
+class Placement(NamedTuple):
+    id: int
+    name: str
+    shape: Shape        # the oriented shape, top-left of its grid at (x, y)
+    x: int
+    y: int
+    cells: tuple        # ((x, y), ...) covered cells in row-major order
+    mask: int
+
+
+def cell_bit(x: int, y: int) -> int:
+    return 1 << (x * BOARD_COLS + y)
+
+
+def board_mask(b: list[list], empty=' ') -> int:
+    """Mask of cells of a board that are not `empty`."""
+    mask = 0
+    for x, row in enumerate(b):
+        for y, c in enumerate(row):
+            if c != empty:
+                mask |= cell_bit(x, y)
+    return mask
+
+
+def mask_cells(mask: int) -> list[tuple[int, int]]:
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(divmod(low.bit_length() - 1, BOARD_COLS))
+        mask ^= low
+    return cells
+
+
+# shape name -> its distinct orientations, in Shape.all_shapes() order
+ORIENTATIONS: dict[str, list[Shape]] = {shape.name: list(shape.all_shapes()) for shape in AllShapes}
+
+
+def _build_placements():
+    placements: list[Placement] = []
+    at: dict[tuple[int, int], dict[str, list[Placement]]] = {}
+    for x in range(BOARD_ROWS):
+        for y in range(BOARD_COLS):
+            at[(x, y)] = {}
+            for name, orients in ORIENTATIONS.items():
+                at[(x, y)][name] = []
+                for ss in orients:
+                    cells = tuple((x + i, y + j) for i, row in enumerate(ss.grid)
+                                  for j, c in enumerate(row) if c != ' ')
+                    if not all(cx < BOARD_ROWS and cy < BOARD_COLS for cx, cy in cells):
+                        continue
+                    mask = 0
+                    for cx, cy in cells:
+                        mask |= cell_bit(cx, cy)
+                    p = Placement(len(placements), name, ss, x, y, cells, mask)
+                    placements.append(p)
+                    at[(x, y)][name].append(p)
+    return placements, at
+
+
+# all placements, and (x, y) -> shape name -> placements whose grid's top-left is (x, y)
+PLACEMENTS, PLACEMENTS_AT = _build_placements()
+
+# cell index -> placements whose lowest cell is that cell
+ANCHORED: list[list[Placement]] = [
+    [p for p in PLACEMENTS if (p.mask & -p.mask).bit_length() - 1 == cell]
+    for cell in range(BOARD_ROWS * BOARD_COLS)
+]
+
+# (shape name, mask) -> its placement, a shape covers the same cells only once
+BY_MASK: dict[tuple[str, int], Placement] = {(p.name, p.mask): p for p in PLACEMENTS}
+
+
+def board_placements(b: list[list], names) -> list[Placement]:
+    """Placements of the named shapes found on a board, ValueError when a
+    shape's cells are not one placement of it."""
+    masks = {name: 0 for name in names}
+    for x, row in enumerate(b):
+        for y, c in enumerate(row):
+            if c in masks:
+                masks[c] |= cell_bit(x, y)
+    placements = []
+    for name, mask in masks.items():
+        if not mask:
+            continue
+        if (name, mask) not in BY_MASK:
+            raise ValueError(f'cells of {name} are not a placement of it')
+        placements.append(BY_MASK[(name, mask)])
+    return placements
@@ -0,0 +1,127 @@
+# broken-profile dynamic programming over the 8x7 board: cells are visited
+# in row-major order and every cell before the current one is covered, so a
+# state is the mask of covered cells from the current one on (the profile,
+# bit 0 is the current cell) and the pieces left. a placement is put at its
+# lowest cell (ANCHORED); states reached through different placements are
+# merged, so tilings are counted without being enumerated
+from typing import Iterable
+
+from calendar_puzzle.bitboard.placements import ANCHORED, PIECE_BITS, PLACEMENTS, board_mask, cell_bit
+from calendar_puzzle.board import FRAME_CELLS
+from calendar_puzzle.constants import BOARD_COLS, BOARD_ROWS
+from calendar_puzzle.dancing_link.all_dates import GROUPS, Key, decode, hole_code, valid_keys
+from calendar_puzzle.shape import Shape
+
+N_CELLS = BOARD_ROWS * BOARD_COLS
+
+
+def mirror(mask: int) -> int:
+    """The mask on the board turned half a turn, cell i becomes cell N_CELLS-1-i."""
+    return int(format(mask, f'0{N_CELLS}b')[::-1], 2)
+
+
+def _anchored(placements, transform=lambda mask: mask) -> list[list[tuple[int, int]]]:
+    # cell -> (piece bit, mask) of the placements whose lowest cell it is
+    anchored = [[] for _ in range(N_CELLS)]
+    for p in placements:
+        mask = transform(p.mask)
+        anchored[(mask & -mask).bit_length() - 1].append((PIECE_BITS[p.name], mask))
+    return anchored
+
+
+FORWARD = _anchored(p for placements in ANCHORED for p in placements)
+# the same placements counted from the last cell up, see count_keys
+BACKWARD = _anchored(PLACEMENTS, mirror)
+
+
+def count(blocked: int, names: Iterable[str]) -> int:
+    """Number of tilings of the cells not in blocked with the named shapes."""
+    pieces = 0
+    for name in names:
+        pieces |= PIECE_BITS[name]
+    states = {(blocked, pieces): 1}
+    for cell in range(N_CELLS):
+        options = _options(FORWARD, cell, blocked, pieces)
+        merged = {}
+        for (profile, left), n in states.items():
+            if profile & 1:
+                state = (profile >> 1, left)
+                merged[state] = merged.get(state, 0) + n
+                continue
+            for bit, mask in options:
+                if bit & left and not mask & profile:
+                    state = ((profile | mask) >> 1, left ^ bit)
+                    merged[state] = merged.get(state, 0) + n
+        states = merged
+    return states.get((0, 0), 0)
+
+
+def count_board(b: list[list], remaining_shapes: Iterable[Shape]) -> int:
+    """Solution count of a board, e.g. Game(dt).board after mark_date."""
+    return count(board_mask(b), [s.name for s in remaining_shapes])
+
+
+def count_keys(weekdays: Iterable[int] = range(7)) -> dict[Key, int]:
+    """
+    Solution count of every valid (month, day, weekday) key of the given
+    weekdays, one pass over the unmarked board per weekday. Each month and
+    day cell may be left empty once per group; a state carries its counts
+    by hole code (see all_dates), so tilings of the other cells are shared
+    by all the dates. The board is walked from the last cell up, where the
+    weekday cells are, so the passes part ways as late as possible.
+    """
+    weekdays = list(weekdays)
+    frame = 0
+    for x, y in FRAME_CELLS:
+        frame |= cell_bit(x, y)
+    counts = {key: 0 for key in valid_keys() if key[2] in weekdays}
+    for weekday in weekdays:
+        holes = {}
+        for hole in GROUPS[0] + GROUPS[1] + [GROUPS[2][weekday]]:
+            x, y = hole.cell
+            holes[N_CELLS - 1 - (x * BOARD_COLS + y)] = (1 << hole.group, hole_code(hole))
+        for code, n in _count_codes(BACKWARD, mirror(frame), sum(PIECE_BITS.values()), holes).items():
+            key = tuple(decode(code))
+            if key in counts:
+                counts[key] = n
+    return counts
+
+
+def _options(anchored, cell: int, blocked: int, pieces: int) -> list[tuple[int, int]]:
+    # (piece bit, mask shifted to the profile) of the placements anchored at cell
+    return [(bit, mask >> cell) for bit, mask in anchored[cell] if bit & pieces and not mask & blocked]
+
+
+def _count_codes(anchored, blocked: int, pieces: int, holes: dict) -> dict[int, int]:
+    # count() with states that also hold the groups whose hole is placed,
+    # each mapping hole code -> tilings. holes maps a cell to the (group
+    # bit, hole code) of leaving it empty, every group needs one hole
+    last_cell = {}
+    for cell, (group, _) in holes.items():
+        last_cell[group] = max(cell, last_cell.get(group, cell))
+    states = {(blocked, pieces, 0): {0: 1}}
+    for cell in range(N_CELLS):
+        options = _options(anchored, cell, blocked, pieces)
+        hole = holes.get(cell)
+        merged = {}
+        for (profile, left, groups), codes in states.items():
+            if profile & 1:
+                moves = [((profile >> 1, left, groups), 0)]
+            else:
+                moves = [(((profile | mask) >> 1, left ^ bit, groups), 0)
+                         for bit, mask in options if bit & left and not mask & profile]
+                if hole is not None and not groups & hole[0]:
+                    moves.append(((profile >> 1, left, groups | hole[0]), hole[1]))
+            for state, code in moves:
+                into = merged.get(state)
+                if into is None:
+                    merged[state] = {c + code: n for c, n in codes.items()}
+                    continue
+                for c, n in codes.items():
+                    c += code
+                    into[c] = into.get(c, 0) + n
+        if hole is not None and last_cell[hole[0]] == cell:
+            # past its last cell, a group without its hole never gets one
+            merged = {state: codes for state, codes in merged.items() if state[2] & hole[0]}
+        states = merged
+    return states.get((0, 0, sum(last_cell)), {})
@@ -0,0 +1,58 @@
+import datetime
+import unittest
+import sys
+import os
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.bitboard import profile
+from calendar_puzzle.bitboard.placements import PIECE_BITS, board_mask, cell_bit
+from calendar_puzzle.bitboard.solver import BitboardSolver
+from calendar_puzzle.board import FRAME_CELLS, Game
+from calendar_puzzle.dancing_link.all_dates import GROUPS, decode, hole_code
+
+
+class TestProfileCount(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(datetime.date(2026, 5, 14))
+        self.solution = next(BitboardSolver.from_board(self.game.board.b, self.game.board.remaining_shapes).search())
+
+    def test_same_count_as_bitboard(self):
+        # two pieces of a known solution placed, the other eight left to count
+        blocked = board_mask(self.game.board.b)
+        for p in self.solution[:2]:
+            blocked |= p.mask
+        names = [p.name for p in self.solution[2:]]
+        n = profile.count(blocked, names)
+        self.assertGreater(n, 1)
+        self.assertEqual(n, BitboardSolver(blocked, names).count())
+        self.assertEqual(profile.count(blocked, names[1:]), 0)
+
+    def test_counts_by_hole_code(self):
+        # the date cells are left open; every hole code has the count of its date
+        frame = sum(cell_bit(x, y) for x, y in FRAME_CELLS)
+        blocked = frame
+        for p in self.solution[:6]:
+            blocked |= p.mask
+        names = [p.name for p in self.solution[6:]]
+        holes = {}
+        for g, group in enumerate(GROUPS):
+            for hole in group:
+                x, y = hole.cell
+                holes[x * 7 + y] = (1 << g, hole_code(hole))
+        pieces = sum(PIECE_BITS[name] for name in names)
+        codes = profile._count_codes(profile.FORWARD, blocked, pieces, holes)
+        # counted from the last cell up
+        mirrored = {profile.N_CELLS - 1 - cell: hole for cell, hole in holes.items()}
+        self.assertEqual(profile._count_codes(profile.BACKWARD, profile.mirror(blocked), pieces, mirrored), codes)
+        self.assertIn(hole_code(GROUPS[0][4]) + hole_code(GROUPS[1][13]) + hole_code(GROUPS[2][3]), codes)
+        for code, n in codes.items():
+            month, day, weekday = decode(code)
+            marked = blocked
+            for g, value in enumerate((month - 1, day - 1, weekday)):
+                marked |= cell_bit(*GROUPS[g][value].cell)
+            self.assertEqual(n, profile.count(marked, names), (month, day, weekday))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# exact cover specialised for the 8x7 board: the board is one int mask,
+# branch on the first empty cell and try only placements anchored there
+from typing import Iterable
+
+from calendar_puzzle.bitboard.placements import (ANCHORED, FULL_MASK, PIECE_BITS,
+                                                 Placement, board_mask)
+from calendar_puzzle.shape import Shape
+
+
+class BitboardSolver:
+    def __init__(self, blocked: int, names: Iterable[str]):
+        """
+        blocked: mask of cells that are not empty (frame, date, placed shapes)
+        names: names of the shapes still to place
+        """
+        self.blocked = blocked
+        self.pieces = 0
+        for name in names:
+            self.pieces |= PIECE_BITS[name]
+        # per anchor cell, the (piece bit, mask, placement) that may ever be used
+        self.anchored: list[tuple] = [
+            tuple((PIECE_BITS[p.name], p.mask, p) for p in placements
+                  if PIECE_BITS[p.name] & self.pieces and not p.mask & blocked)
+            for placements in ANCHORED
+        ]
+        self.solution: list[Placement] = []
+
+    @classmethod
+    def from_board(cls, b: list[list], remaining_shapes: Iterable[Shape]) -> 'BitboardSolver':
+        return cls(board_mask(b), [s.name for s in remaining_shapes])
+
+    def search(self):
+        """Yield every solution as a list of Placement."""
+        yield from self._search(self.blocked, self.pieces)
+
+    def _search(self, occ: int, left: int):
+        if occ == FULL_MASK:
+            if not left:
+                yield self.solution.copy()
+            return
+        free = ~occ & FULL_MASK
+        for bit, mask, p in self.anchored[(free & -free).bit_length() - 1]:
+            if bit & left and not mask & occ:
+                self.solution.append(p)
+                yield from self._search(occ | mask, left ^ bit)
+                self.solution.pop()
+
+    def count(self) -> int:
+        """Number of solutions, without building them."""
+        return self._count(self.blocked, self.pieces)
+
+    def _count(self, occ: int, left: int) -> int:
+        if occ == FULL_MASK:
+            return 0 if left else 1
+        free = ~occ & FULL_MASK
+        total = 0
+        for bit, mask, _ in self.anchored[(free & -free).bit_length() - 1]:
+            if bit & left and not mask & occ:
+                total += self._count(occ | mask, left ^ bit)
+        return total
+
+
+def render(b: list[list], solution: Iterable[Placement]) -> list[str]:
+    """Fill a board with a solution, flattened like the DLX row names
+    (rows joined by '\\n')."""
+    rows = [list(row) for row in b]
+    for p in solution:
+        for x, y in p.cells:
+            rows[x][y] = p.name
+    return list('\n'.join(''.join(row) for row in rows))
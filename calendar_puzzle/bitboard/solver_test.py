@@ -0,0 +1,55 @@
+import datetime
+import unittest
+import sys
+import os
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.bitboard.placements import ANCHORED, FULL_MASK, PLACEMENTS, PIECE_SIZES
+from calendar_puzzle.bitboard.solver import BitboardSolver, render
+from calendar_puzzle.board import Game
+from calendar_puzzle.dancing_link.calendar import FasterGame
+
+
+class TestPlacements(unittest.TestCase):
+    def test_masks_match_cells(self):
+        for p in PLACEMENTS:
+            self.assertEqual(bin(p.mask).count('1'), PIECE_SIZES[p.name])
+            self.assertEqual(p.mask & ~FULL_MASK, 0)
+        self.assertEqual(sum(len(a) for a in ANCHORED), len(PLACEMENTS))
+
+
+class TestBitboardSolver(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(datetime.date(2026, 5, 14))
+
+    def test_first_solution_is_exact_cover(self):
+        solver = BitboardSolver.from_board(self.game.board.b, self.game.board.remaining_shapes)
+        solution = next(solver.search())
+        self.assertEqual(sorted(p.name for p in solution), sorted(s.name for s in self.game.shapes))
+        covered = solver.blocked
+        for p in solution:
+            self.assertEqual(covered & p.mask, 0)
+            covered |= p.mask
+        self.assertEqual(covered, FULL_MASK)
+
+    def test_same_solutions_as_dlx_on_partial_board(self):
+        solver = BitboardSolver.from_board(self.game.board.b, self.game.board.remaining_shapes)
+        solution = next(solver.search())
+        # keep five pieces of a known solution and let both engines finish it
+        b_str = ''.join(render(self.game.board.b, solution[:5]))
+        g = FasterGame(self.game.dt)
+        g.board.b = [list(row) for row in b_str.split('\n')]
+        g.board.remaining_shapes = [s for s in g.board.remaining_shapes
+                                    if s.name not in {p.name for p in solution[:5]}]
+        g.build_shape()
+        dlx_boards = {''.join(g.render(s)) for s in g.search()}
+
+        partial = BitboardSolver.from_board(g.board.b, g.board.remaining_shapes)
+        bit_boards = {''.join(render(g.board.b, s)) for s in partial.search()}
+        self.assertEqual(bit_boards, dlx_boards)
+        self.assertEqual(partial.count(), len(dlx_boards))
+
+
+if __name__ == "__main__":
+    unittest.main()
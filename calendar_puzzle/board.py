@@ -1,7 +1,6 @@
 import datetime
 import random
-import copy
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from colorama import init, Fore
 init(autoreset=True)
@@ -10,6 +9,8 @@ from calendar_puzzle.shape import (EMPTY_SHAPE, Shape, ShapeU, ShapeV, ShapeI, S
                                    ShapeQ, ShapeS, ShapeN, ShapeT, ShapeZ,
                                    build_mx)
 from calendar_puzzle.constants import INITIAL_BLOCK_TYPES, BOARD_BLOCK, DATE_BLOCK, BOARD_ROWS, BOARD_COLS
+from calendar_puzzle.bitboard.holes import HoleTable
+from calendar_puzzle.bitboard.placements import FULL_MASK, PIECE_BITS, board_mask
 
 # 从常量中创建Shape实例
 SHAPE_MAP = {
@@ -41,11 +42,34 @@ COLOR_MAP = {
 }
 
 
+# cells outside the calendar, always blocked
+FRAME_CELLS = [(0, 6), (1, 6), (7, 0), (7, 1), (7, 2), (7, 3)]
+
+
+def month_cell(month: int) -> Tuple[int, int]:
+    return (month-1)//6, (month-1)%6
+
+
+def day_cell(day: int) -> Tuple[int, int]:
+    return 2+(day-1)//7, (day-1)%7
+
+
+def weekday_cell(weekday: int) -> Tuple[int, int]:
+    # weekday 0 is Monday, Sunday sits before Monday on the board
+    if weekday == 6:
+        return 6, 3
+    if 0 <= weekday <= 2:
+        return 6, 4+weekday
+    return 7, 1+weekday
+
+
 class Game(object):
     board = None
     shapes: List[Shape] = []  # [shape, ...]
     n, m = BOARD_ROWS, BOARD_COLS
     visited = set()
+    # HoleTable consulted by try_put after each placement, None to skip it
+    holes: HoleTable = None
 
     def __init__(self, dt=None) -> None:
         super().__init__()
@@ -64,22 +88,10 @@ class Game(object):
 
     def mark_date(self, dt=None):
         dt = self.dt if dt is None else dt
-        weekday = dt.weekday()
-        month, day = dt.month, dt.day
-        self.board.b[0][6] = BOARD_BLOCK
-        self.board.b[1][6] = BOARD_BLOCK
-        self.board.b[7][0] = BOARD_BLOCK
-        self.board.b[7][1] = BOARD_BLOCK
-        self.board.b[7][2] = BOARD_BLOCK
-        self.board.b[7][3] = BOARD_BLOCK
-        self.board.b[(month-1)//6][(month-1)%6] = DATE_BLOCK
-        self.board.b[2+(day-1)//7][(day-1)%7] = DATE_BLOCK
-        if weekday == 6:
-            self.board.b[6][3] = DATE_BLOCK
-        elif 0 <= weekday <= 2:
-            self.board.b[6][4+weekday] = DATE_BLOCK
-        else:
-            self.board.b[7][1+weekday] = DATE_BLOCK
+        for x, y in FRAME_CELLS:
+            self.board.b[x][y] = BOARD_BLOCK
+        for x, y in (month_cell(dt.month), day_cell(dt.day), weekday_cell(dt.weekday())):
+            self.board.b[x][y] = DATE_BLOCK
 
     def solve(self, find_one_exit=True):
         self.try_put(find_one_exit)
@@ -104,40 +116,60 @@ class Game(object):
             for j in range(self.m):
                 for k, shape in enumerate(self.board.remaining_shapes):
                     for ss in shape.all_shapes():
-                        succ, new_b = self.fit_put(i, j, ss)
-                        if new_b[x][y] != ' ' and succ:
-                            self.cnt += 1
-                            self.board.b, ori_b = new_b, copy.deepcopy(self.board.b)
-                            self.board.remaining_shapes = self.board.remaining_shapes[:k] + self.board.remaining_shapes[k+1:]
-                            if self.board not in self.visited:
-                                self.visited.add(self.board)
-                                self.try_put(find_one_exit)
-                                if self.should_exit:
-                                    return
-                            self.board.remaining_shapes = self.board.remaining_shapes[:k] + [shape] + self.board.remaining_shapes[k:]
-                            self.board.b = ori_b
+                        written = self.put(i, j, ss)
+                        if written is None:
+                            continue
+                        if self.board.b[x][y] == ' ' or (self.holes is not None and self.dead_end(self.board.b, k)):
+                            self.undo(written)
+                            continue
+                        self.cnt += 1
+                        self.board.remaining_shapes = self.board.remaining_shapes[:k] + self.board.remaining_shapes[k+1:]
+                        if self.board not in self.visited:
+                            self.visited.add(self.board)
+                            self.try_put(find_one_exit)
+                            if self.should_exit:
+                                return
+                        self.board.remaining_shapes = self.board.remaining_shapes[:k] + [shape] + self.board.remaining_shapes[k:]
+                        self.undo(written)
+
+    def dead_end(self, b: list[list], k: int) -> bool:
+        """Whether b, with remaining shape k just put on it, has a small hole
+        the other remaining shapes can not fill."""
+        pieces = sum(PIECE_BITS[s.name] for i, s in enumerate(self.board.remaining_shapes) if i != k)
+        return self.holes.dead_end(FULL_MASK ^ board_mask(b), pieces)
+
+    def put(self, x, y: int, shape: Shape) -> Optional[list[tuple]]:
+        """
+        Put shape with the top-left of its grid at (x, y), on the board in
+        place. Returns the (x, y, old value) of each cell it wrote, for
+        undo(), or None when the shape does not fit; the board is then
+        left as it was.
+        """
+        b = self.board.b
+        for i, j, _ in shape.cells:
+            if not (0 <= x+i < self.n and 0 <= y+j < self.m) or b[x+i][y+j] != ' ':
+                return None
+        written = []
+        for i, j, c in shape.cells:
+            written.append((x+i, y+j, ' '))
+            b[x+i][y+j] = c
+        return written
+
+    def undo(self, written: list[tuple]):
+        """Take back a put()."""
+        b = self.board.b
+        for x, y, old in reversed(written):
+            b[x][y] = old
 
     def fit_put(self, x, y: int, shape: Shape) -> Tuple[bool, list[list]]:
-        if len(shape.grid) == 0:
-            return True, self.board.b
-        n, m = len(shape.grid), len(shape.grid[0])
-        new_b = copy.deepcopy(self.board.b)
-        succ = True
-        for i in range(n):
-            for j in range(m):
-                if shape.grid[i][j] == ' ':
-                    continue
-                if not (0 <= x+i < self.n and 0 <= y+j < self.m):
-                    succ = False
-                    break
-                if new_b[x+i][y+j] == ' ':
-                    new_b[x+i][y+j] = shape.grid[i][j]
-                else:
-                    succ = False
-                    break
-            if not succ:
-                break
-        return succ, new_b
+        """Whether shape fits at (x, y), and a new board with it put there
+        (the unchanged board when it does not fit)."""
+        written = self.put(x, y, shape)
+        if written is None:
+            return False, self.board.b
+        new_b = [row.copy() for row in self.board.b]
+        self.undo(written)
+        return True, new_b
 
     def save(self):
         if self.wf is None:
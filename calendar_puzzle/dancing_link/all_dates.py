@@ -0,0 +1,208 @@
+# one exact cover matrix for every (month, day, weekday) key at once. the
+# board has no date marked; each date group (month, day, weekday) gets a
+# column that exactly one "hole" row covers, and a hole row also covers its
+# cell, so every solution leaves one cell of each group uncovered.
+# placements shared by many keys are then explored once for all of them
+import datetime
+from typing import Iterator, NamedTuple, Tuple
+
+from calendar_puzzle.bitboard.placements import PLACEMENTS, Placement
+from calendar_puzzle.bitboard.solver import render
+from calendar_puzzle.board import FRAME_CELLS, day_cell, month_cell, weekday_cell
+from calendar_puzzle.constants import BOARD_BLOCK, BOARD_COLS, BOARD_ROWS, DATE_BLOCK, EMPTY_CELL
+from calendar_puzzle.dancing_link.dl import Dlx
+from calendar_puzzle.dancing_link.heuristics import cells_first
+from calendar_puzzle.shape import AllShapes
+
+# (month, day, weekday), weekday 0 is Monday like datetime.date.weekday()
+Key = Tuple[int, int, int]
+
+
+class Hole(NamedTuple):
+    group: int              # 0 month, 1 day, 2 weekday
+    value: int              # the month, day or weekday it leaves uncovered
+    cell: Tuple[int, int]
+
+
+GROUPS = [
+    [Hole(0, month, month_cell(month)) for month in range(1, 13)],
+    [Hole(1, day, day_cell(day)) for day in range(1, 32)],
+    [Hole(2, weekday, weekday_cell(weekday)) for weekday in range(7)],
+]
+# a set of holes, one per group at most, is the sum of their codes: month
+# in bits 0-3, day in bits 4-8, weekday + 1 in bits 9-11 (0 is no hole)
+CODE_SHIFTS = [0, 4, 9]
+# Dlx.count memo entries kept by count_key before starting over
+MAX_MEMO = 2_000_000
+
+
+def hole_code(hole: Hole) -> int:
+    return (hole.value + (hole.group == 2)) << CODE_SHIFTS[hole.group]
+
+
+def decode(code: int) -> list[int]:
+    return [code & 15, code >> 4 & 31, (code >> 9) - 1]
+
+
+def valid_keys() -> set:
+    """Every key that some date has (February 29th included)."""
+    keys = set()
+    for month in range(1, 13):
+        for day in range(1, 32):
+            try:
+                datetime.date(2024, month, day)
+            except ValueError:
+                continue
+            keys.update((month, day, weekday) for weekday in range(7))
+    return keys
+
+
+def date_board(key: Key) -> list[list]:
+    """The empty board of a key, frame and date cells blocked."""
+    b = [[EMPTY_CELL] * BOARD_COLS for _ in range(BOARD_ROWS)]
+    for x, y in FRAME_CELLS:
+        b[x][y] = BOARD_BLOCK
+    month, day, weekday = key
+    for x, y in (month_cell(month), day_cell(day), weekday_cell(weekday)):
+        b[x][y] = DATE_BLOCK
+    return b
+
+
+class AllDates:
+    def __init__(self):
+        frame = set(FRAME_CELLS)
+        cells = [(x, y) for x in range(BOARD_ROWS) for y in range(BOARD_COLS) if (x, y) not in frame]
+        cell_col = {cell: j for j, cell in enumerate(cells)}
+        piece_col = {shape.name: len(cells) + i for i, shape in enumerate(AllShapes)}
+        self.group_cols = [len(cells) + len(piece_col) + g for g in range(len(GROUPS))]
+        n_cols = self.group_cols[-1] + 1
+
+        # matrix row i+1 is self.rows[i], a Placement or a Hole
+        self.rows: list = []
+        mx = []
+        for p in PLACEMENTS:
+            if any(cell in frame for cell in p.cells):
+                continue
+            row = [0] * n_cols
+            for cell in p.cells:
+                row[cell_col[cell]] = 1
+            row[piece_col[p.name]] = 1
+            mx.append(row)
+            self.rows.append(p)
+        self.hole_rows: dict[Hole, int] = {}
+        # matrix row -> hole code, see CODE_SHIFTS
+        self.hole_codes: dict[int, int] = {}
+        for g, holes in enumerate(GROUPS):
+            for hole in holes:
+                row = [0] * n_cols
+                row[cell_col[hole.cell]] = 1
+                row[self.group_cols[g]] = 1
+                mx.append(row)
+                self.rows.append(hole)
+                self.hole_rows[hole] = len(self.rows)
+                self.hole_codes[len(self.rows)] = hole_code(hole)
+        self.dlx = Dlx(mx)
+        self.keys = valid_keys()
+
+    def split(self, solution) -> Tuple[Key, list[Placement]]:
+        """Key and placements of a raw solution."""
+        values = [0, 0, 0]
+        placements = []
+        for node in solution:
+            row = self.rows[node.coordinate[0] - 1]
+            if isinstance(row, Hole):
+                values[row.group] = row.value
+            else:
+                placements.append(row)
+        return tuple(values), placements
+
+    def search(self) -> Iterator[Tuple[Key, list[Placement]]]:
+        """Every solution of every valid key, keys interleaved."""
+        for solution in self.dlx.search():
+            key, placements = self.split(solution)
+            if key in self.keys:
+                yield key, placements
+
+    def select_key(self, key: tuple):
+        """Select the hole rows of a key, or of its first groups only, undo
+        with self.dlx.unwind()."""
+        for g, value in enumerate(key):
+            col = self.dlx.nodes[self.group_cols[g]]
+            self.dlx.cover(col)
+            row_idx = self.hole_rows[GROUPS[g][value - 1 if g < 2 else value]]
+            row = col.down
+            while row.coordinate[0] != row_idx:
+                row = row.down
+            self.dlx.select(row)
+
+    def search_key(self, key: Key) -> Iterator[list[Placement]]:
+        """Solutions of one key."""
+        self.select_key(key)
+        try:
+            for solution in self.dlx.search():
+                yield self.split(solution)[1]
+        finally:
+            self.dlx.unwind()
+
+    def count_key(self, key: Key) -> int:
+        """Solution count of one key. The memo of Dlx.count is kept between
+        keys, so residual boards met under several keys are counted once."""
+        if len(self.dlx.counts) > MAX_MEMO:
+            self.dlx.counts.clear()
+        self.select_key(key)
+        try:
+            return self.dlx.count()
+        finally:
+            self.dlx.unwind()
+
+    def count_keys(self, prefix: tuple = ()) -> dict:
+        """
+        Solution count of every valid key starting with prefix (the month,
+        or the month and day) from one search. The remaining date groups are
+        branched on last, so a tiling of the other cells is counted once for
+        all the keys it fits.
+        """
+        dlx = self.dlx
+        heuristic = dlx.heuristic
+        dlx.heuristic = cells_first(sum(1 << j for j in self.group_cols))
+        self.select_key(prefix)
+        try:
+            codes = self._count_codes({})
+        finally:
+            dlx.unwind()
+            dlx.heuristic = heuristic
+        counts = {key: 0 for key in self.keys if key[:len(prefix)] == prefix}
+        for code, n in codes.items():
+            key = tuple(prefix) + tuple(decode(code)[len(prefix):])
+            if key in counts:
+                counts[key] = n
+        return counts
+
+    def _count_codes(self, memo: dict) -> dict[int, int]:
+        # hole code of the rest of the solution -> number of solutions
+        dlx = self.dlx
+        if dlx.head.right == dlx.head:
+            return {0: 1}
+        key = dlx.live
+        codes = memo.get(key)
+        if codes is not None:
+            return codes
+        codes = {}
+        col = dlx.choose_column()
+        dlx.cover(col)
+        row = col.down
+        while row != col:
+            dlx.select(row)
+            sub = self._count_codes(memo)
+            dlx.unselect(row)
+            code = self.hole_codes.get(row.coordinate[0], 0)
+            for c, n in sub.items():
+                codes[c + code] = codes.get(c + code, 0) + n
+            row = row.down
+        dlx.uncover(col)
+        memo[key] = codes
+        return codes
+
+    def render(self, key: Key, placements: list[Placement]) -> str:
+        """The 56-char board string of a solution, like gen_pack writes."""
+        return ''.join(render(date_board(key), placements)).replace('\n', '')
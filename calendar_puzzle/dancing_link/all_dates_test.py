@@ -0,0 +1,54 @@
+import datetime
+import unittest
+import sys
+import os
+from itertools import islice
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.bitboard.placements import PIECE_SIZES
+from calendar_puzzle.board import Game
+from calendar_puzzle.dancing_link.all_dates import GROUPS, AllDates, date_board, decode, hole_code, valid_keys
+
+
+class TestAllDates(unittest.TestCase):
+    def setUp(self):
+        self.solver = AllDates()
+
+    def assertSolves(self, key, board):
+        self.assertEqual(len(board), 56)
+        self.assertEqual(board, ''.join(''.join(
+            c if c != ' ' else board[x * 7 + y] for y, c in enumerate(row))
+            for x, row in enumerate(date_board(key))))
+        for name, size in PIECE_SIZES.items():
+            self.assertEqual(board.count(name), size)
+
+    def test_keys_and_codes(self):
+        self.assertEqual(len(valid_keys()), 366 * 7)
+        self.assertNotIn((2, 30, 0), valid_keys())
+        for group in GROUPS:
+            for hole in group:
+                code = hole_code(hole)
+                self.assertEqual(decode(code)[hole.group], hole.value)
+        dt = datetime.date(2026, 5, 14)
+        self.assertEqual(date_board((5, 14, 3)), Game(dt).board.b)
+
+    def test_search_yields_valid_keys(self):
+        seen = set()
+        for key, placements in islice(self.solver.search(), 50):
+            self.assertIn(key, self.solver.keys)
+            self.assertSolves(key, self.solver.render(key, placements))
+            seen.add(key)
+        self.assertGreater(len(seen), 1)
+
+    def test_search_key(self):
+        key = (5, 14, 3)
+        solutions = self.solver.search_key(key)
+        for placements in islice(solutions, 5):
+            self.assertSolves(key, self.solver.render(key, placements))
+        solutions.close()
+        self.assertEqual(self.solver.dlx.solution, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
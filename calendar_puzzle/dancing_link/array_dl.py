@@ -0,0 +1,181 @@
+from collections import defaultdict
+from typing import NamedTuple
+
+from calendar_puzzle.dancing_link.dl import col_name
+
+
+class ArrayNode(NamedTuple):
+    """Read-only view of one array node, shaped like `dl.Node` for callers
+    that only look at `coordinate` and `name` of solution steps."""
+    coordinate: tuple[int, int]
+    name: str
+
+
+# dancing link whose links live in flat int lists indexed by node id
+# node 0 is the root, nodes 1..m are column heads, the rest are matrix 1s
+class ArrayDlx:
+    def __init__(self, mx, row_names=None):
+        n, m = len(mx), len(mx[0])
+        self.row_names = [f'{i}' for i in range(n+1)] if row_names is None else row_names
+        assert(len(self.row_names) == n+1)
+        self.n_cols = m
+        self.solution: list[int] = []
+        # bit c set while column c is uncovered, see Dlx.live
+        self.live = ((1 << (m+1)) - 1) ^ 1
+        self.counts: dict[int, int] = {}
+        self.nodes_visited = 0
+
+        # root + column heads link to themselves vertically
+        self.L = [m] + list(range(m))
+        self.R = list(range(1, m+1)) + [0]
+        self.U = list(range(m+1))
+        self.D = list(range(m+1))
+        self.C = list(range(m+1))
+        self.S = [0] * (m+1)
+        self.ROW = [0] * (m+1)
+
+        L, R, U, D, C, S, ROW = self.L, self.R, self.U, self.D, self.C, self.S, self.ROW
+        for i in range(n):
+            first = -1
+            for j in range(m):
+                if not mx[i][j]:
+                    continue
+                col = j + 1
+                x = len(C)
+                C.append(col)
+                ROW.append(i + 1)
+                # append to the bottom of the column
+                U.append(U[col])
+                D.append(col)
+                D[U[col]] = x
+                U[col] = x
+                S[col] += 1
+                # append to the end of the row
+                if first < 0:
+                    first = x
+                    L.append(x)
+                    R.append(x)
+                else:
+                    L.append(L[first])
+                    R.append(first)
+                    R[L[first]] = x
+                    L[first] = x
+
+    def node(self, x: int) -> ArrayNode:
+        j = self.C[x] - 1
+        return ArrayNode((self.ROW[x], j + 1), f"{col_name(j)}{self.ROW[x]}")
+
+    def search(self, k=0):
+        if self.R[0] == 0:
+            yield [self.node(x) for x in self.solution]
+            return
+
+        R, L, D, C = self.R, self.L, self.D, self.C
+        col = self.choose_column()
+        self.cover(col)
+        row = D[col]
+        while row != col:
+            self.solution.append(row)
+            j = R[row]
+            while j != row:
+                self.cover(C[j])
+                j = R[j]
+            yield from self.search(k + 1)
+            row = self.solution.pop()
+            j = L[row]
+            while j != row:
+                self.uncover(C[j])
+                j = L[j]
+            row = D[row]
+        self.uncover(col)
+
+    def count(self) -> int:
+        """Count solutions, memoized by the uncovered columns like Dlx.count."""
+        R, L, D, C = self.R, self.L, self.D, self.C
+        if R[0] == 0:
+            return 1
+        key = self.live
+        total = self.counts.get(key)
+        if total is not None:
+            return total
+
+        total = 0
+        col = self.choose_column()
+        self.cover(col)
+        row = D[col]
+        while row != col:
+            j = R[row]
+            while j != row:
+                self.cover(C[j])
+                j = R[j]
+            total += self.count()
+            j = L[row]
+            while j != row:
+                self.uncover(C[j])
+                j = L[j]
+            row = D[row]
+        self.uncover(col)
+        self.counts[key] = total
+        return total
+
+    def choose_column(self) -> int:
+        self.nodes_visited += 1
+        R, S = self.R, self.S
+        col = R[0]
+        min_value = S[col]
+        c = R[col]
+        while c != 0:
+            if S[c] < min_value:
+                min_value = S[c]
+                col = c
+            c = R[c]
+        return col
+
+    def iter_columns(self):
+        c = self.R[0]
+        while c != 0:
+            yield c
+            c = self.R[c]
+
+    def cover(self, col: int):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        self.live ^= 1 << col
+        R[L[col]] = R[col]
+        L[R[col]] = L[col]
+        row = D[col]
+        while row != col:
+            j = R[row]
+            while j != row:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            row = D[row]
+
+    def uncover(self, col: int):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        row = U[col]
+        while row != col:
+            j = L[row]
+            while j != row:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            row = U[row]
+        R[L[col]] = col
+        L[R[col]] = col
+        self.live |= 1 << col
+
+    def display_mx(self):
+        display_mx = defaultdict(lambda: defaultdict(str))
+        n, m = 0, 0
+        for col in self.iter_columns():
+            x = self.D[col]
+            while x != col:
+                node = self.node(x)
+                display_mx[node.coordinate[0]-1][node.coordinate[1]-1] = node.name
+                n = max(n, node.coordinate[0])
+                m = max(m, node.coordinate[1])
+                x = self.D[x]
+        return display_mx, n, m
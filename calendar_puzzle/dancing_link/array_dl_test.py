@@ -0,0 +1,65 @@
+import datetime
+import itertools
+import unittest
+import sys
+import os
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.dancing_link.array_dl import ArrayDlx
+from calendar_puzzle.dancing_link.calendar import FasterGame
+
+MATRIX = [
+    [0, 0, 1, 0, 1, 1, 0],
+    [1, 0, 0, 1, 0, 0, 1],
+    [0, 1, 1, 0, 0, 1, 0],
+    [1, 0, 0, 1, 0, 0, 0],
+    [0, 1, 0, 0, 0, 0, 1],
+    [0, 0, 0, 1, 1, 0, 1],
+]
+
+
+class TestArrayDlx(unittest.TestCase):
+    def assert_matches(self, dlx, matrix):
+        mx, n, m = dlx.display_mx()
+        for row_idx, row in enumerate(matrix):
+            for col_idx, val in enumerate(row):
+                self.assertEqual(len(mx[row_idx][col_idx]) > 0, bool(val), f"({row_idx}, {col_idx})")
+
+    def test_init(self):
+        dlx = ArrayDlx(MATRIX)
+        self.assertEqual([dlx.S[c] for c in dlx.iter_columns()],
+                         [sum(row[j] for row in MATRIX) for j in range(7)])
+        self.assert_matches(dlx, MATRIX)
+
+    def test_choose_column(self):
+        dlx = ArrayDlx(MATRIX)
+        self.assertEqual(dlx.S[dlx.choose_column()], 2)
+
+    def test_cover_uncover(self):
+        dlx = ArrayDlx(MATRIX)
+        dlx.cover(1) # rm A col and the rows through it
+        self.assert_matches(dlx, [row if row[0] == 0 else [0] * 7 for row in MATRIX])
+        dlx.uncover(1)
+        self.assert_matches(dlx, MATRIX)
+
+    def test_search(self):
+        solutions = list(ArrayDlx(MATRIX).search())
+        self.assertEqual([[step.coordinate[0] for step in s] for s in solutions], [[4, 1, 5]])
+
+    def test_count(self):
+        dlx = ArrayDlx(MATRIX)
+        self.assertEqual(dlx.count(), 1)
+        self.assertEqual(dlx.live, 0b11111110)
+
+    def test_same_solutions_as_dlx(self):
+        dt = datetime.date(2026, 5, 14)
+        linked = FasterGame(dt).dlx
+        flat = FasterGame(dt, engine='array').dlx
+        for a, b in itertools.islice(zip(linked.search(), flat.search()), 20):
+            self.assertEqual([s.coordinate for s in a], [s.coordinate for s in b])
+            self.assertEqual([s.name for s in a], [s.name for s in b])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+from calendar_puzzle.dancing_link.dl import Dlx, Node
+
+
+# Dlx whose live column heads are bucketed by size, so the minimum column is
+# the first of the lowest non-empty bucket instead of a scan of every column.
+# self.low is a lower bound of that bucket's size: cover/uncover lower it
+# when a column lands in a lower bucket, min_column raises it past buckets
+# that have emptied, so it does not rescan from size 0. keeping the buckets
+# costs two dict updates per size change in cover/uncover, which outweighs
+# the column scans saved on the calendar matrix (about 2x slower than Dlx)
+class BucketDlx(Dlx):
+    def __init__(self, mx, row_names=None, heuristic=None):
+        super().__init__(mx, row_names, heuristic)
+        # size -> live column heads of that size (dict keeps insertion order)
+        self.buckets: list[dict[Node, None]] = [{} for _ in range(len(mx) + 1)]
+        for col in self.iter_columns():
+            self.buckets[col.size][col] = None
+        self.low = 0
+
+    def min_column(self):
+        buckets = self.buckets
+        low = self.low
+        while low < len(buckets) and not buckets[low]:
+            low += 1
+        if low == len(buckets):
+            return self.head.right
+        self.low = low
+        return next(iter(buckets[low]))
+
+    def cover(self, col_head: Node):
+        buckets = self.buckets
+        low = self.low
+        self.live ^= col_head.bit
+        del buckets[col_head.size][col_head]
+        col_head.left.right = col_head.right
+        col_head.right.left = col_head.left
+        row = col_head.down
+        while row != col_head:
+            j = row.right
+            while j != row:
+                j.down.up = j.up
+                j.up.down = j.down
+                head = j.head
+                size = head.size
+                del buckets[size][head]
+                size -= 1
+                head.size = size
+                buckets[size][head] = None
+                if size < low:
+                    low = size
+                j = j.right
+            row = row.down
+        self.low = low
+
+    def uncover(self, col_head: Node):
+        buckets = self.buckets
+        row = col_head.up
+        while row != col_head:
+            j = row.left
+            while j != row:
+                head = j.head
+                size = head.size
+                del buckets[size][head]
+                size += 1
+                head.size = size
+                buckets[size][head] = None
+                j.down.up = j
+                j.up.down = j
+                j = j.left
+            row = row.up
+        col_head.left.right = col_head
+        col_head.right.left = col_head
+        buckets[col_head.size][col_head] = None
+        if col_head.size < self.low:
+            self.low = col_head.size
+        self.live |= col_head.bit
@@ -1,116 +1,336 @@
 # generate each shape which put in a board, present it as a row of dancing link
 # convert matrix to an array and use it as a row of dancing link
 import datetime
-import copy
+import random
 from itertools import zip_longest
-from typing import Tuple
+from typing import Optional, Tuple
 from calendar_puzzle.board import BOARD_BLOCK, DATE_BLOCK, Board, Game, COLOR_MAP
-from calendar_puzzle.dancing_link.dl import Dlx, Node
+from calendar_puzzle.dancing_link.dl import Dlx
+from calendar_puzzle.dancing_link.array_dl import ArrayDlx
+from calendar_puzzle.dancing_link.bucket_dl import BucketDlx
+from calendar_puzzle.dancing_link.sparse_dl import SparseDlx
+from calendar_puzzle.dancing_link import heuristics, pruning, restarts
+from calendar_puzzle.bitboard import holes, solver as bitboard
+from calendar_puzzle.bitboard.placements import PLACEMENTS, PLACEMENTS_AT, Placement, board_mask
+from calendar_puzzle.dancing_link.ordering import Ordering
+from calendar_puzzle.dancing_link.zdd import Zdd
 from calendar_puzzle.shape import Shape
 from colorama import Fore
 
+# exact cover engines FasterGame can build its matrix with, they share the
+# `search()` contract: yield lists of steps whose coordinate[0] is the row
+ENGINES = {
+    'dlx': Dlx,
+    'array': ArrayDlx,
+    'bucket': BucketDlx,
+    'sparse': SparseDlx,
+}
+# the bitboard solver skips the matrix and searches placements directly
+BITBOARD = 'bitboard'
+ALL_ENGINES = sorted([*ENGINES, BITBOARD])
+
+# branching heuristics of the Dlx based engines, built from the game
+# because some need to know which matrix columns are cells and pieces
+HEURISTICS = {
+    'mrv': lambda g: heuristics.mrv,
+    'cells-first': lambda g: heuristics.cells_first(sum(1 << j for j in g.piece_columns())),
+    'hardest-cell': lambda g: heuristics.static_order(g.hardest_cell_order()),
+}
+
+# search pruners of the Dlx based engines, any number of them can be enabled
+PRUNERS = {
+    'island': lambda g: pruning.island(g.column_cells(), g.column_pieces()),
+    'parity': lambda g: pruning.parity(g.column_cells(), g.column_pieces()),
+    'holes': lambda g: pruning.holes(g.column_cells(), g.column_pieces(), holes.shared()),
+}
+
 
 class FasterGame(Game):
     # if build_shape again
     _modified = False
-    def __init__(self, dt=None) -> None:
+    # seed of the restart that settled the last solve(randomized=True), None
+    # for the usual order, see restarts.first_solution
+    seed = None
+    # placement id -> a node of its matrix row, see select_placements
+    _rows = None
+    def __init__(self, dt=None, engine='dlx', heuristic='mrv', pruners=(), ordering: Ordering = None) -> None:
         if dt is None:
             dt = datetime.date.today()
         super().__init__(dt)
+        self.engine = engine
+        self.heuristic = heuristic
+        self.pruners = tuple(pruners)
+        # matrix rows are sorted by it when set, most frequent placement first
+        self.ordering = ordering
         self.build_shape()
     
     def build_shape(self):
+        if self.engine == BITBOARD:
+            self.dlx = None
+            self.bitboard = bitboard.BitboardSolver.from_board(self.board.b, self.board.remaining_shapes)
+            self._modified = False
+            return
+        # a row is named by its placement id, see row_placements and render
         mx, row_names = [], ['head']
-        for row, row_name in self.gen_shape_in_board():
+        for row, placement_id in self.gen_shape_in_board():
             mx.append(row)
-            row_names.append(row_name)
-        self.dlx = Dlx(mx, row_names)
-        self.modified = False
+            row_names.append(placement_id)
+        if self.ordering is not None:
+            order = self.ordering.order((self.dt.month, self.dt.day, self.dt.weekday()), row_names[1:])
+            mx = [mx[i] for i in order]
+            row_names = ['head'] + [row_names[i + 1] for i in order]
+        self.dlx = ENGINES[self.engine](mx, row_names)
+        self._rows = None
+        if isinstance(self.dlx, Dlx):
+            self.dlx.heuristic = HEURISTICS[self.heuristic](self)
+            self.dlx.prune = pruning.combine([PRUNERS[p](self) for p in self.pruners])
+        elif self.heuristic != 'mrv':
+            raise ValueError(f'engine {self.engine} only supports the mrv heuristic')
+        elif self.pruners:
+            raise ValueError(f'engine {self.engine} does not support pruning')
+        self._modified = False
+
+    def piece_columns(self) -> range:
+        """Matrix columns of the remaining shapes, after all cell columns."""
+        n_cols = len(self.dlx.nodes)
+        return range(n_cols - len(self.board.remaining_shapes), n_cols)
+
+    def column_cells(self) -> dict[int, tuple[int, int]]:
+        """Board cell of each cell column, the last empty cell is column 0."""
+        empty = [(i, j) for i in range(self.n) for j in range(self.m) if self.board.b[i][j] == ' ']
+        return {col: cell for col, cell in enumerate(reversed(empty))}
+
+    def column_pieces(self) -> dict[int, str]:
+        """Shape name of each piece column, the first remaining shape is the last column."""
+        n_cols = len(self.dlx.nodes)
+        return {n_cols - 1 - k: shape.name for k, shape in enumerate(self.board.remaining_shapes)}
+
+    def hardest_cell_order(self) -> list[int]:
+        """Cell columns by how few placements cover them, then piece columns."""
+        pieces = self.piece_columns()
+        cells = [j for j in range(len(self.dlx.nodes)) if j not in pieces]
+        size = lambda j: self.dlx.nodes[j].size
+        return sorted(cells, key=size) + sorted(pieces, key=size)
     
-    def fit_put(self, x, y: int, shape: Shape) -> Tuple[bool, list[list]]:
+    def put(self, x, y: int, shape: Shape) -> Optional[list[tuple]]:
         """
-        Check if a shape can fit at position (x, y) and return the updated board.
-        This method handles the dancing link constraints by ensuring:
+        Put a shape at position (x, y) in place, see Game.put. This method
+        handles the dancing link constraints by ensuring:
         1. The shape fits within board boundaries
         2. The shape doesn't overlap with existing blocks or marked cells
         3. The shape only covers empty cells and doesn't conflict with other shapes
         """
-        if len(shape.grid) == 0:
-            return True, self.board.b
-        
-        n, m = len(shape.grid), len(shape.grid[0])
-        new_b = copy.deepcopy(self.board.b)
-        succ = True
-        
-        # Check if shape can fit at position (x, y)
-        for i in range(n):
-            for j in range(m):
-                if shape.grid[i][j] == ' ':
-                    continue
-                
-                # Check boundaries
-                if not (0 <= x+i < self.n and 0 <= y+j < self.m):
-                    succ = False
-                    break
-                
-                # Check if the cell is available for placement
-                cell_content = new_b[x+i][y+j]
-                if cell_content == ' ':
-                    # Empty cell, can place shape
-                    new_b[x+i][y+j] = shape.name
-                elif cell_content == shape.name:
-                    # Already occupied by the same shape, this is valid
-                    continue
-                elif cell_content in [DATE_BLOCK, BOARD_BLOCK]:
-                    # Marked cells (date/weekday) cannot be covered
-                    succ = False
-                    break
-                else:
-                    # Cell occupied by another shape, conflict
-                    succ = False
-                    break
-            
-            if not succ:
-                break
-        
-        self._modified = self._modified or succ
-        return succ, new_b
-        
+        b = self.board.b
+        name = shape.name
+        for i, j, _ in shape.cells:
+            # an empty cell, or one already occupied by the same shape
+            if not (0 <= x+i < self.n and 0 <= y+j < self.m) or b[x+i][y+j] not in (' ', name):
+                return None
+        written = []
+        for i, j, _ in shape.cells:
+            if b[x+i][y+j] == ' ':
+                written.append((x+i, y+j, ' '))
+                b[x+i][y+j] = name
+        self._modified = True
+        return written
+
+    def fit_put(self, x, y: int, shape: Shape) -> Tuple[bool, list[list]]:
+        """Game.fit_put: it takes the shape off again, so the matrix stays
+        as clean or dirty as it was."""
+        modified = self._modified
+        try:
+            return super().fit_put(x, y, shape)
+        finally:
+            self._modified = modified
+
     def gen_shape_in_board(self):
-        shape_n = len(self.board.remaining_shapes)
-        row_visit = set()
-        nn = len(self.board.remaining_shapes)
-        for i in range(self.n):
-            for j in range(self.m):
-                if self.board.b[i][j] == ' ':
-                    nn += 1
+        """
+        Matrix row and placement id of every placement of the remaining
+        shapes that fits the empty cells, filtered from the precomputed
+        placement table by the board's blocked mask.
+        """
+        b = self.board.b
+        shapes = self.board.remaining_shapes
+        blocked = board_mask(b)
+        empty = [(i, j) for i in range(self.n) for j in range(self.m) if b[i][j] == ' ']
+        # the last empty cell is column 0, the first remaining shape the last column
+        nn = len(empty) + len(shapes)
+        col = {cell: len(empty) - 1 - k for k, cell in enumerate(empty)}
         for i in range(self.n):
             for j in range(self.m):
-                for k, shape in enumerate(self.board.remaining_shapes):
-                    for ss in shape.all_shapes():
-                        succ, new_b = self.fit_put(i, j, ss)
-                        if succ:
-                            row_int = board_k2int(new_b, k, ss, shape_n)
-                            if row_int not in row_visit:
-                                row_visit.add(row_int)
-                                row_arr = fill_up_lead_zeros(int2arr(row_int), nn)
-                                row_name = '\n'.join([''.join(row) for row in new_b])
-                                yield row_arr, row_name
-
-    def solve(self, find_one_exit=True):
+                at = PLACEMENTS_AT[(i, j)]
+                for k, shape in enumerate(shapes):
+                    for p in at[shape.name]:
+                        if p.mask & blocked:
+                            continue
+                        row_arr = [0] * nn
+                        row_arr[nn - 1 - k] = 1
+                        for cell in p.cells:
+                            row_arr[col[cell]] = 1
+                        yield row_arr, p.id
+
+    def search(self):
+        """Yield raw solutions of the selected engine, see `render`."""
+        if self.engine == BITBOARD:
+            return self.bitboard.search()
+        return self.dlx.search()
+
+    def count(self) -> int:
+        """Number of solutions without materialising them."""
         if self._modified:
             self.build_shape()
-        for solution in self.dlx.search():
-            b_str = []
-            for step in solution:
-                new_b_str = self.dlx.row_names[step.coordinate[0]]
-                if len(b_str) == 0:
-                    b_str = list(new_b_str)
-                    continue
-                assert(len(b_str) == len(new_b_str))
-                for i in range(len(b_str)):
-                    if b_str[i] != new_b_str[i] and b_str[i] == ' ':
-                        b_str[i] = new_b_str[i]
+        if self.engine == BITBOARD:
+            return self.bitboard.count()
+        return self.dlx.count()
+
+    def page(self, cursor=None, limit=100) -> Tuple[list[str], str]:
+        """
+        Up to `limit` solutions as 56-char strings, resuming after `cursor`,
+        and the cursor of the last one (None once the search is exhausted).
+        A cursor is the '.'-joined row index at each depth, see Dlx.cursor.
+        """
+        if self._modified:
+            self.build_shape()
+        if not isinstance(self.dlx, Dlx):
+            raise ValueError(f'paging needs the dlx engine, not {self.engine}')
+        rows = [int(r) for r in cursor.split('.')] if cursor else None
+        depth = len(self.dlx.solution)
+        boards, next_cursor = [], None
+        for solution in self.dlx.iter_search(rows):
+            boards.append(''.join(self.render(solution)).replace('\n', ''))
+            if len(boards) >= limit:
+                next_cursor = '.'.join(map(str, self.dlx.cursor()))
+                break
+        self.dlx.unwind(depth)
+        return boards, next_cursor
+
+    def page_at(self, offset: int, limit=100) -> list[str]:
+        """
+        Up to `limit` solutions as 56-char strings from the offset-th one
+        (from 0) in search() order: one unrank to get there, see
+        solution_at, then the search goes on from it like page().
+        """
+        if self._modified:
+            self.build_shape()
+        if offset >= self.count():
+            return []
+        first = self.solution_at(offset)
+        boards = [''.join(self.render(first)).replace('\n', '')]
+        if limit > 1:
+            more, _ = self.page('.'.join(str(step.coordinate[0]) for step in first), limit - 1)
+            boards += more
+        return boards
+
+    def sample(self, k=1, rng=None) -> list:
+        """
+        k raw solutions drawn uniformly at random (with replacement), see
+        Dlx.sample. The first draw costs one count(), later ones are cheap.
+        """
+        if self._modified:
+            self.build_shape()
+        if not isinstance(self.dlx, Dlx):
+            raise ValueError(f'sampling needs the dlx engine, not {self.engine}')
+        rng = random.Random() if rng is None else rng
+        solutions = []
+        for _ in range(k):
+            solution = self.dlx.sample(rng)
+            if solution is None:
+                break
+            solutions.append(solution)
+        return solutions
+
+    def solution_at(self, k: int) -> list:
+        """The k-th raw solution (from 0) in search() order, see Dlx.unrank."""
+        if self._modified:
+            self.build_shape()
+        if not isinstance(self.dlx, Dlx):
+            raise ValueError(f'ranking needs the dlx engine, not {self.engine}')
+        return self.dlx.unrank(k)
+
+    def solution_index(self, solution) -> int:
+        """Index in search() order of a raw solution, see Dlx.rank."""
+        if self._modified:
+            self.build_shape()
+        if not isinstance(self.dlx, Dlx):
+            raise ValueError(f'ranking needs the dlx engine, not {self.engine}')
+        return self.dlx.rank(step.coordinate[0] for step in solution)
+
+    def row_placements(self) -> list[Placement]:
+        """Placement of each matrix row, index 0 is the head."""
+        return [None] + [PLACEMENTS[i] for i in self.dlx.row_names[1:]]
+
+    def select_placements(self, placements) -> bool:
+        """
+        Select the matrix rows of pieces already on the board, so the search
+        only completes it and the matrix of the board without them serves
+        every partial state. False, with nothing selected, when one of them
+        is not a row of the matrix or overlaps the ones before it. Undo with
+        self.dlx.unwind().
+        """
+        if self._modified:
+            self.build_shape()
+        if not isinstance(self.dlx, Dlx):
+            raise ValueError(f'selecting placements needs the dlx engine, not {self.engine}')
+        dlx = self.dlx
+        if self._rows is None:
+            self._rows = {}
+            for col in dlx.iter_columns():
+                node = col.down
+                while node != col:
+                    self._rows.setdefault(dlx.row_names[node.coordinate[0]], node)
+                    node = node.down
+        depth = len(dlx.solution)
+        for p in placements:
+            row = self._rows.get(p.id)
+            node = row
+            while row is not None:
+                if not node.head.bit & dlx.live:
+                    row = None
+                    break
+                node = node.right
+                if node == row:
+                    break
+            if row is None:
+                dlx.unwind(depth)
+                return False
+            dlx.cover(row.head)
+            dlx.select(row)
+        return True
+
+    def placements(self, solution) -> list[Placement]:
+        """Placements of a raw solution."""
+        if self.engine == BITBOARD:
+            return list(solution)
+        return [PLACEMENTS[self.dlx.row_names[step.coordinate[0]]] for step in solution]
+
+    def zdd(self) -> Zdd:
+        """Every solution of the board as a Zdd over placement ids."""
+        if self._modified:
+            self.build_shape()
+        if not isinstance(self.dlx, Dlx):
+            raise ValueError(f'the zdd needs the dlx engine, not {self.engine}')
+        row_names = self.dlx.row_names
+        return Zdd.from_dlx(self.dlx, lambda row: row_names[row.coordinate[0]])
+
+    def render(self, solution) -> list[str]:
+        """Draw a raw solution on the board, flattened (rows joined by '\\n')."""
+        return bitboard.render(self.board.b, self.placements(solution))
+
+    def solve(self, find_one_exit=True, randomized=False):
+        """
+        Print solutions and keep the last one on the board. With randomized
+        the first one comes from randomized restarts (dlx engine), see
+        restarts.first_solution and self.seed.
+        """
+        if self._modified:
+            self.build_shape()
+        if randomized and find_one_exit and isinstance(self.dlx, Dlx):
+            solution, self.seed = restarts.first_solution(self.dlx)
+            solutions = [] if solution is None else [solution]
+        else:
+            solutions = self.search()
+        for solution in solutions:
+            b_str = self.render(solution)
             colored_output = []
             self.board.b = board_str2b(b_str)
             for char in b_str:
@@ -122,7 +342,6 @@ class FasterGame(Game):
         return False
     
 
-int2board: dict[int, list[list]] = dict()
 def board_k2int(b: list[list], k: int, ss: Shape, n: int) -> int:
     # convert board matrix to an array and concat k to it
     # to form a row of dancing link
@@ -136,18 +355,8 @@ def board_k2int(b: list[list], k: int, ss: Shape, n: int) -> int:
             if b[i][j] == ss.name:
                 result |= p
             p <<= 1
-    int2board[result] = b.copy()
     return result
 
-def node2board(node: Node) -> list[list]:
-    result = 1 << (node.coordinate[1]-1)
-    head = node
-    node = head.right
-    while node != head:
-        result |= 1 << (node.coordinate[1] - 1)
-        node = node.right
-    return int2board[result]
-
 def int2arr(k:int) -> list[int]:
     return [int(c) for c in bin(k)[2:]]
 
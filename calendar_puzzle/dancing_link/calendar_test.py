@@ -6,9 +6,10 @@ import os
 # Get the directory of the current script
 parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(parent_parent_dir)
-from calendar_puzzle.board import Board
-from calendar_puzzle.dancing_link.calendar import board_k2int, int2arr
-from calendar_puzzle.shape import Shape
+import datetime
+from calendar_puzzle.board import Board, Game
+from calendar_puzzle.dancing_link.calendar import FasterGame, board_k2int, int2arr
+from calendar_puzzle.shape import Shape, ShapeI, ShapeL
 
 class TestBoardK2Int(unittest.TestCase):
     def test_empty_board(self):
@@ -33,5 +34,111 @@ class TestBoardK2Int(unittest.TestCase):
         self.assertEqual(arr, ([1]*9) + ([0])*7 + [1])
         self.assertEqual(result, 0b11111111100000001)
 
+class TestPut(unittest.TestCase):
+    def test_put_undo(self):
+        g = Game(datetime.date(2026, 5, 14))
+        before = [row.copy() for row in g.board.b]
+        written = g.put(1, 0, ShapeI())
+        self.assertEqual(''.join(g.board.b[1][:4]), 'IIII')
+        # overlaps the I, or leaves the board: nothing is written
+        self.assertIsNone(g.put(1, 3, ShapeL()))
+        self.assertIsNone(g.put(7, 5, ShapeL()))
+        self.assertEqual(''.join(g.board.b[1][:5]), 'IIII ')
+        g.undo(written)
+        self.assertEqual(g.board.b, before)
+
+    def test_fit_put_copies_only_on_success(self):
+        g = Game(datetime.date(2026, 5, 14))
+        before = [row.copy() for row in g.board.b]
+        succ, new_b = g.fit_put(1, 0, ShapeI())
+        self.assertTrue(succ)
+        self.assertEqual(''.join(new_b[1][:4]), 'IIII')
+        self.assertEqual(g.board.b, before)
+        succ, new_b = g.fit_put(0, 5, ShapeI())
+        self.assertFalse(succ)
+        self.assertIs(new_b, g.board.b)
+        self.assertEqual(g.board.b, before)
+
+    def test_faster_game_put(self):
+        g = FasterGame(datetime.date(2026, 5, 14))
+        self.assertFalse(g._modified)
+        self.assertEqual(len(g.put(1, 0, ShapeI())), 4)
+        self.assertTrue(g._modified)
+        # cells of the same shape may be covered again, date cells never
+        self.assertEqual(g.put(1, 0, Shape(['II'])), [])
+        self.assertIsNone(g.put(0, 1, ShapeI()))
+
+    def test_faster_game_fit_put_keeps_matrix(self):
+        g = FasterGame(datetime.date(2026, 5, 14))
+        dlx = g.dlx
+        succ, new_b = g.fit_put(1, 0, ShapeI())
+        self.assertTrue(succ)
+        self.assertEqual(''.join(new_b[1][:4]), 'IIII')
+        self.assertFalse(g._modified)
+        g.page(None, 1)
+        self.assertIs(g.dlx, dlx)
+        # a board already changed stays changed
+        g.put(1, 0, ShapeI())
+        g.fit_put(3, 0, ShapeI())
+        self.assertTrue(g._modified)
+
+
+class TestSelectPlacements(unittest.TestCase):
+    def test_same_solutions_as_partial_board(self):
+        dt = datetime.date(2026, 5, 14)
+        template = FasterGame(dt)
+        live = template.dlx.live
+        solution = template.placements(next(template.dlx.iter_search()))
+        template.dlx.unwind()
+        placed = solution[:4]
+
+        partial = FasterGame(dt)
+        for p in placed:
+            for x, y in p.cells:
+                partial.board.b[x][y] = p.name
+        names = {p.name for p in placed}
+        partial.board.remaining_shapes = [s for s in partial.board.remaining_shapes if s.name not in names]
+        partial.build_shape()
+        expected = [''.join(partial.render(s)) for s in partial.dlx.search()]
+
+        self.assertTrue(template.select_placements(placed))
+        got = [''.join(template.render(s)) for s in template.dlx.iter_search()]
+        self.assertEqual(got, expected)
+        self.assertEqual(template.dlx.count(), len(expected))
+        template.dlx.unwind()
+        self.assertEqual(template.dlx.live, live)
+
+    def test_overlap_selects_nothing(self):
+        template = FasterGame(datetime.date(2026, 5, 14))
+        live = template.dlx.live
+        solution = template.placements(next(template.dlx.iter_search()))
+        template.dlx.unwind()
+        # the same piece twice
+        self.assertFalse(template.select_placements([solution[0], solution[1], solution[0]]))
+        self.assertEqual(template.dlx.solution, [])
+        self.assertEqual(template.dlx.live, live)
+
+
+class TestPageAt(unittest.TestCase):
+    def test_same_as_page(self):
+        g = FasterGame(datetime.date(2026, 5, 14))
+        solution = g.placements(next(g.dlx.iter_search()))
+        g.dlx.unwind()
+        # a partial board keeps the full listing small
+        for p in solution[:1]:
+            for x, y in p.cells:
+                g.board.b[x][y] = p.name
+        names = {p.name for p in solution[:1]}
+        g.board.remaining_shapes = [s for s in g.board.remaining_shapes if s.name not in names]
+        g.build_shape()
+        total = g.count()
+        boards, cursor = g.page(None, total + 1)
+        self.assertIsNone(cursor)
+        self.assertGreaterEqual(total, 5)
+        for offset, limit in ((0, 1), (0, 5), (3, 2), (total - 2, 5), (total, 3)):
+            self.assertEqual(g.page_at(offset, limit), boards[offset:offset + limit])
+        self.assertEqual(g.dlx.solution, [])
+
+
 if __name__ == "__main__":
     unittest.main()
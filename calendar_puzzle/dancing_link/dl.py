@@ -1,7 +1,10 @@
+import random
 from collections import defaultdict
 
 
 class Node:
+    bit = 0 # only col head has bit, 1 << its column index
+
     def __init__(self, coordinate, name):
         self.coordinate = coordinate
         self.name = name
@@ -26,19 +29,34 @@ def append_row(first, new_node):
     first.left.right = first.left = new_node
 
 cap = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+
+def col_name(j):
+    # columns past the letters are named by their index
+    return cap[j] if j < len(cap) else f'[{j}]'
+
 # implement dancing link basic data struct
 class Dlx:
     # build dancing link from matrix must at least one row and one column, its value should be 0 or 1
-    def __init__(self, mx, row_names=None):
+    def __init__(self, mx, row_names=None, heuristic=None):
         n, m = len(mx), len(mx[0])
         self.head = Node((0,0), "head")
         self.nodes: dict[int, Node] = {}
         self.solution: list[Node] = []
         self.row_names = [f'{i}' for i in range(n+1)] if row_names is None else row_names
-        assert(len(row_names) == n+1)
+        assert(len(self.row_names) == n+1)
+        # bitmask of the uncovered columns, it identifies the residual problem
+        self.live = (1 << m) - 1
+        # live -> number of solutions of that residual problem, see count()
+        self.counts: dict[int, int] = {}
+        # dlx -> column to branch on, None for min_column, see heuristics.py
+        self.heuristic = heuristic
+        # (dlx, row) -> True when selecting row leaves no solution, see pruning.py
+        self.prune = None
+        self.nodes_visited = 0
 
         for j in range(m):
-            node = Node((0, j+1), f"h{cap[j]}")
+            node = Node((0, j+1), f"h{col_name(j)}")
+            node.bit = 1 << j
             self.nodes[j] = node
             node.left = self.head.left
             node.right = self.head
@@ -53,7 +71,7 @@ class Dlx:
             for j in range(m):
                 if mx[i][j]:
                     col_node = self.nodes[j]
-                    new_node = Node((i+1, j+1), f"{cap[j]}{i+1}")
+                    new_node = Node((i+1, j+1), f"{col_name(j)}{i+1}")
                     if not first:
                         first = new_node
                     append_col(col_node, new_node)
@@ -67,7 +85,7 @@ class Dlx:
 
         col = self.choose_column()
         self.cover(col)
-        row = col.down
+        row = col.down if self.prune is None else self.skip_pruned(col.down)
         while row != col:
             self.solution.append(row)
             j = row.right
@@ -77,19 +95,230 @@ class Dlx:
             yield from self.search(k + 1)
             row = self.solution.pop()
             j = row.left
+            while j != row:
+                self.uncover(j.head)
+                j = j.left
+            row = row.down if self.prune is None else self.skip_pruned(row.down)
+        self.uncover(col)
+
+    def iter_search(self, cursor=None):
+        """
+        Same solutions in the same order as search(), driven by an explicit
+        stack (self.solution) instead of recursion. With a cursor from
+        cursor() the search resumes right after the solution it points to.
+        Rows selected before the call stay selected.
+        """
+        solution = self.solution
+        floor = len(solution)
+        advance = False
+        if cursor:
+            self.restore(cursor)
+            advance = True
+        while True:
+            if not advance:
+                if self.head.right == self.head:
+                    yield solution.copy()
+                    advance = True
+                    continue
+                col = self.choose_column()
+                self.cover(col)
+                row = col.down if self.prune is None else self.skip_pruned(col.down)
+                if row == col:
+                    self.uncover(col)
+                    advance = True
+                    continue
+                self.select(row)
+                continue
+            # move the deepest row to its next sibling, backtrack when exhausted
+            if len(solution) == floor:
+                return
+            row = solution[-1]
+            self.unselect(row)
+            col = row.head
+            row = row.down if self.prune is None else self.skip_pruned(row.down)
+            if row == col:
+                self.uncover(col)
+                continue
+            self.select(row)
+            advance = False
+
+    def cursor(self) -> list[int]:
+        """Row index chosen at each depth of the current position."""
+        return [row.coordinate[0] for row in self.solution]
+
+    def restore(self, cursor):
+        """Replay a cursor on a fresh Dlx built from the same matrix. Rows
+        selected before the call stay selected, also when it fails."""
+        start = len(self.solution)
+        for depth, row_idx in enumerate(cursor):
+            col = self.choose_column()
+            self.cover(col)
+            row = col.down
+            while row != col and row.coordinate[0] != row_idx:
+                row = row.down
+            if row == col:
+                self.uncover(col)
+                self.unwind(start)
+                raise ValueError(f'cursor row {row_idx} is not available at depth {depth}')
+            self.select(row)
+
+    def unwind(self, depth=0):
+        """Undo the selected rows below `depth`, all of them by default."""
+        while len(self.solution) > depth:
+            row = self.solution[-1]
+            self.unselect(row)
+            self.uncover(row.head)
+
+    def select(self, row: Node):
+        # row's own column is already covered by the caller
+        self.solution.append(row)
+        j = row.right
+        while j != row:
+            self.cover(j.head)
+            j = j.right
+
+    def unselect(self, row: Node):
+        self.solution.pop()
+        j = row.left
+        while j != row:
+            self.uncover(j.head)
+            j = j.left
+
+    def skip_pruned(self, row: Node) -> Node:
+        """row or the first row below it the pruner keeps, the column head if none."""
+        while row is not row.head and self.prune(self, row):
+            row = row.down
+        return row
+
+    def count(self) -> int:
+        """
+        Count solutions without yielding them. Residual problems are memoized
+        by the set of uncovered columns, so the same state reached through a
+        different placement order is counted once.
+        """
+        if self.head.right == self.head:
+            return 1
+        key = self.live
+        total = self.counts.get(key)
+        if total is not None:
+            return total
+
+        total = 0
+        col = self.choose_column()
+        self.cover(col)
+        row = col.down
+        while row != col:
+            if self.prune is not None and self.prune(self, row):
+                row = row.down
+                continue
+            j = row.right
+            while j != row:
+                self.cover(j.head)
+                j = j.right
+            total += self.count()
+            j = row.left
             while j != row:
                 self.uncover(j.head)
                 j = j.left
             row = row.down
         self.uncover(col)
+        self.counts[key] = total
+        return total
+
+    def sample(self, rng=random):
+        """
+        One solution drawn uniformly at random, None when there is none.
+        Each row is picked with probability proportional to the number of
+        solutions under it, from count(); its memo makes later draws cheap.
+        """
+        if self.count() == 0:
+            return None
+        depth = len(self.solution)
+        while self.head.right != self.head:
+            col = self.choose_column()
+            self.cover(col)
+            rows, weights = [], []
+            row = col.down
+            while row != col:
+                if self.prune is None or not self.prune(self, row):
+                    self.select(row)
+                    rows.append(row)
+                    weights.append(self.count())
+                    self.unselect(row)
+                row = row.down
+            self.select(rng.choices(rows, weights)[0])
+        result = self.solution.copy()
+        self.unwind(depth)
+        return result
+
+    def unrank(self, k: int) -> list[Node]:
+        """
+        The k-th solution (from 0) in search() order. Whole subtrees are
+        skipped with count(), so only one path is walked.
+        """
+        total = self.count()
+        if not 0 <= k < total:
+            raise IndexError(f'solution {k} out of range, there are {total}')
+        depth = len(self.solution)
+        while self.head.right != self.head:
+            col = self.choose_column()
+            self.cover(col)
+            row = col.down
+            while True:
+                if self.prune is None or not self.prune(self, row):
+                    self.select(row)
+                    n = self.count()
+                    if k < n:
+                        break
+                    k -= n
+                    self.unselect(row)
+                row = row.down
+        result = self.solution.copy()
+        self.unwind(depth)
+        return result
+
+    def rank(self, rows) -> int:
+        """Index in search() order of the solution made of rows (row indices)."""
+        wanted = set(rows)
+        depth = len(self.solution)
+        k = 0
+        try:
+            while self.head.right != self.head:
+                col = self.choose_column()
+                self.cover(col)
+                row = col.down
+                while row != col and row.coordinate[0] not in wanted:
+                    if self.prune is None or not self.prune(self, row):
+                        self.select(row)
+                        k += self.count()
+                        self.unselect(row)
+                    row = row.down
+                if row == col:
+                    self.uncover(col)
+                    raise ValueError(f'rows {sorted(wanted)} are not a solution')
+                self.select(row)
+            if len(self.solution) - depth != len(wanted):
+                raise ValueError(f'rows {sorted(wanted)} are not a solution')
+        finally:
+            self.unwind(depth)
+        return k
 
     def choose_column(self):
-        col = self.head.right
-        min_value = float('inf')
-        for node in self.iter_columns():
+        self.nodes_visited += 1
+        if self.heuristic is not None:
+            return self.heuristic(self)
+        return self.min_column()
+
+    def min_column(self):
+        head = self.head
+        col = head.right
+        min_value = col.size
+        node = col.right
+        while node != head:
             if node.size < min_value:
                 min_value = node.size
                 col = node
+            node = node.right
         return col
 
     def iter_columns(self):
@@ -99,6 +328,7 @@ class Dlx:
             node = node.right
 
     def cover(self, col_head: Node):
+        self.live ^= col_head.bit
         col_head.left.right = col_head.right
         col_head.right.left = col_head.left
         row = col_head.down
@@ -123,6 +353,7 @@ class Dlx:
             row = row.up
         col_head.left.right = col_head
         col_head.right.left = col_head
+        self.live |= col_head.bit
 
     def print_dlx(self):
         """
@@ -1,5 +1,12 @@
+import random
 import unittest
-from dl import Node, Dlx, cap
+import sys
+from collections import Counter
+import os
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.dancing_link.dl import Node, Dlx, cap
 
 
 class TestNode(unittest.TestCase):
@@ -126,6 +133,115 @@ class TestDlx(unittest.TestCase):
         for solution, expected in zip(solutions, expected_solutions):
             self.assertEqual([node.coordinate[0] for node in solution], expected)
 
+    def test_iter_search_resume(self):
+        matrix = [
+            [1, 0, 0, 1],
+            [0, 1, 1, 0],
+            [1, 1, 0, 0],
+            [0, 0, 1, 1],
+            [1, 1, 1, 1],
+        ]
+        expected = [[n.coordinate[0] for n in s] for s in Dlx(matrix).search()]
+        dlx = Dlx(matrix)
+        self.assertEqual([[n.coordinate[0] for n in s] for s in dlx.iter_search()], expected)
+        self.assertEqual(dlx.solution, [])
+
+        first = Dlx(matrix)
+        it = first.iter_search()
+        next(it)
+        cursor = first.cursor()
+        self.assertEqual(cursor, expected[0])
+        resumed = [[n.coordinate[0] for n in s] for s in Dlx(matrix).iter_search(cursor)]
+        self.assertEqual(resumed, expected[1:])
+
+        with self.assertRaises(ValueError):
+            Dlx(matrix).restore([2])
+
+    def test_iter_search_keeps_preselected_rows(self):
+        matrix = [
+            [1, 0, 0, 1],
+            [0, 1, 1, 0],
+            [1, 1, 0, 0],
+            [0, 0, 1, 1],
+            [1, 1, 1, 1],
+        ]
+        expected = [sorted(n.coordinate[0] for n in s) for s in Dlx(matrix).search()]
+        dlx = Dlx(matrix)
+        col = dlx.head.right
+        row = col.down
+        dlx.cover(col)
+        dlx.select(row)
+        got = [sorted(n.coordinate[0] for n in s) for s in dlx.iter_search()]
+        self.assertEqual(sorted(got), sorted(s for s in expected if row.coordinate[0] in s))
+        self.assertEqual(dlx.solution, [row])
+        # a failed restore keeps them too
+        live = dlx.live
+        with self.assertRaises(ValueError):
+            dlx.restore([99])
+        self.assertEqual(dlx.solution, [row])
+        self.assertEqual(dlx.live, live)
+        dlx.unwind()
+        self.assertEqual(dlx.live, 0b1111)
+        self.assertEqual(dlx.count(), 3)
+
+    def test_count(self):
+        matrix = [
+            [1, 0, 0, 1],
+            [0, 1, 1, 0],
+            [1, 1, 0, 0],
+            [0, 0, 1, 1],
+            [1, 1, 1, 1],
+        ]
+        dlx = Dlx(matrix)
+        self.assertEqual(dlx.count(), len(list(dlx.search())))
+        self.assertEqual(dlx.count(), 3)
+        self.assertEqual(dlx.live, 0b1111)
+
+    def test_sample_is_uniform(self):
+        # column A branches into subtrees of 3 solutions (row 1) and 1 (row 6)
+        matrix = [
+            [1, 0, 0, 0],
+            [0, 1, 0, 0],
+            [0, 0, 1, 0],
+            [0, 0, 0, 1],
+            [0, 1, 1, 0],
+            [1, 1, 1, 1],
+            [0, 0, 1, 1],
+        ]
+        dlx = Dlx(matrix)
+        rng = random.Random(0)
+        seen = Counter(tuple(sorted(n.coordinate[0] for n in dlx.sample(rng))) for _ in range(4000))
+        self.assertEqual(set(seen), {tuple(sorted(n.coordinate[0] for n in s)) for s in dlx.search()})
+        for n in seen.values():
+            self.assertAlmostEqual(n / 4000, 0.25, delta=0.03)
+        self.assertEqual(dlx.live, 0b1111)
+        self.assertEqual(dlx.solution, [])
+        self.assertIsNone(Dlx([[1, 0], [1, 0]]).sample(rng))
+
+    def test_rank_unrank(self):
+        matrix = [
+            [1, 0, 0, 0],
+            [0, 1, 0, 0],
+            [0, 0, 1, 0],
+            [0, 0, 0, 1],
+            [0, 1, 1, 0],
+            [1, 1, 1, 1],
+            [0, 0, 1, 1],
+        ]
+        expected = [[n.coordinate[0] for n in s] for s in Dlx(matrix).search()]
+        dlx = Dlx(matrix)
+        for k, rows in enumerate(expected):
+            self.assertEqual([n.coordinate[0] for n in dlx.unrank(k)], rows)
+            self.assertEqual(dlx.rank(reversed(rows)), k)
+        self.assertEqual(dlx.live, 0b1111)
+        with self.assertRaises(IndexError):
+            dlx.unrank(len(expected))
+        for rows in ([1, 2], [1, 2, 3, 4, 6], [6, 7]):
+            with self.assertRaises(ValueError):
+                dlx.rank(rows)
+        self.assertEqual(dlx.solution, [])
+        self.assertEqual(dlx.live, 0b1111)
+
 
 if __name__ == "__main__":
     unittest.main()
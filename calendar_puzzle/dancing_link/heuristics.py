@@ -0,0 +1,55 @@
+# branching heuristics for Dlx: callables taking the dlx and returning the
+# live column head to branch on next, set as Dlx.heuristic
+from calendar_puzzle.dancing_link.dl import Dlx, Node
+
+
+def mrv(dlx: Dlx) -> Node:
+    """Minimum remaining values: the live column with the fewest rows."""
+    return dlx.min_column()
+
+
+def cells_first(piece_mask: int):
+    """MRV over the columns not in piece_mask (board cells), piece columns
+    only once every cell column is covered."""
+    def choose(dlx: Dlx) -> Node:
+        head = dlx.head
+        best, best_piece = None, None
+        col = head.right
+        while col != head:
+            if col.bit & piece_mask:
+                if best_piece is None or col.size < best_piece.size:
+                    best_piece = col
+            elif best is None or col.size < best.size:
+                best = col
+            col = col.right
+        return best if best is not None else best_piece
+    return choose
+
+
+def static_order(order: list[int]):
+    """The first live column of a fixed order of column indices."""
+    bits = [(j, 1 << j) for j in order]
+
+    def choose(dlx: Dlx) -> Node:
+        live = dlx.live
+        for j, bit in bits:
+            if live & bit:
+                return dlx.nodes[j]
+        return dlx.head.right
+    return choose
+
+
+def randomized(rng):
+    """MRV with ties broken by rng instead of by column order."""
+    def choose(dlx: Dlx) -> Node:
+        head = dlx.head
+        ties, best = [], None
+        col = head.right
+        while col != head:
+            if best is None or col.size < best:
+                best, ties = col.size, [col]
+            elif col.size == best:
+                ties.append(col)
+            col = col.right
+        return ties[0] if len(ties) == 1 else rng.choice(ties)
+    return choose
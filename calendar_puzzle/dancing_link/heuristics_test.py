@@ -0,0 +1,78 @@
+import random
+import unittest
+import sys
+import os
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.dancing_link.bucket_dl import BucketDlx
+from calendar_puzzle.dancing_link.dl import Dlx
+from calendar_puzzle.dancing_link.heuristics import cells_first, randomized, static_order
+
+MATRIX = [
+    [0, 0, 1, 0, 1, 1, 0],
+    [1, 0, 0, 1, 0, 0, 1],
+    [0, 1, 1, 0, 0, 1, 0],
+    [1, 0, 0, 1, 0, 0, 0],
+    [0, 1, 0, 0, 0, 0, 1],
+    [0, 0, 0, 1, 1, 0, 1],
+]
+
+
+def rows(solutions):
+    return sorted(sorted(n.coordinate[0] for n in s) for s in solutions)
+
+
+class TestHeuristics(unittest.TestCase):
+    def test_cells_first(self):
+        # column A (size 2) is the minimum, but pretend it is a piece column
+        dlx = Dlx(MATRIX, heuristic=cells_first(0b1))
+        self.assertEqual(dlx.choose_column().name, 'hB')
+        self.assertEqual(rows(dlx.search()), [[1, 4, 5]])
+
+    def test_static_order(self):
+        dlx = Dlx(MATRIX, heuristic=static_order([6, 0]))
+        self.assertEqual(dlx.choose_column().name, 'hG')
+        dlx.cover(dlx.nodes[6])
+        self.assertEqual(dlx.choose_column().name, 'hA')
+        dlx.uncover(dlx.nodes[6])
+        self.assertEqual(rows(dlx.search()), [[1, 4, 5]])
+
+    def test_randomized(self):
+        # columns A, B, C, E and F all have two rows
+        dlx = Dlx(MATRIX, heuristic=randomized(random.Random(0)))
+        picked = {dlx.choose_column().name for _ in range(50)}
+        self.assertEqual(picked, {'hA', 'hB', 'hC', 'hE', 'hF'})
+        self.assertEqual(rows(dlx.search()), [[1, 4, 5]])
+
+
+class TestBucketDlx(unittest.TestCase):
+    def test_min_column_tracks_sizes(self):
+        dlx = BucketDlx(MATRIX)
+        self.assertEqual(dlx.choose_column().size, 2)
+        dlx.cover(dlx.nodes[0])
+        for col in dlx.iter_columns():
+            self.assertIn(col, dlx.buckets[col.size])
+        self.assertEqual(dlx.choose_column().size, 1)
+        dlx.uncover(dlx.nodes[0])
+        self.assertEqual(sum(len(b) for b in dlx.buckets), 7)
+        self.assertEqual(rows(dlx.search()), [[1, 4, 5]])
+        self.assertEqual(dlx.count(), 1)
+
+    def test_low_bounds_the_smallest_column(self):
+        rng = random.Random(3)
+        for _ in range(20):
+            mx = [[int(rng.random() < 0.4) for _ in range(6)] for _ in range(8)]
+            dlx = BucketDlx(mx)
+            for _ in range(10):
+                col = dlx.choose_column()
+                if col is dlx.head:
+                    break
+                self.assertEqual(col.size, min(c.size for c in dlx.iter_columns()))
+                self.assertLessEqual(dlx.low, col.size)
+                dlx.cover(col)
+            self.assertEqual(rows(BucketDlx(mx).search()), rows(Dlx(mx).search()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+from typing import Optional
+
+from calendar_puzzle.bitboard.placements import ORIENTATIONS, PLACEMENTS, Placement
+from calendar_puzzle.constants import BOARD_COLS, BOARD_ROWS
+from calendar_puzzle.dancing_link.dl import Dlx, Node
+from calendar_puzzle.shape import Shape
+
+
+# Dlx whose columns may be covered between lo and hi times instead of exactly
+# once (Knuth's generalized cover with multiplicities), e.g. a column per
+# piece type that 0..2 copies may use. A column branches on each of its rows
+# in turn, hiding the rows it has tried, then (once lo is met) on using no
+# more of them, so each multiset of rows is reached once and k identical
+# pieces do not multiply the solutions by k! resuming, unwinding, sampling and
+# ranking rely on exact covers and raise ValueError
+class MultiDlx(Dlx):
+    def __init__(self, mx, row_names=None, heuristic=None, bounds: Optional[dict[int, tuple[int, int]]] = None):
+        super().__init__(mx, row_names, heuristic)
+        m = len(mx[0])
+        bounds = bounds or {}
+        # column index -> (lo, hi), (1, 1) unless given
+        self.lo = [bounds.get(j, (1, 1))[0] for j in range(m)]
+        self.hi = [bounds.get(j, (1, 1))[1] for j in range(m)]
+        for j in range(m):
+            if not 0 <= self.lo[j] <= self.hi[j] or self.hi[j] == 0:
+                raise ValueError(f'column {j} has bounds {bounds[j]}, need 0 <= lo <= hi and hi > 0')
+        # rows of the current solution on each column
+        self.used = [0] * m
+
+    def search(self, k=0):
+        if self.head.right == self.head:
+            yield self.solution.copy()
+            return
+
+        col = self.choose_column()
+        c = col.coordinate[1] - 1
+        if self.lo[c] - self.used[c] > col.size:
+            return
+        hidden = []
+        row = col.down
+        while row != col:
+            if self.prune is None or not self.prune(self, row):
+                self.select(row)
+                yield from self.search(k + 1)
+                self.unselect(row)
+            # later branches do without it, or would find the same multiset again
+            self.hide(row)
+            hidden.append(row)
+            row = row.down
+        if self.used[c] >= self.lo[c]:
+            # no more rows on col: every one left is hidden, so this only drops its head
+            self.cover(col)
+            yield from self.search(k + 1)
+            self.uncover(col)
+        for row in reversed(hidden):
+            self.unhide(row)
+
+    def iter_search(self, cursor=None):
+        if cursor:
+            raise ValueError('resuming from a cursor needs a Dlx, not a MultiDlx')
+        yield from self.search()
+
+    def cursor(self):
+        raise ValueError('resuming from a cursor needs a Dlx, not a MultiDlx')
+
+    def restore(self, cursor):
+        raise ValueError('resuming from a cursor needs a Dlx, not a MultiDlx')
+
+    def unwind(self, depth=0):
+        # Dlx.unwind uncovers each row's column, which select() here only
+        # covers once the column reaches hi
+        raise ValueError('unwinding needs a Dlx, not a MultiDlx, search() undoes its own rows')
+
+    def count(self) -> int:
+        # the residual problem depends on the hidden rows and the column
+        # counts, not only on self.live, so there is no memo
+        return sum(1 for _ in self.search())
+
+    def sample(self, rng=None):
+        raise ValueError('sampling needs a Dlx, not a MultiDlx')
+
+    def unrank(self, k: int):
+        raise ValueError('ranking needs a Dlx, not a MultiDlx')
+
+    def rank(self, rows):
+        raise ValueError('ranking needs a Dlx, not a MultiDlx')
+
+    def select(self, row: Node):
+        self.solution.append(row)
+        self.hide(row)
+        j = row
+        while True:
+            c = j.coordinate[1] - 1
+            self.used[c] += 1
+            if self.used[c] == self.hi[c]:
+                self.cover(j.head)
+            j = j.right
+            if j == row:
+                break
+
+    def unselect(self, row: Node):
+        self.solution.pop()
+        j = row.left
+        while True:
+            c = j.coordinate[1] - 1
+            if self.used[c] == self.hi[c]:
+                self.uncover(j.head)
+            self.used[c] -= 1
+            if j == row:
+                break
+            j = j.left
+        self.unhide(row)
+
+    def hide(self, row: Node):
+        """Take row out of all its columns."""
+        j = row
+        while True:
+            j.down.up = j.up
+            j.up.down = j.down
+            j.head.size -= 1
+            j = j.right
+            if j == row:
+                break
+
+    def unhide(self, row: Node):
+        j = row.left
+        while True:
+            j.head.size += 1
+            j.down.up = j
+            j.up.down = j
+            if j == row:
+                break
+            j = j.left
+
+    def min_column(self):
+        """
+        The live column with the fewest branches: its rows, plus one for
+        using none of them once lo is met; one that cannot reach lo anymore
+        right away.
+        """
+        best, best_branches = None, None
+        for col in self.iter_columns():
+            c = col.coordinate[1] - 1
+            need = self.lo[c] - self.used[c]
+            if need > col.size:
+                return col
+            branches = col.size + (need <= 0)
+            if best is None or branches < best_branches:
+                best, best_branches = col, branches
+        return best
+
+
+def piece_cover(b: list[list], shapes: dict[Shape, tuple[int, int]]) -> MultiDlx:
+    """
+    MultiDlx covering every empty (' ') cell of board b exactly once with the
+    shapes, shape s used between shapes[s][0] and shapes[s][1] times. Columns
+    are the empty cells (row by row) then one per shape; each row is named by
+    its placement id, like FasterGame's rows, so b must fit the calendar board
+    and the shapes be calendar pieces, see placements().
+    """
+    if len(b) > BOARD_ROWS or any(len(row) > BOARD_COLS for row in b):
+        raise ValueError(f'board is larger than {BOARD_ROWS}x{BOARD_COLS}')
+    for shape in shapes:
+        if shape.name not in ORIENTATIONS:
+            raise ValueError(f'shape {shape.name} is not a calendar piece')
+    cells = [(i, j) for i in range(len(b)) for j in range(len(b[i])) if b[i][j] == ' ']
+    col_of = {cell: k for k, cell in enumerate(cells)}
+    mx, row_names = [], ['head']
+    for k, shape in enumerate(shapes):
+        for p in PLACEMENTS:
+            if p.name != shape.name or not all(cell in col_of for cell in p.cells):
+                continue
+            row = [0] * (len(cells) + len(shapes))
+            for cell in p.cells:
+                row[col_of[cell]] = 1
+            row[len(cells) + k] = 1
+            mx.append(row)
+            row_names.append(p.id)
+    if not mx:
+        raise ValueError('no shape fits the board')
+    bounds = {len(cells) + k: lo_hi for k, lo_hi in enumerate(shapes.values())}
+    return MultiDlx(mx, row_names, bounds=bounds)
+
+
+def placements(dlx: MultiDlx, solution) -> list[Placement]:
+    """Placements of a solution of a piece_cover dlx."""
+    return [PLACEMENTS[dlx.row_names[step.coordinate[0]]] for step in solution]
@@ -0,0 +1,138 @@
+import itertools
+import random
+import unittest
+import sys
+import os
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.bitboard.solver import render
+from calendar_puzzle.dancing_link.dl import Dlx
+from calendar_puzzle.dancing_link.multi_dl import MultiDlx, piece_cover, placements
+from calendar_puzzle.shape import Shape, ShapeI, ShapeJ, ShapeL, ShapeQ
+
+MATRIX = [
+    [0, 0, 1, 0, 1, 1, 0],
+    [1, 0, 0, 1, 0, 0, 1],
+    [0, 1, 1, 0, 0, 1, 0],
+    [1, 0, 0, 1, 0, 0, 0],
+    [0, 1, 0, 0, 0, 0, 1],
+    [0, 0, 0, 1, 1, 0, 1],
+]
+
+
+def row_sets(solutions):
+    return sorted(sorted(step.coordinate[0] for step in s) for s in solutions)
+
+
+def board(b, dlx, solution):
+    return ''.join(render(b, placements(dlx, solution)))
+
+
+class TestMultiDlx(unittest.TestCase):
+    def test_exact_bounds_match_dlx(self):
+        expected = [[s.coordinate[0] for s in solution] for solution in Dlx(MATRIX).search()]
+        got = [[s.coordinate[0] for s in solution] for solution in MultiDlx(MATRIX).search()]
+        self.assertEqual(got, expected)
+
+    def test_bounds(self):
+        # rows 1, 2 and 3 share column 0, row 4 covers the rest on its own
+        mx = [[1, 1, 0, 0], [1, 0, 1, 0], [1, 0, 0, 1], [0, 1, 1, 1]]
+        self.assertEqual(row_sets(MultiDlx(mx, bounds={0: (2, 2)}).search()), [])
+        self.assertEqual(row_sets(MultiDlx(mx, bounds={0: (3, 3)}).search()), [[1, 2, 3]])
+        self.assertEqual(row_sets(MultiDlx(mx, bounds={0: (0, 3)}).search()), [[1, 2, 3], [4]])
+        self.assertEqual(row_sets(MultiDlx(mx, bounds={0: (1, 3)}).search()), [[1, 2, 3]])
+        mx = [[1, 1, 0], [1, 0, 1], [0, 1, 1]]
+        self.assertEqual(row_sets(MultiDlx(mx, bounds={0: (0, 2)}).search()), [[1, 2], [3]])
+        self.assertEqual(row_sets(MultiDlx(mx, bounds={0: (1, 2)}).search()), [[1, 2]])
+        self.assertEqual(row_sets(MultiDlx(mx, bounds={0: (0, 1)}).search()), [[3]])
+
+    def test_random_against_brute_force(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            n, m = rng.randint(1, 8), rng.randint(1, 5)
+            mx = [[int(rng.random() < 0.4) for _ in range(m)] for _ in range(n)]
+            mx = [row for row in mx if any(row)] or [[1] * m]
+            n = len(mx)
+            bounds = {}
+            for j in range(m):
+                lo = rng.randint(0, 2)
+                bounds[j] = (lo, max(1, lo + rng.randint(0, 2)))
+            expected = []
+            for subset in itertools.product([0, 1], repeat=n):
+                used = [sum(mx[i][j] for i in range(n) if subset[i]) for j in range(m)]
+                if all(bounds.get(j, (1, 1))[0] <= used[j] <= bounds.get(j, (1, 1))[1] for j in range(m)):
+                    expected.append([i + 1 for i in range(n) if subset[i]])
+            self.assertEqual(row_sets(MultiDlx(mx, bounds=bounds).search()), sorted(expected))
+
+    def test_state_restored(self):
+        dlx = MultiDlx([[1, 1, 0], [1, 0, 1], [0, 1, 1]], bounds={0: (0, 2), 1: (0, 1)})
+        sizes = [col.size for col in dlx.iter_columns()]
+        self.assertEqual(dlx.count(), 3) # rows 2, 3 and 1+2
+        self.assertEqual([col.size for col in dlx.iter_columns()], sizes)
+        self.assertEqual(dlx.used, [0, 0, 0])
+        self.assertEqual(dlx.live, 0b111)
+
+    def test_bad_bounds(self):
+        with self.assertRaises(ValueError):
+            MultiDlx(MATRIX, bounds={0: (2, 1)})
+        with self.assertRaises(ValueError):
+            MultiDlx(MATRIX, bounds={0: (0, 0)})
+
+    def test_piece_cover_identical_pieces(self):
+        # a 4x4 square of I pieces: all across or all down, once each
+        b = [[' '] * 4 for _ in range(4)]
+        dlx = piece_cover(b, {ShapeI(): (4, 4)})
+        solutions = list(dlx.search())
+        self.assertEqual(len(solutions), 2)
+        self.assertEqual({board(b, dlx, s) for s in solutions}, {'\n'.join(['IIII'] * 4)})
+        # four separate I pieces find each of them 4! times
+        n_cells = 16
+        mx = [row + [1 if k == c else 0 for c in range(4)] for row in dlx_rows(dlx, n_cells) for k in range(4)]
+        self.assertEqual(Dlx(mx).count(), 2 * 24)
+
+    def test_piece_cover_optional_pieces(self):
+        # 2x5: two L or two Q, each pair once; I and J never fit
+        b = [[' '] * 5 for _ in range(2)]
+        shapes = {ShapeI(): (0, 2), ShapeL(): (0, 2), ShapeQ(): (0, 2), ShapeJ(): (0, 2)}
+        dlx = piece_cover(b, shapes)
+        for solution in dlx.search():
+            self.assertNotIn(' ', board(b, dlx, solution))
+        by_pieces = {}
+        for solution in dlx.search():
+            names = ''.join(sorted(p.name for p in placements(dlx, solution)))
+            by_pieces[names] = by_pieces.get(names, 0) + 1
+        self.assertEqual(by_pieces, {'LL': 2, 'QQ': 2})
+        with self.assertRaises(ValueError):
+            piece_cover([['#']], shapes)
+        with self.assertRaises(ValueError):
+            piece_cover([[' '] * 8], shapes)
+        with self.assertRaises(ValueError):
+            piece_cover(b, {Shape(['XX']): (0, 5)})
+
+    def test_exact_cover_only_methods(self):
+        dlx = MultiDlx(MATRIX)
+        for call in (dlx.sample, lambda: dlx.unrank(0), lambda: dlx.rank([1]),
+                     lambda: next(dlx.iter_search([1])), lambda: dlx.restore([1]),
+                     dlx.cursor, dlx.unwind):
+            with self.assertRaises(ValueError):
+                call()
+        # the links are untouched
+        self.assertEqual(dlx.live, (1 << 7) - 1)
+        self.assertEqual(row_sets(dlx.search()), row_sets(Dlx(MATRIX).search()))
+
+
+def dlx_rows(dlx, n_cells):
+    """Cell part of each matrix row of a piece_cover dlx."""
+    rows = {}
+    for col in dlx.iter_columns():
+        node = col.down
+        while node != col:
+            if node.coordinate[1] <= n_cells:
+                rows.setdefault(node.coordinate[0], [0] * n_cells)[node.coordinate[1] - 1] = 1
+            node = node.down
+    return [rows[i] for i in sorted(rows)]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# placement orderings mined from solution packs (see gen_pack.py): how often
+# each placement is part of a solution of a key, and of any key. FasterGame
+# builds its matrix with the rows of the frequent placements first, so the
+# search tries them first
+import gzip
+import json
+import os
+from typing import Optional
+
+from calendar_puzzle.bitboard.placements import board_placements
+from calendar_puzzle.constants import BOARD_COLS
+from calendar_puzzle.dancing_link.all_dates import Key
+from calendar_puzzle.shape import AllShapes
+
+DEFAULT_PATH = os.environ.get('CALENDAR_ORDERING', os.path.expanduser('~/.cache/calendar_puzzle/ordering.json'))
+
+NAMES = [shape.name for shape in AllShapes]
+
+
+def key_str(key: Key) -> str:
+    return f"{key[0]}-{key[1]}-{key[2]}"
+
+
+class Ordering:
+    def __init__(self, counts: dict[int, int], key_counts: Optional[dict[Key, dict[int, int]]] = None):
+        # placement id -> solutions using it, over all keys and per key
+        self.counts = counts
+        self.key_counts = key_counts or {}
+
+    @classmethod
+    def mine(cls, pack: dict) -> 'Ordering':
+        """Count the placements of every solution of a pack ("M-D-W" -> 56-char boards)."""
+        counts: dict[int, int] = {}
+        key_counts: dict[Key, dict[int, int]] = {}
+        for name, boards in pack.items():
+            if not isinstance(boards, list):
+                raise ValueError(f'pack entry {name} holds no solutions')
+            per_key = key_counts.setdefault(tuple(int(v) for v in name.split('-')), {})
+            for board in boards:
+                b = [list(board[i:i + BOARD_COLS]) for i in range(0, len(board), BOARD_COLS)]
+                for p in board_placements(b, NAMES):
+                    counts[p.id] = counts.get(p.id, 0) + 1
+                    per_key[p.id] = per_key.get(p.id, 0) + 1
+        return cls(counts, key_counts)
+
+    def order(self, key: Key, ids: list[int]) -> list[int]:
+        """Indices of ids, most frequent placement first: by the key's own
+        counts, then over all keys, ties kept in order."""
+        per_key = self.key_counts.get(key, {})
+        return sorted(range(len(ids)), key=lambda i: (-per_key.get(ids[i], 0), -self.counts.get(ids[i], 0)))
+
+    def without_keys(self) -> 'Ordering':
+        """The same ordering from the counts over all keys only."""
+        return Ordering(self.counts)
+
+    def save(self, path: str):
+        data = {
+            'counts': self.counts,
+            'keys': {key_str(key): counts for key, counts in sorted(self.key_counts.items())},
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path: str) -> 'Ordering':
+        with (gzip.open(path, 'rt') if path.endswith('.gz') else open(path)) as f:
+            data = json.load(f)
+        counts = {int(i): n for i, n in data['counts'].items()}
+        key_counts = {tuple(int(v) for v in name.split('-')): {int(i): n for i, n in per_key.items()}
+                      for name, per_key in data.get('keys', {}).items()}
+        return cls(counts, key_counts)
+
+
+_shared = None
+
+
+def shared() -> Optional[Ordering]:
+    """The ordering at DEFAULT_PATH, None when there is no such file."""
+    global _shared
+    if _shared is None and os.path.exists(DEFAULT_PATH):
+        _shared = Ordering.load(DEFAULT_PATH)
+    return _shared
@@ -0,0 +1,55 @@
+import datetime
+import os
+import tempfile
+import unittest
+import sys
+from itertools import islice
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.dancing_link.calendar import FasterGame
+from calendar_puzzle.dancing_link.ordering import Ordering
+
+DT = datetime.date(2026, 5, 14)
+KEY = (5, 14, 3)
+
+
+def encode(g, solution):
+    return ''.join(g.render(solution)).replace('\n', '')
+
+
+class TestOrdering(unittest.TestCase):
+    def setUp(self):
+        g = FasterGame(DT)
+        self.boards = [encode(g, s) for s in islice(g.search(), 5)]
+
+    def test_mine(self):
+        ordering = Ordering.mine({'5-14-3': self.boards})
+        self.assertEqual(sum(ordering.counts.values()), 5 * 10)
+        self.assertEqual(ordering.key_counts[KEY], ordering.counts)
+        ids = sorted(ordering.counts, key=ordering.counts.get)
+        self.assertEqual([ids[i] for i in ordering.order(KEY, ids)][0], max(ordering.counts, key=ordering.counts.get))
+        with self.assertRaises(ValueError):
+            Ordering.mine({'5-14-3': 3028})
+
+    def test_save_load(self):
+        ordering = Ordering.mine({'5-14-3': self.boards})
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'ordering.json')
+            ordering.save(path)
+            loaded = Ordering.load(path)
+        self.assertEqual(loaded.counts, ordering.counts)
+        self.assertEqual(loaded.key_counts, ordering.key_counts)
+
+    def test_game_tries_frequent_rows_first(self):
+        # a pack holding only the last solution leads the search straight to it
+        g = FasterGame(DT, ordering=Ordering.mine({'5-14-3': self.boards[-1:]}))
+        solution = next(g.dlx.iter_search())
+        self.assertEqual(encode(g, solution), self.boards[-1])
+        self.assertEqual(g.dlx.nodes_visited, len(solution))
+        # the same rows, reordered
+        self.assertEqual(sorted(g.dlx.row_names[1:]), sorted(FasterGame(DT).dlx.row_names[1:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
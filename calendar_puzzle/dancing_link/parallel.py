@@ -0,0 +1,89 @@
+# split the DLX tree of one date into independent subproblems and run them
+# on a process pool, merging the results into one count or solution stream.
+# subtrees are handed out one at a time (chunksize=1), so a worker that
+# finishes early takes the next pending subtree instead of idling
+import datetime
+from typing import Iterator, Optional
+
+from calendar_puzzle.dancing_link.calendar import FasterGame
+from calendar_puzzle.dancing_link.dl import Dlx
+
+
+def split(dlx: Dlx, depth: int = 2) -> list[list[int]]:
+    """
+    Cursors (row index per depth) of the subtrees `depth` levels below the
+    root. Dead branches are dropped; a solution shallower than `depth` is its
+    own subtree.
+    """
+    prefixes = []
+
+    def walk():
+        if len(dlx.solution) == depth or dlx.head.right == dlx.head:
+            prefixes.append(dlx.cursor())
+            return
+        col = dlx.choose_column()
+        dlx.cover(col)
+        row = col.down
+        while row != col:
+            dlx.select(row)
+            walk()
+            dlx.unselect(row)
+            row = row.down
+        dlx.uncover(col)
+
+    walk()
+    return prefixes
+
+
+# per worker process: (date, game) of the last task, its matrix unwound
+# between tasks. the subtrees of a date come in a row, so only that date's
+# game (and its count memo) is kept, not one per date ever seen
+_current: Optional[tuple[str, FasterGame]] = None
+
+
+def _game(dt_iso: str) -> FasterGame:
+    global _current
+    if _current is None or _current[0] != dt_iso:
+        _current = None
+        _current = (dt_iso, FasterGame(datetime.date.fromisoformat(dt_iso)))
+    return _current[1]
+
+
+def _count_prefix(args) -> int:
+    dt_iso, prefix = args
+    g = _game(dt_iso)
+    g.dlx.restore(prefix)
+    try:
+        return g.dlx.count()
+    finally:
+        g.dlx.unwind()
+
+
+def _search_prefix(args) -> list[str]:
+    dt_iso, prefix = args
+    g = _game(dt_iso)
+    g.dlx.restore(prefix)
+    try:
+        return [''.join(g.render(s)).replace('\n', '') for s in g.dlx.search()]
+    finally:
+        g.dlx.unwind()
+
+
+def _tasks(dt: datetime.date, depth: int) -> list[tuple[str, list[int]]]:
+    g = FasterGame(dt)
+    return [(dt.isoformat(), prefix) for prefix in split(g.dlx, depth)]
+
+
+def count(dt: datetime.date, pool, depth: int = 2) -> int:
+    """Solution count of one date, subtrees counted on `pool`."""
+    return sum(pool.imap_unordered(_count_prefix, _tasks(dt, depth), chunksize=1))
+
+
+def search(dt: datetime.date, pool, depth: int = 2) -> Iterator[str]:
+    """
+    Every solution of one date as a 56-char string, subtrees searched on
+    `pool`. Subtrees are merged back in prefix order, so the stream matches
+    Dlx.search() order.
+    """
+    for boards in pool.imap(_search_prefix, _tasks(dt, depth), chunksize=1):
+        yield from boards
@@ -0,0 +1,51 @@
+import datetime
+import unittest
+import sys
+import os
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.dancing_link.dl import Dlx
+from calendar_puzzle.dancing_link import parallel
+from calendar_puzzle.dancing_link.parallel import split
+
+MATRIX = [
+    [1, 0, 0, 1, 0],
+    [0, 1, 1, 0, 0],
+    [1, 1, 0, 0, 0],
+    [0, 0, 1, 1, 0],
+    [1, 1, 1, 1, 0],
+    [0, 0, 0, 0, 1],
+    [1, 0, 0, 0, 1],
+]
+
+
+class TestSplit(unittest.TestCase):
+    def test_subtrees_partition_the_search(self):
+        expected = [[n.coordinate[0] for n in s] for s in Dlx(MATRIX).search()]
+        for depth in (1, 2, 5):
+            dlx = Dlx(MATRIX)
+            merged = []
+            for prefix in split(dlx, depth):
+                self.assertLessEqual(len(prefix), depth)
+                dlx.restore(prefix)
+                merged.extend([n.coordinate[0] for n in s] for s in dlx.search())
+                dlx.unwind()
+            self.assertEqual(merged, expected)
+            self.assertEqual(dlx.live, 0b11111)
+
+
+class TestWorkerGame(unittest.TestCase):
+    def test_keeps_only_the_current_date(self):
+        first = parallel._game('2026-02-14')
+        self.assertIs(parallel._game('2026-02-14'), first)
+        second = parallel._game('2026-02-15')
+        self.assertIsNot(second, first)
+        self.assertEqual(second.dt, datetime.date(2026, 2, 15))
+        # the first date's game is dropped
+        self.assertEqual(parallel._current, ('2026-02-15', second))
+        self.assertIsNot(parallel._game('2026-02-14'), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
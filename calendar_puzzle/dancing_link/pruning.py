@@ -0,0 +1,199 @@
+# search pruners for Dlx: callables taking the dlx and a row about to be
+# selected, returning True when that row can not lead to a solution. they
+# run before the row is covered, so a rejected row costs no cover/uncover.
+# set as Dlx.prune
+from typing import Iterable
+
+from calendar_puzzle.bitboard.holes import HoleTable, neighbours
+from calendar_puzzle.bitboard.placements import FULL_MASK, PIECE_BITS, PIECE_SIZES, cell_bit
+from calendar_puzzle.constants import BOARD_ROWS, BOARD_COLS, INITIAL_BLOCK_TYPES
+from calendar_puzzle.dancing_link.dl import Dlx, Node
+
+# checkerboard colouring, (0, 0) is black
+BLACK = sum(cell_bit(x, y) for x in range(BOARD_ROWS) for y in range(BOARD_COLS) if (x + y) % 2 == 0)
+WHITE = FULL_MASK ^ BLACK
+
+# shape label -> |black - white| cells it covers, the same in every
+# orientation and position up to sign
+PIECE_IMBALANCE = {
+    block['label']: abs(sum(1 if (i + j) % 2 == 0 else -1
+                            for i, row in enumerate(block['shape'])
+                            for j, cell in enumerate(row) if cell))
+    for block in INITIAL_BLOCK_TYPES
+}
+
+
+def subset_sums(sizes: list[int]) -> set[int]:
+    sums = {0}
+    for size in sizes:
+        sums |= {s + size for s in sums}
+    return sums
+
+
+def signed_sums(imbalances: list[int]) -> set[int]:
+    sums = {0}
+    for d in imbalances:
+        sums = {s + d for s in sums} | {s - d for s in sums}
+    return sums
+
+
+def imbalance(mask: int) -> int:
+    return (mask & BLACK).bit_count() - (mask & WHITE).bit_count()
+
+
+def parity_feasible(b: list[list], names: Iterable[str], empty=' ') -> bool:
+    """Whether the black/white imbalance of the empty cells of a board is a
+    signed sum of the imbalances of the named pieces."""
+    free = 0
+    for x, row in enumerate(b):
+        for y, c in enumerate(row):
+            if c == empty:
+                free |= cell_bit(x, y)
+    return imbalance(free) in signed_sums([PIECE_IMBALANCE[name] for name in names])
+
+
+def _live_tables(board_bits: dict[int, int]) -> list[tuple[int, list[int]]]:
+    """Tables turning a live column mask into the board mask of its cells,
+    one table per byte of the live mask."""
+    tables = []
+    for shift in range(0, max(board_bits, default=1).bit_length(), 8):
+        table = [0] * 256
+        for byte in range(256):
+            for k in range(8):
+                if byte >> k & 1:
+                    table[byte] |= board_bits.get(1 << (shift + k), 0)
+        tables.append((shift, table))
+    return tables
+
+
+def _row_masks(board_bits: dict[int, int]):
+    """row -> (its column bits, mask of its board cells), cached per row."""
+    rows: dict[Node, tuple[int, int]] = {}
+
+    def masks(row: Node) -> tuple[int, int]:
+        if row not in rows:
+            bits, placed = row.head.bit, board_bits.get(row.head.bit, 0)
+            node = row.right
+            while node != row:
+                bits |= node.head.bit
+                placed |= board_bits.get(node.head.bit, 0)
+                node = node.right
+            rows[row] = bits, placed
+        return rows[row]
+    return masks
+
+
+def island(cells: dict[int, tuple[int, int]], pieces: dict[int, str]):
+    """
+    Reject a row that walls off a pocket of empty cells whose size is not a
+    sum of the remaining pieces' sizes. Only the pockets next to the row are
+    flood filled, the rest of the board does not change by selecting it.
+
+    cells: cell column -> its (x, y) on the board
+    pieces: piece column -> shape name
+    """
+    board_bits = {1 << j: cell_bit(x, y) for j, (x, y) in cells.items()}
+    piece_sizes = {1 << j: PIECE_SIZES[name] for j, name in pieces.items()}
+    piece_mask = sum(piece_sizes)
+    tables = _live_tables(board_bits)
+    row_masks = _row_masks(board_bits)
+    # live piece columns -> (reachable region sizes, largest unreachable one)
+    fits: dict[int, tuple[set[int], int]] = {}
+
+    def prune(dlx: Dlx, row: Node) -> bool:
+        bits, placed = row_masks(row)
+        live = dlx.live & ~bits
+        left = live & piece_mask
+        fit = fits.get(left)
+        if fit is None:
+            sums = subset_sums([s for bit, s in piece_sizes.items() if bit & left])
+            fit = fits[left] = sums, max((s for s in range(max(sums) + 1) if s not in sums), default=0)
+        sums, limit = fit
+        free = 0
+        for shift, table in tables:
+            free |= table[live >> shift & 255]
+
+        seeds = neighbours(placed) & free
+        while seeds:
+            region = seeds & -seeds
+            while True:
+                size = region.bit_count()
+                if size > limit:
+                    break
+                grown = region | neighbours(region) & free
+                if grown == region:
+                    if size not in sums:
+                        return True
+                    break
+                region = grown
+            seeds &= ~region
+        return False
+    return prune
+
+
+def parity(cells: dict[int, tuple[int, int]], pieces: dict[int, str]):
+    """
+    Reject a row after which the black/white imbalance of the empty cells
+    is not a signed sum of the remaining pieces' imbalances.
+
+    cells: cell column -> its (x, y) on the board
+    pieces: piece column -> shape name
+    """
+    board_bits = {1 << j: cell_bit(x, y) for j, (x, y) in cells.items()}
+    piece_imbalance = {1 << j: PIECE_IMBALANCE[name] for j, name in pieces.items()}
+    piece_mask = sum(piece_imbalance)
+    tables = _live_tables(board_bits)
+    row_masks = _row_masks(board_bits)
+    # live piece columns -> reachable imbalances
+    reachable: dict[int, set[int]] = {}
+
+    def prune(dlx: Dlx, row: Node) -> bool:
+        bits, _ = row_masks(row)
+        live = dlx.live & ~bits
+        left = live & piece_mask
+        sums = reachable.get(left)
+        if sums is None:
+            sums = reachable[left] = signed_sums([d for bit, d in piece_imbalance.items() if bit & left])
+        free = 0
+        for shift, table in tables:
+            free |= table[live >> shift & 255]
+        return imbalance(free) not in sums
+    return prune
+
+
+def holes(cells: dict[int, tuple[int, int]], pieces: dict[int, str], hole_table: HoleTable):
+    """
+    Reject a row that leaves a small pocket next to it which no subset of
+    the remaining pieces can tile, as recorded (or then computed) in hole_table.
+
+    cells: cell column -> its (x, y) on the board
+    pieces: piece column -> shape name
+    """
+    board_bits = {1 << j: cell_bit(x, y) for j, (x, y) in cells.items()}
+    piece_bits = {1 << j: PIECE_BITS[name] for j, name in pieces.items()}
+    piece_mask = sum(piece_bits)
+    tables = _live_tables(board_bits)
+    row_masks = _row_masks(board_bits)
+    # live piece columns -> PIECE_BITS of those pieces
+    left_bits: dict[int, int] = {}
+
+    def prune(dlx: Dlx, row: Node) -> bool:
+        bits, placed = row_masks(row)
+        live = dlx.live & ~bits
+        left = live & piece_mask
+        if left not in left_bits:
+            left_bits[left] = sum(b for bit, b in piece_bits.items() if bit & left)
+        free = 0
+        for shift, table in tables:
+            free |= table[live >> shift & 255]
+        return hole_table.dead_end(free, left_bits[left], placed)
+    return prune
+
+
+def combine(pruners: list):
+    """One pruner running each of pruners, None when there is none."""
+    if not pruners:
+        return None
+    if len(pruners) == 1:
+        return pruners[0]
+    return lambda dlx, row: any(prune(dlx, row) for prune in pruners)
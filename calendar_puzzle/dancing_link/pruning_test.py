@@ -0,0 +1,101 @@
+import datetime
+import unittest
+import sys
+import os
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.bitboard.holes import HoleTable
+from calendar_puzzle.bitboard.placements import PIECE_SIZES, cell_bit
+from calendar_puzzle.bitboard.solver import BitboardSolver, render
+from calendar_puzzle.dancing_link.calendar import FasterGame
+from calendar_puzzle.dancing_link.pruning import (PIECE_IMBALANCE, holes, neighbours, parity_feasible,
+                                                  signed_sums, subset_sums)
+
+
+def partial_game(dt, keep, **kwargs) -> FasterGame:
+    """A game with the first `keep` pieces of a known solution already placed."""
+    g = FasterGame(dt, engine='bitboard')
+    solution = next(BitboardSolver.from_board(g.board.b, g.board.remaining_shapes).search())
+    b_str = ''.join(render(g.board.b, solution[:keep]))
+    g = FasterGame(dt, **kwargs)
+    g.board.b = [list(row) for row in b_str.split('\n')]
+    placed = {p.name for p in solution[:keep]}
+    g.board.remaining_shapes = [s for s in g.board.remaining_shapes if s.name not in placed]
+    g.build_shape()
+    return g
+
+
+class TestIsland(unittest.TestCase):
+    def test_helpers(self):
+        self.assertEqual(neighbours(cell_bit(1, 0)), cell_bit(0, 0) | cell_bit(2, 0) | cell_bit(1, 1))
+        self.assertEqual(neighbours(cell_bit(0, 6)), cell_bit(0, 5) | cell_bit(1, 6))
+        self.assertEqual(subset_sums([4, 5, 5]), {0, 4, 5, 9, 10, 14})
+
+    def test_column_cells(self):
+        g = FasterGame(datetime.date(2026, 5, 14))
+        cells = g.column_cells()
+        pieces = g.column_pieces()
+        self.assertEqual(len(cells) + len(pieces), len(g.dlx.nodes))
+        self.assertEqual(sum(PIECE_SIZES[name] for name in pieces.values()), len(cells))
+        placements = g.row_placements()
+        for j, name in pieces.items():
+            row = g.dlx.nodes[j].down
+            self.assertEqual(placements[row.coordinate[0]].name, name)
+        for j, (x, y) in cells.items():
+            self.assertEqual(g.board.b[x][y], ' ')
+            # every row covering this column puts a shape on that cell
+            row = g.dlx.nodes[j].down
+            self.assertIn((x, y), placements[row.coordinate[0]].cells)
+
+    def test_same_solutions_fewer_nodes(self):
+        dt = datetime.date(2026, 5, 14)
+        plain = partial_game(dt, 4)
+        pruned = partial_game(dt, 4, pruners=['island'])
+        expected = sorted(''.join(plain.render(s)) for s in plain.search())
+        self.assertEqual(sorted(''.join(pruned.render(s)) for s in pruned.search()), expected)
+        self.assertLess(pruned.dlx.nodes_visited, plain.dlx.nodes_visited)
+        self.assertEqual(partial_game(dt, 4, pruners=['island']).count(), len(expected))
+
+    def test_island_and_parity(self):
+        dt = datetime.date(2026, 5, 14)
+        plain = partial_game(dt, 3)
+        pruned = partial_game(dt, 3, pruners=['island', 'parity'])
+        self.assertEqual(pruned.count(), plain.count())
+        self.assertLessEqual(pruned.dlx.nodes_visited, plain.dlx.nodes_visited)
+
+    def test_holes(self):
+        dt = datetime.date(2026, 5, 14)
+        plain = partial_game(dt, 3)
+        pruned = partial_game(dt, 3)
+        table = HoleTable()
+        pruned.dlx.prune = holes(pruned.column_cells(), pruned.column_pieces(), table)
+        self.assertEqual(pruned.count(), plain.count())
+        self.assertLess(pruned.dlx.nodes_visited, plain.dlx.nodes_visited)
+        self.assertTrue(table.dirty)
+
+    def test_array_engine_rejects_pruners(self):
+        with self.assertRaises(ValueError):
+            FasterGame(datetime.date(2026, 5, 14), engine='array', pruners=['island'])
+
+
+class TestParity(unittest.TestCase):
+    def test_piece_imbalance(self):
+        self.assertEqual({name for name, d in PIECE_IMBALANCE.items() if d == 0}, {'I', 'S', 'J'})
+        self.assertEqual(signed_sums([1, 1, 0]), {-2, 0, 2})
+
+    def test_parity_feasible(self):
+        g = FasterGame(datetime.date(2026, 5, 14))
+        names = [s.name for s in g.board.remaining_shapes]
+        self.assertTrue(parity_feasible(g.board.b, names))
+        # a lone U can never fill two cells of the same colour
+        b = [['#'] * 7 for _ in range(8)]
+        b[0][0] = b[1][1] = ' '
+        self.assertFalse(parity_feasible(b, ['U']))
+        b[1][1], b[0][1] = '#', ' '
+        self.assertFalse(parity_feasible(b, ['U']))
+        self.assertTrue(parity_feasible(b, ['I']))
+
+
+if __name__ == "__main__":
+    unittest.main()
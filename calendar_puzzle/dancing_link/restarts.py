@@ -0,0 +1,67 @@
+# randomized restarts for the first solution of a Dlx: short searches cut
+# off after a node budget growing as the Luby sequence, the first in the
+# usual order and the others breaking MRV ties with a seeded rng, then one
+# full search in the usual order. a slow first solution mostly comes from an
+# unlucky early branch, which a restart leaves
+import random
+from typing import Optional, Tuple
+
+from calendar_puzzle.dancing_link.dl import Dlx, Node
+from calendar_puzzle.dancing_link.heuristics import randomized
+
+
+class Cutoff(Exception):
+    """The node budget of a restart ran out."""
+
+
+def luby(i: int) -> int:
+    """The i-th term (from 1) of 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    if i == (1 << k) - 1:
+        return 1 << (k - 1)
+    return luby(i - (1 << (k - 1)) + 1)
+
+
+def search_first(dlx: Dlx, seed: Optional[int] = None, limit: Optional[int] = None) -> Optional[list[Node]]:
+    """
+    First solution, None when there is none. With a seed MRV ties are broken
+    at random; Cutoff when more than limit nodes are visited first.
+    """
+    heuristic = dlx.heuristic
+    depth = len(dlx.solution)
+    choose = randomized(random.Random(seed)) if seed is not None else heuristic
+    if limit is not None:
+        choose = choose if choose is not None else Dlx.min_column
+        stop = dlx.nodes_visited + limit
+
+        def budgeted(dlx: Dlx) -> Node:
+            if dlx.nodes_visited > stop:
+                raise Cutoff()
+            return choose(dlx)
+        dlx.heuristic = budgeted
+    else:
+        dlx.heuristic = choose
+    try:
+        return next(dlx.iter_search(), None)
+    finally:
+        dlx.heuristic = heuristic
+        dlx.unwind(depth)
+
+
+def first_solution(dlx: Dlx, seed: int = 1, tries: int = 8, unit: int = 200) -> Tuple[Optional[list[Node]], Optional[int]]:
+    """
+    (solution, seed): the first solution found, None when there is none,
+    and the seed of the restart that settled it, None when a run in the
+    usual order did. Restart i is cut off after unit * luby(i) nodes, the
+    first one uses the usual order and the next ones seed, seed+1, ...;
+    search_first(dlx, seed) finds the same solution again.
+    """
+    for i in range(tries):
+        run_seed = None if i == 0 else seed + i - 1
+        try:
+            return search_first(dlx, run_seed, unit * luby(i + 1)), run_seed
+        except Cutoff:
+            pass
+    return search_first(dlx), None
@@ -0,0 +1,150 @@
+from calendar_puzzle.dancing_link.array_dl import ArrayNode
+from calendar_puzzle.dancing_link.dl import col_name
+
+
+# exact cover on sparse sets ("dancing cells"): the active items and the
+# active options of each item are prefixes of plain lists. a removal swaps
+# the element just past the end of its prefix and shrinks the size, so an
+# undo only grows the size back and nothing is relinked. node x is one 1 of
+# the matrix, items are columns and options are rows
+class SparseDlx:
+    def __init__(self, mx, row_names=None):
+        n, m = len(mx), len(mx[0])
+        self.row_names = [f'{i}' for i in range(n+1)] if row_names is None else row_names
+        assert(len(self.row_names) == n+1)
+        self.n_cols = m
+        # node chosen at each depth
+        self.solution: list[int] = []
+        # bit j set while item j is active, see Dlx.live
+        self.live = (1 << m) - 1
+        self.counts: dict[int, int] = {}
+        self.nodes_visited = 0
+
+        # the first `active` of ITEM are the active items, POS[i] is i's index in ITEM
+        self.ITEM = list(range(m))
+        self.POS = list(range(m))
+        self.active = m
+        # node -> its item, its row, its index in SET[item] and the (node,
+        # item) pairs and the items of its row
+        self.ITM: list[int] = []
+        self.ROW: list[int] = []
+        self.LOC: list[int] = []
+        self.OPT: list[list[tuple[int, int]]] = []
+        self.OPT_ITEMS: list[list[int]] = []
+        # item -> nodes of its options, the first SIZE[i] are active
+        self.SET: list[list[int]] = [[] for _ in range(m)]
+        self.SIZE = [0] * m
+
+        for i in range(n):
+            option, items = [], []
+            for j in range(m):
+                if not mx[i][j]:
+                    continue
+                x = len(self.ITM)
+                self.ITM.append(j)
+                self.ROW.append(i + 1)
+                self.LOC.append(len(self.SET[j]))
+                self.OPT.append(option)
+                self.OPT_ITEMS.append(items)
+                self.SET[j].append(x)
+                self.SIZE[j] += 1
+                option.append((x, j))
+                items.append(j)
+
+    def node(self, x: int) -> ArrayNode:
+        j = self.ITM[x]
+        return ArrayNode((self.ROW[x], j + 1), f"{col_name(j)}{self.ROW[x]}")
+
+    def search(self):
+        if self.active == 0:
+            yield [self.node(x) for x in self.solution]
+            return
+
+        i = self.choose_column()
+        self.cover(i)
+        # SET[i] does not change while i is inactive
+        options = self.SET[i]
+        for s in range(self.SIZE[i]):
+            x = options[s]
+            self.select(x)
+            yield from self.search()
+            self.unselect(x)
+        self.uncover(i)
+
+    def count(self) -> int:
+        """Count solutions, memoized by the active items like Dlx.count."""
+        if self.active == 0:
+            return 1
+        key = self.live
+        total = self.counts.get(key)
+        if total is not None:
+            return total
+
+        total = 0
+        i = self.choose_column()
+        self.cover(i)
+        options = self.SET[i]
+        for s in range(self.SIZE[i]):
+            x = options[s]
+            self.select(x)
+            total += self.count()
+            self.unselect(x)
+        self.uncover(i)
+        self.counts[key] = total
+        return total
+
+    def choose_column(self) -> int:
+        """The active item with the fewest active options."""
+        self.nodes_visited += 1
+        return min(self.ITEM[:self.active], key=self.SIZE.__getitem__)
+
+    def select(self, x: int):
+        # x's own item is already covered by the caller
+        self.solution.append(x)
+        for y, k in self.OPT[x]:
+            if y != x:
+                self.cover(k)
+
+    def unselect(self, x: int):
+        self.solution.pop()
+        for y, k in reversed(self.OPT[x]):
+            if y != x:
+                self.uncover(k)
+
+    def cover(self, i: int):
+        """Deactivate item i and hide its options from the active items."""
+        ITEM, POS, OPT, LOC, SET, SIZE = self.ITEM, self.POS, self.OPT, self.LOC, self.SET, self.SIZE
+        self.live ^= 1 << i
+        active = self.active - 1
+        self.active = active
+        last, p = ITEM[active], POS[i]
+        ITEM[p], POS[last] = last, p
+        ITEM[active], POS[i] = i, active
+
+        # an active option of an active item only has active items
+        for x in SET[i][:SIZE[i]]:
+            for y, k in OPT[x]:
+                if k == i:
+                    continue
+                # swap y past the end of SET[k]
+                end = SIZE[k] - 1
+                SIZE[k] = end
+                loc = LOC[y]
+                if loc != end:
+                    nodes = SET[k]
+                    z = nodes[end]
+                    nodes[loc] = z
+                    LOC[z] = loc
+                    nodes[end] = y
+                    LOC[y] = end
+
+    def uncover(self, i: int):
+        # every hidden node still sits right past its set, growing the
+        # sizes back undoes cover(i) whatever the order
+        OPT_ITEMS, SIZE = self.OPT_ITEMS, self.SIZE
+        for x in self.SET[i][:SIZE[i]]:
+            for k in OPT_ITEMS[x]:
+                if k != i:
+                    SIZE[k] += 1
+        self.active += 1
+        self.live |= 1 << i
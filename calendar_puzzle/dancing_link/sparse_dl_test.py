@@ -0,0 +1,85 @@
+import datetime
+import unittest
+import sys
+import os
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.bitboard.solver import BitboardSolver, render
+from calendar_puzzle.dancing_link.calendar import FasterGame
+from calendar_puzzle.dancing_link.dl import Dlx
+from calendar_puzzle.dancing_link.sparse_dl import SparseDlx
+
+MATRIX = [
+    [0, 0, 1, 0, 1, 1, 0],
+    [1, 0, 0, 1, 0, 0, 1],
+    [0, 1, 1, 0, 0, 1, 0],
+    [1, 0, 0, 1, 0, 0, 0],
+    [0, 1, 0, 0, 0, 0, 1],
+    [0, 0, 0, 1, 1, 0, 1],
+]
+# 3 solutions
+SMALL = [
+    [1, 0, 0, 1],
+    [0, 1, 1, 0],
+    [1, 1, 0, 0],
+    [0, 0, 1, 1],
+    [1, 1, 1, 1],
+]
+
+
+def row_sets(solutions):
+    return sorted(sorted(step.coordinate[0] for step in s) for s in solutions)
+
+
+class TestSparseDlx(unittest.TestCase):
+    def test_init(self):
+        dlx = SparseDlx(MATRIX)
+        self.assertEqual(dlx.SIZE, [sum(row[j] for row in MATRIX) for j in range(7)])
+        for j, nodes in enumerate(dlx.SET):
+            self.assertEqual([dlx.ROW[x] for x in nodes], [i + 1 for i, row in enumerate(MATRIX) if row[j]])
+
+    def test_choose_column(self):
+        dlx = SparseDlx(MATRIX)
+        self.assertEqual(dlx.SIZE[dlx.choose_column()], 2)
+
+    def test_cover_uncover(self):
+        dlx = SparseDlx(MATRIX)
+        dlx.cover(0) # rm A and the rows 2 and 4 through it
+        self.assertEqual(dlx.ITEM[:dlx.active], [6, 1, 2, 3, 4, 5])
+        self.assertEqual(dlx.SIZE[1:], [2, 2, 1, 2, 2, 2])
+        self.assertEqual({dlx.ROW[x] for x in dlx.SET[3][:dlx.SIZE[3]]}, {6})
+        dlx.uncover(0)
+        self.assertEqual(dlx.SIZE, [2, 2, 2, 3, 2, 2, 3])
+        self.assertEqual(dlx.active, 7)
+        self.assertEqual(dlx.live, 0b1111111)
+
+    def test_search(self):
+        solutions = list(SparseDlx(MATRIX).search())
+        self.assertEqual(row_sets(solutions), [[1, 4, 5]])
+        self.assertEqual([s.name for s in solutions[0]], ['A4', 'E1', 'B5'])
+
+    def test_same_as_dlx(self):
+        dlx = SparseDlx(SMALL)
+        self.assertEqual(row_sets(dlx.search()), row_sets(Dlx(SMALL).search()))
+        self.assertEqual(dlx.count(), 3)
+        self.assertEqual(dlx.live, 0b1111)
+        self.assertEqual(dlx.SIZE, SparseDlx(SMALL).SIZE)
+
+    def test_same_solutions_as_dlx(self):
+        g = FasterGame(datetime.date(2026, 5, 14))
+        solution = next(BitboardSolver.from_board(g.board.b, g.board.remaining_shapes).search())
+        g.board.b = [list(row) for row in ''.join(render(g.board.b, solution[:3])).split('\n')]
+        g.board.remaining_shapes = [s for s in g.board.remaining_shapes
+                                    if s.name not in {p.name for p in solution[:3]}]
+        g.build_shape()
+        sparse = FasterGame(g.dt, engine='sparse')
+        sparse.board = g.board
+        sparse.build_shape()
+        self.assertEqual(sparse.count(), g.count())
+        self.assertEqual({''.join(sparse.render(s)) for s in sparse.search()},
+                         {''.join(g.render(s)) for s in g.search()})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+# per-date solver templates shared by the web endpoints: the FasterGame of a
+# date's empty board (the board and its matrix), built once per key and kept
+# in a size-bounded LRU. the board only depends on the key, so any year's
+# date with the same month, day and weekday reuses it. a template is never
+# changed, partial states are rows selected on it and undone afterwards, see
+# FasterGame.select_placements, while holding the template's lock. a
+# template is built outside the cache's lock, so a cold date does not hold
+# up hits on the others; requests for a date being built wait on its future
+import datetime
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, NamedTuple
+
+from calendar_puzzle.dancing_link import ordering
+from calendar_puzzle.dancing_link.all_dates import Key
+from calendar_puzzle.dancing_link.calendar import FasterGame
+
+DEFAULT_SIZE = 16
+
+
+def date_key(dt: datetime.date) -> Key:
+    return dt.month, dt.day, dt.weekday()
+
+
+class Template(NamedTuple):
+    game: FasterGame
+    # held while rows are selected on game or it is searched
+    lock: threading.Lock
+
+
+def build_template(dt: datetime.date) -> FasterGame:
+    """FasterGame of the date, rows in the shared mined ordering if any."""
+    return FasterGame(dt, ordering=ordering.shared())
+
+
+class TemplateCache:
+    def __init__(self, maxsize: int = DEFAULT_SIZE, build: Callable[[datetime.date], FasterGame] = build_template):
+        self.maxsize = maxsize
+        self.build = build
+        self._templates: OrderedDict[Key, Template] = OrderedDict()
+        # key -> template being built
+        self._building: dict[Key, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, dt: datetime.date) -> Template:
+        """Template of the date, built on a miss."""
+        key = date_key(dt)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self.hits += 1
+                self._templates.move_to_end(key)
+                return template
+            self.misses += 1
+            future, owner = self._claim(key)
+        if not owner:
+            return future.result()
+        return self._build(dt, future)
+
+    def warmup(self, center: datetime.date, days: int) -> int:
+        """Build the templates of center ± days not cached or being built
+        yet, without counting them as misses. Number built."""
+        built = 0
+        for offset in range(-days, days + 1):
+            dt = center + datetime.timedelta(days=offset)
+            with self._lock:
+                if date_key(dt) in self._templates:
+                    continue
+                future, owner = self._claim(date_key(dt))
+            if owner:
+                self._build(dt, future)
+                built += 1
+        return built
+
+    def _claim(self, key: Key) -> tuple[Future, bool]:
+        """The future of key's template, and whether the caller builds it.
+        Called with self._lock held."""
+        future = self._building.get(key)
+        if future is not None:
+            return future, False
+        future = self._building[key] = Future()
+        return future, True
+
+    def _build(self, dt: datetime.date, future: Future) -> Template:
+        key = date_key(dt)
+        try:
+            template = Template(self.build(dt), threading.Lock())
+        except BaseException as e:
+            with self._lock:
+                del self._building[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._building[key]
+            self._templates[key] = template
+            while len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+                self.evictions += 1
+        future.set_result(template)
+        return template
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._templates),
+            'maxsize': self.maxsize,
+            'hitRate': self.hits / lookups if lookups else None,
+        }
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared() -> TemplateCache:
+    """The cache of the process, see DEFAULT_SIZE."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = TemplateCache()
+        return _shared
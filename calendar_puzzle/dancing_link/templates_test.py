@@ -0,0 +1,96 @@
+import datetime
+import threading
+import unittest
+import sys
+import os
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.board import Game
+from calendar_puzzle.dancing_link.templates import TemplateCache, date_key
+
+
+class TestTemplateCache(unittest.TestCase):
+    def test_same_key_shares_template(self):
+        cache = TemplateCache()
+        template = cache.get(datetime.date(2026, 5, 14))
+        self.assertEqual(template.game.board.b, Game(datetime.date(2026, 5, 14)).board.b)
+        # also a Thursday
+        self.assertIs(cache.get(datetime.date(2020, 5, 14)), template)
+        other = cache.get(datetime.date(2025, 5, 14))
+        self.assertIsNot(other.game, template.game)
+        self.assertIsNot(other.lock, template.lock)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_lru_eviction(self):
+        built = []
+        cache = TemplateCache(maxsize=2, build=lambda dt: built.append(dt) or date_key(dt))
+        days = [datetime.date(2026, 1, d) for d in (1, 2, 3)]
+        cache.get(days[0])
+        cache.get(days[1])
+        cache.get(days[0])
+        # the least recently used one goes
+        cache.get(days[2])
+        cache.get(days[0])
+        cache.get(days[1])
+        self.assertEqual(built, [days[0], days[1], days[2], days[1]])
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions'], stats['size']), (2, 4, 2, 2))
+        self.assertAlmostEqual(stats['hitRate'], 1 / 3)
+
+    def test_warmup(self):
+        built = []
+        cache = TemplateCache(build=lambda dt: built.append(dt) or date_key(dt))
+        center = datetime.date(2026, 3, 1)
+        self.assertEqual(cache.warmup(center, 2), 5)
+        self.assertEqual(built[0], datetime.date(2026, 2, 27))
+        self.assertEqual(cache.warmup(center, 3), 2)
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+        cache.get(center)
+        self.assertEqual(cache.stats()['hitRate'], 1.0)
+        self.assertIsNone(TemplateCache().stats()['hitRate'])
+
+    def test_build_outside_the_lock(self):
+        slow = datetime.date(2026, 1, 1)
+        started, release = threading.Event(), threading.Event()
+        built = []
+
+        def build(dt):
+            built.append(dt)
+            if dt == slow:
+                started.set()
+                release.wait(5)
+            return date_key(dt)
+
+        cache = TemplateCache(build=build)
+        got = []
+        threads = [threading.Thread(target=lambda: got.append(cache.get(slow))) for _ in range(2)]
+        threads[0].start()
+        self.assertTrue(started.wait(5))
+        threads[1].start()
+        # other dates are served while the slow one builds
+        self.assertEqual(cache.get(datetime.date(2026, 1, 2)).game, (1, 2, 4))
+        release.set()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(len(got), 2)
+        self.assertIs(got[0], got[1])
+        self.assertEqual(built.count(slow), 1)
+
+    def test_failed_build_is_retried(self):
+        calls = []
+
+        def build(dt):
+            calls.append(dt)
+            if len(calls) == 1:
+                raise RuntimeError('boom')
+            return date_key(dt)
+
+        cache = TemplateCache(build=build)
+        with self.assertRaises(RuntimeError):
+            cache.get(datetime.date(2026, 1, 1))
+        self.assertEqual(cache.get(datetime.date(2026, 1, 1)).game, (1, 1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+# zero-suppressed decision diagram of an exact cover solution family, built
+# by running the Dlx search with each residual problem (Dlx.live) compiled
+# once. a node (var, lo, hi) is the family lo plus every set of hi with var
+# added; variables are placement ids. the lo chain of a node follows the rows
+# of one column, so variables are not globally ordered, which counting and
+# enumerating do not need
+import gzip
+import json
+from typing import Callable, Iterable, Iterator
+
+from calendar_puzzle.dancing_link.dl import Dlx, Node
+
+BOTTOM = 0  # the empty family
+TOP = 1     # the family holding only the empty set
+
+
+class Zdd:
+    def __init__(self, nodes: list[tuple[int, int, int]], root: int):
+        # node id -> (var, lo, hi), ids 0 and 1 are BOTTOM and TOP
+        self.nodes = nodes
+        self.root = root
+
+    @classmethod
+    def from_dlx(cls, dlx: Dlx, var: Callable[[Node], int]) -> 'Zdd':
+        """Compile every solution of dlx (below its current selection),
+        var maps a row to its variable."""
+        nodes = [(-1, BOTTOM, BOTTOM), (-1, TOP, TOP)]
+        unique: dict[tuple[int, int, int], int] = {}
+        memo: dict[int, int] = {}
+
+        def make(v: int, lo: int, hi: int) -> int:
+            if hi == BOTTOM:
+                return lo
+            key = (v, lo, hi)
+            if key not in unique:
+                unique[key] = len(nodes)
+                nodes.append(key)
+            return unique[key]
+
+        def build() -> int:
+            if dlx.head.right == dlx.head:
+                return TOP
+            state = dlx.live
+            if state in memo:
+                return memo[state]
+            children = []
+            col = dlx.choose_column()
+            dlx.cover(col)
+            row = col.down
+            while row != col:
+                if dlx.prune is None or not dlx.prune(dlx, row):
+                    dlx.select(row)
+                    children.append((var(row), build()))
+                    dlx.unselect(row)
+                row = row.down
+            dlx.uncover(col)
+            node = BOTTOM
+            for v, hi in reversed(children):
+                node = make(v, node, hi)
+            memo[state] = node
+            return node
+
+        return cls(nodes, build())
+
+    def __len__(self) -> int:
+        return len(self.nodes) - 2
+
+    def _counter(self, placed: Iterable[int]):
+        """(count, bits, missing): count(node, missing) is the number of sets
+        under node holding the variables of placed whose bits are in missing."""
+        need = list(dict.fromkeys(placed))
+        bits = {v: 1 << i for i, v in enumerate(need)}
+        memo: dict[tuple[int, int], int] = {}
+
+        def count(node: int, missing: int) -> int:
+            if node <= TOP:
+                return 1 if node == TOP and not missing else 0
+            key = (node, missing)
+            if key not in memo:
+                v, lo, hi = self.nodes[node]
+                memo[key] = count(lo, missing) + count(hi, missing & ~bits.get(v, 0))
+            return memo[key]
+
+        return count, bits, (1 << len(need)) - 1
+
+    def count(self, placed: Iterable[int] = ()) -> int:
+        """Number of solutions holding every variable of placed."""
+        count, _, missing = self._counter(placed)
+        return count(self.root, missing)
+
+    def contains(self, var: int) -> bool:
+        """Whether some solution uses var."""
+        return self.count([var]) > 0
+
+    def solutions(self, placed: Iterable[int] = ()) -> Iterator[list[int]]:
+        """Every solution holding every variable of placed, as variable lists."""
+        count, bits, missing = self._counter(placed)
+        path: list[int] = []
+
+        def walk(node: int, missing: int) -> Iterator[list[int]]:
+            while node > TOP and count(node, missing):
+                v, lo, hi = self.nodes[node]
+                path.append(v)
+                yield from walk(hi, missing & ~bits.get(v, 0))
+                path.pop()
+                node = lo
+            if node == TOP and not missing:
+                yield path.copy()
+
+        yield from walk(self.root, missing)
+
+    def save(self, path: str):
+        """
+        Gzipped JSON of the nodes from id 2 on, one list per field. hi is
+        stored as the distance back from the node, it mostly points close by,
+        and lo as is, it is mostly BOTTOM.
+        """
+        nodes = self.nodes[2:]
+        data = {
+            'root': self.root,
+            'var': [v for v, _, _ in nodes],
+            'lo': [lo for _, lo, _ in nodes],
+            'hi': [i - hi for i, (_, _, hi) in enumerate(nodes, 2)],
+        }
+        with gzip.open(path, 'wt', compresslevel=9) as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path: str) -> 'Zdd':
+        with gzip.open(path, 'rt') as f:
+            data = json.load(f)
+        nodes = [(-1, BOTTOM, BOTTOM), (-1, TOP, TOP)]
+        for i, (v, lo, hi) in enumerate(zip(data['var'], data['lo'], data['hi']), 2):
+            nodes.append((v, lo, i - hi))
+        return cls(nodes, data['root'])
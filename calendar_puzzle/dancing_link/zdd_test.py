@@ -0,0 +1,81 @@
+import datetime
+import os
+import tempfile
+import unittest
+import sys
+
+parent_parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_parent_dir)
+from calendar_puzzle.bitboard.placements import PLACEMENTS, board_placements
+from calendar_puzzle.bitboard.solver import BitboardSolver, render
+from calendar_puzzle.dancing_link.calendar import FasterGame
+from calendar_puzzle.dancing_link.dl import Dlx
+from calendar_puzzle.dancing_link.zdd import Zdd
+
+MATRIX = [
+    [1, 0, 0, 0],
+    [0, 1, 0, 0],
+    [0, 0, 1, 0],
+    [0, 0, 0, 1],
+    [0, 1, 1, 0],
+    [1, 1, 1, 1],
+    [0, 0, 1, 1],
+]
+
+
+def row_sets(solutions):
+    return sorted(sorted(s) for s in solutions)
+
+
+class TestZdd(unittest.TestCase):
+    def setUp(self):
+        self.dlx = Dlx(MATRIX)
+        self.zdd = Zdd.from_dlx(self.dlx, lambda row: row.coordinate[0])
+        self.expected = row_sets([n.coordinate[0] for n in s] for s in Dlx(MATRIX).search())
+
+    def test_same_family(self):
+        self.assertEqual(self.zdd.count(), 4)
+        self.assertEqual(row_sets(self.zdd.solutions()), self.expected)
+        self.assertEqual(self.dlx.live, 0b1111)
+
+    def test_queries(self):
+        self.assertEqual(self.zdd.count([1]), 3)
+        self.assertEqual(self.zdd.count([1, 2]), 2)
+        self.assertEqual(self.zdd.count([6, 1]), 0)
+        self.assertTrue(self.zdd.contains(7))
+        self.assertEqual(row_sets(self.zdd.solutions([2])), [s for s in self.expected if 2 in s])
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'family.json.gz')
+            self.zdd.save(path)
+            loaded = Zdd.load(path)
+        self.assertEqual(loaded.nodes, self.zdd.nodes)
+        self.assertEqual(loaded.root, self.zdd.root)
+
+
+class TestGameZdd(unittest.TestCase):
+    def test_partial_board(self):
+        dt = datetime.date(2026, 5, 14)
+        g = FasterGame(dt)
+        solution = next(BitboardSolver.from_board(g.board.b, g.board.remaining_shapes).search())
+        g.board.b = [list(row) for row in ''.join(render(g.board.b, solution[:4])).split('\n')]
+        g.board.remaining_shapes = [s for s in g.board.remaining_shapes
+                                    if s.name not in {p.name for p in solution[:4]}]
+        g.build_shape()
+        zdd = g.zdd()
+        self.assertEqual(zdd.count(), g.count())
+
+        boards = {''.join(g.render(s)) for s in g.search()}
+        self.assertEqual({''.join(render(g.board.b, [PLACEMENTS[i] for i in ids]))
+                          for ids in zdd.solutions()}, boards)
+        # the next piece of the known solution, as placed on a board
+        b = [list(row) for row in ''.join(render(g.board.b, solution[4:5])).split('\n')]
+        placed = [p.id for p in board_placements(b, [s.name for s in g.board.remaining_shapes])]
+        self.assertEqual(placed, [solution[4].id])
+        self.assertTrue(zdd.contains(solution[4].id))
+        self.assertEqual(zdd.count(placed), sum(1 for _ in zdd.solutions(placed)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ def EMPTY_SHAPE():
 
 class Shape(object):
     _name = None
+    _cells = None
     grid = EMPTY_SHAPE()
     rotate_grid = []
 
@@ -32,6 +33,13 @@ class Shape(object):
                         self._name = col
                         return col
         return self._name
+
+    @property
+    def cells(self):
+        """(i, j, c) of each filled cell of the grid, row by row."""
+        if self._cells is None:
+            self._cells = [(i, j, c) for i, row in enumerate(self.grid) for j, c in enumerate(row) if c != ' ']
+        return self._cells
     
     def all_shapes(self):
         visited = {self}
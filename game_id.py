@@ -219,7 +219,7 @@ class GameIDGeneratorV3:
         game = Game()
         game.board = board
         for block in dropped_blocks:
-            _, game.board.b = game.fit_put(block['x'], block['y'], SHAPE_MAP[block['id']]())
+            game.put(block['x'], block['y'], SHAPE_MAP[block['id']]())
         
         # 使用 _pack_game_state 生成紧凑数据，然后编码为base54
         compact_data = GameIDGeneratorV3._pack_game_state(game.board.b, dropped_blocks, remaining_types)
@@ -2,9 +2,13 @@
 
 Free tier  : --top-k N  caps solutions per key (small main-bundle pack).
 Paid tier  : --all       full enumeration per key (cloud-served).
+Counts     : --counts    number of solutions per key, nothing materialised.
+Sampled    : --sample N  N distinct solutions per key drawn uniformly at random
+                         instead of the first N in search order (--seed).
 
 Output is one JSON file (and a gzipped copy) keyed by "M-D-W" strings,
-each value a list of 56-char board strings (8 rows × 7 cols, '#'/'*' kept).
+each value a list of 56-char board strings (8 rows × 7 cols, '#'/'*' kept),
+or with --counts the solution count of that key.
 
 Examples
 --------
@@ -16,6 +20,22 @@ Examples
 
     # full paid pack (long-running; consider --parallel and overnight)
     python gen_pack.py --all --parallel 8 --out pack_data/pack_full.json
+
+    # a varied free pack, reproducible with the same seed
+    python gen_pack.py --sample 20 --seed 7 --parallel 8 --out pack_data/pack_free.json
+
+    # per-key solution counts for the release notes
+    python gen_pack.py --counts --parallel 8 --out pack_data/counts.json
+
+    # split each key's search tree 2 levels deep and spread it over the pool
+    python gen_pack.py --all --parallel 8 --split-depth 2 --out pack_data/pack_full.json
+
+    # one matrix for every key: --all walks it once for all keys, --counts
+    # counts all weekdays of a (month, day) together
+    python gen_pack.py --counts --multi-date --out pack_data/counts.json
+
+    # every key's count from a broken-profile DP pass per weekday, no search at all
+    python gen_pack.py --counts --profile --out pack_data/counts.json
 """
 import argparse
 import datetime
@@ -23,9 +43,13 @@ import gzip
 import json
 import multiprocessing as mp
 import os
+import random
 import time
 
-from calendar_puzzle.dancing_link.calendar import FasterGame
+from calendar_puzzle.bitboard import profile
+from calendar_puzzle.dancing_link import parallel
+from calendar_puzzle.dancing_link.all_dates import AllDates
+from calendar_puzzle.dancing_link.calendar import ALL_ENGINES, FasterGame
 
 
 WINDOW_DAYS = 28 * 366  # covers every (m, d, weekday) tuple at least once.
@@ -43,31 +67,68 @@ def enumerate_keys_with_dates():
     return sorted(seen.items())
 
 
-def encode_solution(sol_steps, row_names):
-    b = []
-    for step in sol_steps:
-        rn = row_names[step.coordinate[0]]
-        if not b:
-            b = list(rn)
-        else:
-            for i, c in enumerate(rn):
-                if b[i] == ' ' and c != ' ':
-                    b[i] = c
-    return ''.join(b).replace('\n', '')
+def encode_solution(g, solution):
+    return ''.join(g.render(solution)).replace('\n', '')
 
 
 def solve_one(args):
-    key, dt_iso, top_k = args
+    key, dt_iso, top_k, counts, engine, seed = args
     dt = datetime.date.fromisoformat(dt_iso)
-    g = FasterGame(dt)
+    g = FasterGame(dt, engine=engine)
+    if counts:
+        return key, g.count()
+    if seed is not None:
+        return key, sample_distinct(g, top_k, random.Random(f'{seed}-{dt_iso}'))
     sols = []
-    for steps in g.dlx.search():
-        sols.append(encode_solution(steps, g.dlx.row_names))
+    if top_k == 0:
+        return key, sols
+    for solution in g.search():
+        sols.append(encode_solution(g, solution))
         if top_k is not None and len(sols) >= top_k:
             break
     return key, sols
 
 
+def sample_distinct(g, k, rng):
+    """Up to k distinct solutions drawn uniformly, all of them if there are
+    no more than k."""
+    if g.count() <= k:
+        return [encode_solution(g, s) for s in g.search()]
+    sols = {}
+    while len(sols) < k:
+        board = encode_solution(g, g.sample(1, rng)[0])
+        sols.setdefault(board, None)
+    return list(sols)
+
+
+def solve_multi_date(keys, top_k, counts=False):
+    """Yield (key, sols) for the keys like solve_one, from one AllDates matrix."""
+    solver = AllDates()
+    if counts:
+        wanted = set(keys)
+        for month_day in sorted({key[:2] for key in keys}):
+            for key, n in sorted(solver.count_keys(month_day).items()):
+                if key in wanted:
+                    yield key, n
+    elif top_k is None:
+        pack = {key: [] for key in keys}
+        for key, placements in solver.search():
+            if key in pack:
+                pack[key].append(solver.render(key, placements))
+        yield from pack.items()
+    else:
+        for key in keys:
+            sols = []
+            if top_k == 0:
+                yield key, sols
+                continue
+            for placements in solver.search_key(key):
+                sols.append(solver.render(key, placements))
+                if len(sols) >= top_k:
+                    break
+            yield key, sols
+
+
 def key_str(k):
     return f"{k[0]}-{k[1]}-{k[2]}"
 
@@ -77,24 +138,49 @@ def main():
     grp = p.add_mutually_exclusive_group(required=True)
     grp.add_argument('--top-k', type=int, help='Cap solutions per key.')
     grp.add_argument('--all', action='store_true', help='Enumerate all solutions per key.')
+    grp.add_argument('--counts', action='store_true', help='Only count solutions per key.')
+    grp.add_argument('--sample', type=int, help='Uniformly sample this many distinct solutions per key.')
     p.add_argument('--out', required=True, help='Output JSON path; .gz is emitted alongside.')
     p.add_argument('--parallel', type=int, default=1, help='Worker processes (default 1).')
+    p.add_argument('--engine', choices=ALL_ENGINES, default='dlx', help='Exact cover engine (default dlx).')
+    p.add_argument('--split-depth', type=int, default=0,
+                   help='Split each key into subtrees this deep and run them on the pool '
+                        '(dlx engine, --all/--counts only; default 0 = one key per worker).')
+    p.add_argument('--seed', type=int, default=0, help='Random seed of --sample (default 0).')
+    p.add_argument('--multi-date', action='store_true',
+                   help='Solve every key from one matrix with the date groups as constraints '
+                        '(single process).')
+    p.add_argument('--profile', action='store_true',
+                   help='Count the keys with a broken-profile DP pass per weekday (--counts only, single process).')
     p.add_argument('--limit', type=int, default=None, help='Stop after N keys (for testing).')
     p.add_argument('--progress-every', type=int, default=25, help='Progress log cadence.')
     args = p.parse_args()
-
-    top_k = None if args.all else args.top_k
+    if args.sample is not None and args.engine != 'dlx':
+        p.error('--sample needs the dlx engine')
+    if args.split_depth and (args.top_k is not None or args.sample is not None or args.engine != 'dlx'):
+        p.error('--split-depth needs --all or --counts and the dlx engine')
+    if args.multi_date and (args.sample is not None or args.parallel > 1 or args.split_depth or args.engine != 'dlx'):
+        p.error('--multi-date runs in one process on the dlx engine, without --sample')
+    if args.profile and (not args.counts or args.multi_date or args.parallel > 1 or args.split_depth):
+        p.error('--profile needs --counts and runs in one process')
+
+    # top_k: solutions per key, None enumerates everything (and is unused with --counts)
+    counts = args.counts
+    top_k = None if args.all or counts else args.sample if args.sample is not None else args.top_k
+    seed = args.seed if args.sample is not None else None
     keys_dates = enumerate_keys_with_dates()
     if args.limit:
         keys_dates = keys_dates[:args.limit]
     n = len(keys_dates)
-    print(f"Keys: {n}; mode={'ALL' if top_k is None else f'top-{top_k}'}; parallel={args.parallel}")
+    mode = ('COUNTS' if counts else 'ALL' if top_k is None
+            else f'sample-{top_k} seed={seed}' if seed is not None else f'top-{top_k}')
+    print(f"Keys: {n}; mode={mode}; parallel={args.parallel}; engine={args.engine}")
 
     out_dir = os.path.dirname(args.out)
     if out_dir:
         os.makedirs(out_dir, exist_ok=True)
 
-    work = [(k, dt.isoformat(), top_k) for (k, dt) in keys_dates]
+    work = [(k, dt.isoformat(), top_k, counts, args.engine, seed) for (k, dt) in keys_dates]
 
     pack = {}
     t0 = time.perf_counter()
@@ -105,7 +191,26 @@ def main():
         eta = (n - done) / rate if rate > 0 else float('inf')
         print(f"  [{done}/{n}] elapsed={elapsed:.0f}s rate={rate:.2f} keys/s ETA={eta:.0f}s")
 
-    if args.parallel > 1:
+    if args.profile:
+        key_counts = profile.count_keys(sorted({key[2] for key, _ in keys_dates}))
+        for key, _ in keys_dates:
+            pack[key_str(key)] = key_counts[key]
+        log_progress(n)
+    elif args.multi_date:
+        for i, (key, sols) in enumerate(solve_multi_date([k for k, _ in keys_dates], top_k, counts), 1):
+            pack[key_str(key)] = sols
+            if i % args.progress_every == 0 or i == n:
+                log_progress(i)
+    elif args.split_depth:
+        with mp.Pool(args.parallel) as pool:
+            for i, (key, dt) in enumerate(keys_dates, 1):
+                if counts:
+                    pack[key_str(key)] = parallel.count(dt, pool, args.split_depth)
+                else:
+                    pack[key_str(key)] = list(parallel.search(dt, pool, args.split_depth))
+                if i % args.progress_every == 0 or i == n:
+                    log_progress(i)
+    elif args.parallel > 1:
         with mp.Pool(args.parallel) as pool:
             for i, (key, sols) in enumerate(pool.imap_unordered(solve_one, work, chunksize=1), 1):
                 pack[key_str(key)] = sols
@@ -129,12 +234,12 @@ def main():
     gz_bytes = os.path.getsize(gz_path)
 
     total = time.perf_counter() - t0
-    total_sols = sum(len(v) for v in pack.values())
-    counts = sorted(len(v) for v in pack.values())
+    sizes = sorted(v if counts else len(v) for v in pack.values())
+    total_sols = sum(sizes)
     print()
     print(f"Done in {total:.1f}s ({total/60:.2f} min)")
     print(f"Keys written : {len(pack)}")
-    print(f"Solutions    : total={total_sols}  min={counts[0]}  median={counts[len(counts)//2]}  max={counts[-1]}  avg={total_sols/len(pack):.1f}")
+    print(f"Solutions    : total={total_sols}  min={sizes[0]}  median={sizes[len(sizes)//2]}  max={sizes[-1]}  avg={total_sols/len(pack):.1f}")
     print(f"Raw  size    : {raw_bytes:>12,} B = {raw_bytes/1024/1024:.2f} MB")
     print(f"Gzip size    : {gz_bytes:>12,} B = {gz_bytes/1024/1024:.2f} MB")
     print(f"Outputs      : {raw_path}, {gz_path}")
@@ -0,0 +1,52 @@
+"""Mine a solution pack for placement frequencies and write an ordering file.
+
+Reads a pack written by gen_pack.py (keyed by "M-D-W", each value a list of
+56-char boards, .gz accepted) and counts how often each placement is part of
+a solution, per key and over all keys. FasterGame(ordering=Ordering.load(...))
+then builds its matrix with the frequent placements' rows first; solve_for_web
+picks the file up from $CALENDAR_ORDERING (default
+~/.cache/calendar_puzzle/ordering.json).
+
+    python mine_ordering.py pack_data/pack_free.json --out pack_data/ordering.json
+
+    # only the counts over all keys (small, and for dates missing from the pack)
+    python mine_ordering.py pack_data/pack_free.json --global-only --out pack_data/ordering.json
+
+bench_ordering.py measures the nodes it saves.
+"""
+import argparse
+import gzip
+import json
+import os
+
+from calendar_puzzle.dancing_link.ordering import Ordering
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('pack', help='Pack JSON from gen_pack.py (--top-k, --sample or --all).')
+    p.add_argument('--out', required=True, help='Ordering JSON path.')
+    p.add_argument('--global-only', action='store_true', help='Leave out the per-key counts.')
+    args = p.parse_args()
+
+    with (gzip.open(args.pack, 'rt') if args.pack.endswith('.gz') else open(args.pack)) as f:
+        pack = json.load(f)
+    try:
+        ordering = Ordering.mine(pack)
+    except ValueError as e:
+        p.error(f'{e} (a --counts pack cannot be mined)')
+    if args.global_only:
+        ordering = ordering.without_keys()
+
+    out_dir = os.path.dirname(args.out)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    ordering.save(args.out)
+    solutions = sum(len(boards) for boards in pack.values())
+    print(f"Mined {solutions} solutions of {len(pack)} keys: {len(ordering.counts)} placements, "
+          f"{len(ordering.key_counts)} keys kept")
+    print(f"Output: {args.out} ({os.path.getsize(args.out):,} B)")
+
+
+if __name__ == '__main__':
+    main()
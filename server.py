@@ -4,9 +4,11 @@ import json
 import os
 import time  # 添加时间模块用于计时
 import logging  # 添加日志模块
-from solve_for_web import main
+import datetime
+import threading
+from solve_for_web import main, get_date
 from game_id import GameIDGeneratorV3
-from calendar_puzzle.board import Game as CalendarGame
+from calendar_puzzle.dancing_link import templates
 from calendar_puzzle.constants import DATE_BLOCK, INITIAL_BLOCK_TYPES, BLOCK_TYPE_MAPPING, BOARD_BLOCK
 
 
@@ -23,8 +25,13 @@ CORS(app)  # Enable CORS for all routes
 # 初始化GameID生成器
 id_generator = GameIDGeneratorV3()
 
+# /api/solutions 单页最多返回的解数量
+MAX_PAGE_SIZE = 500
+# 服务启动时在后台预先构建今天前后几天的日期模板（见 calendar_puzzle/dancing_link/templates.py）
+TEMPLATE_WARMUP_DAYS = int(os.environ.get('TEMPLATE_WARMUP_DAYS', 3))
+
 def get_board_with_date(day=None, month=None):
-    """使用CalendarGame生成标准棋盘布局
+    """使用日期模板（见 templates.shared）生成标准棋盘布局
     
     Args:
         day: 日期(1-31)，默认使用当前日期
@@ -33,15 +40,9 @@ def get_board_with_date(day=None, month=None):
     Returns:
         8x7棋盘数组，包含BLOCK标记的不可放置格子
     """
-    import datetime
-    
-    if day is None or month is None:
-        dt = datetime.date.today()
-    else:
-        dt = datetime.date(datetime.date.today().year, month, day)
-    
-    game = CalendarGame(dt)
-    return game.board.b  # 返回8x7棋盘
+    # 棋盘取自缓存的日期模板，复制一份，调用方可以修改
+    template = templates.shared().get(get_date(day, month))
+    return [row.copy() for row in template.game.board.b]  # 返回8x7棋盘
 
 
 
@@ -123,7 +124,7 @@ def generate_game_id_api():
             day = data.get('day')
             month = data.get('month')
             
-            # 使用CalendarGame生成标准棋盘
+            # 使用缓存的日期模板生成标准棋盘
             board_data = get_board_with_date(day, month)
             
             # 计算剩余方块类型（从初始方块中移除已放置的方块）
@@ -183,6 +184,7 @@ def get_solution():
       - 如果不提供, 使用初始方块出去已放置方块
     - day (Number, 可选): 日期 (1-31), 默认当前日期
     - month (Number, 可选): 月份 (1-12), 默认当前月份
+    - restarts (Boolean, 可选): 用随机重启求第一个解, 默认 false
     
     响应数据:
     成功 (200):
@@ -193,6 +195,7 @@ def get_solution():
       "droppedBlocks": [...],  // 解决方案中的方块放置信息
       "remainingBlockTypes": [],  // 解决后剩余方块为空数组
       "solveTime": 1.234,  // 求解耗时(秒)
+      "seed": 3,  // 仅 restarts 时返回: 找到解的重启种子, null 表示按常规顺序找到
       "gameId": "abc123...",  // 游戏ID字符串
       "initialGameId": "abc123...",  // 初始游戏ID（与gameId相同，为了向后兼容）
       "currentGameId": "abc123...",  // 当前游戏ID（与gameId相同，为了向后兼容）
@@ -236,7 +239,7 @@ def get_solution():
             day = data.get('day')
             month = data.get('month')
             
-            # 使用CalendarGame生成标准棋盘
+            # 使用缓存的日期模板生成标准棋盘
             board_data = get_board_with_date(day, month)
             
             # 计算游戏ID
@@ -270,7 +273,10 @@ def get_solution():
             'boardLayout': [''.join(map(str, row)) for row in board_data],
             'dimensions': {'rows': len(board_data), 'cols': len(board_data[0])},
             'droppedBlocks': dropped_blocks,
-            'remainingBlockTypes': remaining_block_types
+            'remainingBlockTypes': remaining_block_types,
+            'restarts': bool(data.get('restarts', False)),
+            'day': data.get('day'),
+            'month': data.get('month')
         }
 
         # 保存完整游戏状态
@@ -320,6 +326,82 @@ def get_solution():
         logging.error(f"Unexpected error in get_solution: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/solutions', methods=['POST'])
+def get_solutions_page():
+    """分页返回某个日期的全部解
+
+    第一页不传cursor，之后把上一页返回的cursor原样传回即可继续，
+    服务端从cursor处恢复搜索，不需要从头重新遍历。
+    也可以传offset按序号随机访问：第k个解在固定的搜索顺序中的位置不变，
+    可以直接用序号引用某个解。
+
+    请求参数:
+    - day (Number, 可选): 日期 (1-31), 默认当前日期
+    - month (Number, 可选): 月份 (1-12), 默认当前月份
+    - cursor (String, 可选): 上一页返回的cursor
+    - offset (Number, 可选): 从第offset个解(从0开始)开始返回, 传了则忽略cursor
+    - limit (Number, 可选): 每页解数量, 默认100, 最多MAX_PAGE_SIZE
+
+    响应数据:
+    成功 (200):
+    {
+      "solutions": ["*QQVLN#...", ...],  // 每个解为56字符的棋盘字符串 (8行×7列)
+      "cursor": "107.1.580...",  // 下一页的cursor, 没有更多解时为null
+      "success": true
+    }
+    传offset时没有cursor，改为返回:
+    {
+      "solutions": [...],
+      "offset": 100,  // 第一个解的序号
+      "total": 2015,  // 该日期的解总数
+      "success": true
+    }
+
+    错误 (400):
+    {
+      "error": "Invalid cursor: ...",
+      "success": false
+    }
+    """
+    try:
+        data = request.json or {}
+        limit = max(1, min(int(data.get('limit', 100)), MAX_PAGE_SIZE))
+        if data.get('offset') is not None:
+            offset = max(0, int(data['offset']))
+            # 按序号取解也在缓存的日期模板上进行，与按cursor翻页的解顺序一致；
+            # 解数统计(冷日期约十几秒)缓存在模板里，Dlx不是线程安全的，所以持有该模板的锁
+            template = templates.shared().get(get_date(data.get('day'), data.get('month')))
+            with template.lock:
+                total = template.game.count()
+                # 只按序号定位第一个解，其余的从它接着搜索
+                solutions = template.game.page_at(offset, limit)
+            return jsonify({
+                'solutions': solutions,
+                'offset': offset,
+                'total': total,
+                'success': True
+            })
+        # 按cursor翻页在缓存的日期模板上搜索，搜索完撤销到原状态
+        template = templates.shared().get(get_date(data.get('day'), data.get('month')))
+        try:
+            with template.lock:
+                solutions, cursor = template.game.page(data.get('cursor'), limit)
+        except ValueError as e:
+            return jsonify({
+                'error': f'Invalid cursor: {str(e)}',
+                'success': False
+            }), 400
+
+        return jsonify({
+            'solutions': solutions,
+            'cursor': cursor,
+            'success': True
+        })
+
+    except Exception as e:
+        logging.error(f"Unexpected error in get_solutions_page: {str(e)}")
+        return jsonify({'error': str(e), 'success': False}), 500
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """健康检查端点
@@ -333,7 +415,8 @@ def health_check():
         'status': 'healthy',
         'timestamp': time.time(),
         'service': 'calendar-puzzle-api',
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'templateCache': templates.shared().stats()
     })
 
 @app.route('/', methods=['GET'])
@@ -344,11 +427,20 @@ def root():
         'endpoints': {
             'health': '/api/health',
             'game_id': '/api/game-id',
-            'solution': '/api/solution'
+            'solution': '/api/solution',
+            'solutions': '/api/solutions'
         },
         'documentation': 'See README.md for full API documentation'
     })
 
+def warmup_templates():
+    """构建今天前后TEMPLATE_WARMUP_DAYS天的日期模板，首批请求不必现建矩阵"""
+    start = time.time()
+    built = templates.shared().warmup(datetime.date.today(), TEMPLATE_WARMUP_DAYS)
+    logging.info(f"Warmed {built} date templates in {time.time() - start:.2f}s")
+
 if __name__ == '__main__':
+    # 导入本模块（测试、基准）时不预热；后台线程预热，服务不必等它就能响应，正在构建的日期的请求会等它建好
+    threading.Thread(target=warmup_templates, daemon=True).start()
     port = int(os.environ.get('PORT', 5001))
     app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
@@ -1,8 +1,13 @@
 import sys
+import datetime
 import json
 import os
 import sys
-from calendar_puzzle.dancing_link.calendar import Game, FasterGame
+from calendar_puzzle.bitboard.placements import BY_MASK, board_placements, cell_bit
+from calendar_puzzle.constants import BOARD_COLS, BOARD_ROWS
+from calendar_puzzle.dancing_link.calendar import Game, FasterGame, board_str2b
+from calendar_puzzle.dancing_link import ordering, templates, restarts as dlx_restarts
+from calendar_puzzle.dancing_link.pruning import parity_feasible
 from calendar_puzzle.shape import Shape
 import numpy as np
 
@@ -20,6 +25,103 @@ SHAPE_MAPPING = {
     'J': 'J-block'
 }
 
+
+def get_date(day=None, month=None):
+    """day/month缺省时返回今天，否则返回今年的该日期"""
+    today = datetime.date.today()
+    if day is None or month is None:
+        return today
+    return datetime.date(today.year, month, day)
+
+
+def dropped_placements(dropped_blocks):
+    """前端已放置方块对应的放置（Placement），有方块无法对应（未知形状、越界、不是该形状的放置）时返回None"""
+    placements = []
+    for block in dropped_blocks:
+        shape_label = next((k for k, v in SHAPE_MAPPING.items() if v == block['id']), None)
+        if shape_label is None:
+            return None
+        mask = 0
+        for i, row in enumerate(block['shape']):
+            for j, cell in enumerate(row):
+                if cell == 0:
+                    continue
+                # 前端x是横轴，y是纵轴
+                x, y = block['y'] + i, block['x'] + j
+                if not (0 <= x < BOARD_ROWS and 0 <= y < BOARD_COLS):
+                    return None
+                mask |= cell_bit(x, y)
+        placement = BY_MASK.get((shape_label, mask))
+        if placement is None:
+            return None
+        placements.append(placement)
+    return placements
+
+
+def solve_on_template(dt, placements, randomized):
+    """
+    在日期模板上预选已放置方块的矩阵行后求第一个解，不重建矩阵。
+    返回 (是否可用模板, 解出的棋盘或None, 种子)；方块互相重叠或压住日期格时不可用模板
+    """
+    # 日期模板（空棋盘及其矩阵）由进程内的LRU缓存共用，已放置的方块通过预选矩阵行表示，求解后撤销，模板本身不变；
+    # 预选行在求解完成后才撤销，同一时间只能有一个请求使用同一个模板
+    template = templates.shared().get(dt)
+    g = template.game
+    with template.lock:
+        if not g.select_placements(placements):
+            return False, None, None
+        try:
+            # 黑白格数差无法由剩余方块凑出时直接判定无解，不必搜索
+            partial = board_str2b(''.join(g.render(g.dlx.solution)))
+            placed = {p.name for p in placements}
+            remaining = [s.name for s in g.board.remaining_shapes if s.name not in placed]
+            if not parity_feasible(partial, remaining):
+                return True, None, None
+            seed = None
+            if randomized:
+                solution, seed = dlx_restarts.first_solution(g.dlx)
+            else:
+                solution = dlx_restarts.search_first(g.dlx)
+            if solution is None:
+                return True, None, seed
+            return True, board_str2b(''.join(g.render(solution))), seed
+        finally:
+            g.dlx.unwind()
+
+
+def solve_rebuilt(dt, dropped_blocks, randomized):
+    """把方块放到该日期的新棋盘上，重建矩阵后求解，返回 (解出的棋盘或None, 种子)"""
+    # 初始化求解器，有挖掘出的放置顺序文件时（见 mine_ordering.py）按它排列矩阵行
+    g = FasterGame(dt, ordering=ordering.shared())
+
+    # 设置当前已放置的方块
+    for block in dropped_blocks:
+        # 找到对应的形状
+        shape_label = next((k for k, v in SHAPE_MAPPING.items() if v == block['id']), None)
+        if shape_label:
+            # 将前端的形状格式转换为求解器的形状格式
+            shape_matrix = []
+            for row in block['shape']:
+                shape_matrix.append([' ' if cell == 0 else shape_label for cell in row])
+            shape = Shape(shape_matrix)
+            # 放置方块
+            x, y = block['x'], block['y']
+            # 前端x是横轴，y是纵轴，所以要换一下；直接放在棋盘上，不复制棋盘
+            placed = g.put(y, x, shape)
+            g.board.remaining_shapes = [s for s in g.board.remaining_shapes if s.name != shape_label]
+
+            if placed is None:
+                print(f"Failed to place shape at position ({x}, {y})", file=sys.stderr)
+
+    # 求解，黑白格数差无法由剩余方块凑出时直接判定无解，不必搜索
+    # randomized 为真时用随机重启求第一个解，seed 记录成功的种子以便复现
+    remaining = [s.name for s in g.board.remaining_shapes]
+    if not (parity_feasible(g.board.b, remaining) and g.solve(find_one_exit=True, randomized=randomized)):
+        return None, g.seed
+    # 直接使用g.board而不是转换为numpy数组
+    return g.board.b, g.seed
+
+
 # 主函数
 def main(input_file, output_file):
     try:
@@ -27,37 +129,21 @@ def main(input_file, output_file):
         with open(input_file, 'r') as f:
             game_state = json.load(f)
 
-        # 初始化求解器
-        g = FasterGame()
-        # g = Game()
-
-        # 设置当前已放置的方块
+        # 按游戏状态中的day/month（server从请求转发）求解，未给出时为今天；以前总是按今天求解
+        dt = get_date(game_state.get('day'), game_state.get('month'))
+        restarts = bool(game_state.get('restarts', False))
         dropped_blocks = game_state.get('droppedBlocks', [])
-        for block in dropped_blocks:
-            # 找到对应的形状
-            shape_label = next((k for k, v in SHAPE_MAPPING.items() if v == block['id']), None)
-            if shape_label:
-                # 将前端的形状格式转换为求解器的形状格式
-                shape_matrix = []
-                for row in block['shape']:
-                    shape_matrix.append([' ' if cell == 0 else shape_label for cell in row])
-                shape = Shape(shape_matrix)
-                # 放置方块
-                x, y = block['x'], block['y']
-                # 前端x是横轴，y是纵轴，所以要换一下
-                succ, new_b = g.fit_put(y, x, shape)
-                g.board.remaining_shapes = [s for s in g.board.remaining_shapes if s.name != shape_label]
-
-                if succ:
-                    g.board.b = new_b
-                else:
-                    print(f"Failed to place shape at position ({x}, {y})", file=sys.stderr)
-
-        # 求解
-        solution_found = g.solve(find_one_exit=True)
+
+        # 已放置的方块都能对应到模板矩阵的行时，直接在缓存的日期模板上求解
+        placements = dropped_placements(dropped_blocks)
+        templated = False
+        if placements is not None:
+            templated, board, seed = solve_on_template(dt, placements, restarts)
+        if not templated:
+            board, seed = solve_rebuilt(dt, dropped_blocks, restarts)
 
         # 检查是否找到解决方案
-        if not solution_found:
+        if board is None:
             # 无解情况：返回空解决方案
             solution = {
                 'boardData': [],
@@ -68,8 +154,6 @@ def main(input_file, output_file):
             }
         else:
             # 找到解决方案的情况
-            # 直接使用g.board而不是转换为numpy数组
-            board = g.board.b
             rows = len(board)
             cols = len(board[0]) if rows > 0 else 0
 
@@ -82,43 +166,22 @@ def main(input_file, output_file):
                 'remainingBlockTypes': []  # 解决后剩余块为空
             }
 
-            # 记录每个形状的位置
-            shape_positions = {}
-            for y in range(rows):
-                for x in range(cols):
-                    shape_label = board[y][x]
-                    if shape_label != ' ':
-                        if shape_label not in shape_positions:
-                            shape_positions[shape_label] = []
-                        shape_positions[shape_label].append((x, y))
-
-            # 处理每个形状
-            for shape_label, positions in shape_positions.items():
-                # 计算形状的边界框
-                xs, ys = zip(*positions)
-                min_x, max_x = min(xs), max(xs)
-                min_y, max_y = min(ys), max(ys)
-
-                # 创建形状矩阵
-                shape_matrix = []
-                for y in range(min_y, max_y + 1):
-                    row = []
-                    for x in range(min_x, max_x + 1):
-                        row.append(1 if (x, y) in positions else 0)
-                    shape_matrix.append(row)
-
-                # 转换为前端坐标
-                frontend_x, frontend_y = min_x, min_y
-
-                # 添加到解决方案
-                if shape_label in SHAPE_MAPPING:
-                    solution['droppedBlocks'].append({
-                        'id': SHAPE_MAPPING[shape_label],
-                        'label': shape_label,
-                        'x': frontend_x,
-                        'y': frontend_y,
-                        'shape': shape_matrix
-                    })
+            # 每个形状的放置（方向、网格左上角）由其格子掩码查表得到，不必再扫描求边界框；
+            # 按第一个格子的行优先顺序输出
+            placements = board_placements(board, SHAPE_MAPPING)
+            placements.sort(key=lambda p: p.mask & -p.mask)
+            for p in placements:
+                # 转换为前端坐标，前端x是横轴，y是纵轴
+                solution['droppedBlocks'].append({
+                    'id': SHAPE_MAPPING[p.name],
+                    'label': p.name,
+                    'x': p.y,
+                    'y': p.x,
+                    'shape': [[0 if c == ' ' else 1 for c in row] for row in p.shape.grid]
+                })
+
+        if restarts:
+            solution['seed'] = seed
 
         # 保存解决方案到临时文件
         with open(output_file, 'w') as f:
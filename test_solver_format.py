@@ -2,10 +2,12 @@
 """
 测试solve_for_web.py的新输出格式是否正确
 """
+import datetime
 import json
 import os
 import sys
 import tempfile
+from calendar_puzzle.board import Game
 from solve_for_web import main
 
 def test_solver_format():
@@ -93,6 +95,29 @@ def test_solver_format():
             os.unlink(input_file)
         if os.path.exists(output_file):
             os.unlink(output_file)
+def test_solver_uses_requested_date():
+    """day/month给出时按该日期求解（今年），而不是今天"""
+    today = datetime.date.today()
+    dt = datetime.date(today.year, 2, 3) if (today.month, today.day) != (2, 3) else datetime.date(today.year, 2, 4)
+    expected = Game(dt).board.b
+    # 无已放置方块走日期模板；未知方块走重建矩阵的老路径
+    for dropped_blocks in ([], [{"id": "X-block", "x": 0, "y": 0, "shape": [[1]]}]):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_input:
+            json.dump({"day": dt.day, "month": dt.month, "droppedBlocks": dropped_blocks}, temp_input)
+            input_file = temp_input.name
+        output_file = input_file + '.out'
+        try:
+            main(input_file, output_file)
+            with open(output_file, 'r') as f:
+                board = json.load(f)['boardData']
+            # 日期格和边界格与该日期的棋盘一致，其余格子都放了方块
+            for row, expected_row in zip(board, expected):
+                for c, e in zip(row, expected_row):
+                    assert c == e if e != ' ' else c != ' '
+        finally:
+            for path in (input_file, output_file):
+                if os.path.exists(path):
+                    os.unlink(path)
 
 if __name__ == '__main__':
     test_solver_format()
\ No newline at end of file